@@ -11,19 +11,42 @@ The app processes candidate forms, generates PDFs, and syncs data across platfor
 
 import os
 import itertools
-import datetime as dt
+import csv
+import hmac
+import io
 import json
+import logging
+import threading
 import time
-from pprint import pprint
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
-from flask import Flask, render_template, request, jsonify
+import click
+from flask import Flask, Response, g, render_template, request, jsonify
 from dotenv import load_dotenv
+from werkzeug.datastructures import MultiDict
 import requests
 
-from utils.recruit_mapper import recruit_to_form
-from utils.custom_field_mapper import build_custom_field_payload, paginated_fetch, build_custom_fields_map
+from utils.recruit_mapper import recruit_to_form, recruit_to_submission_form
+from utils.custom_field_mapper import build_custom_field_payload, fetch_page, build_custom_fields_map
 from utils.sales_mapper import generate_airtable_payload_sales, generate_transparent_sales_pdf
 from utils.med_mapper import generate_airtable_payload_med, generate_med_transparent_pdf
+from utils.field_registry import CRM_ATTR_VIEW, FIELDS, apply_view
+from utils.job_events import JobEventBroker, job_sse_events
+from utils.job_queue import JobQueue, RetryLater
+from utils.storage import data_path
+from utils import metrics, pdf_webhooks
+from utils.logging_config import configure_logging, log_payload
+from utils.circuit_breaker import CircuitOpenError
+from utils.http_client import get_circuit_breaker, get_session, is_unavailable_error
+from utils.airtable_index import AirtableRecordIndex
+from utils.airtable_upserts import AirtableUpserts
+from utils.candidate_store import CandidateStore
+from utils.skills_sync import SkillsSyncer
+from utils.sync_snapshots import SnapshotStore, diff_fields
+from utils.pdf_cache import PdfCache
+from utils.static_assets import IMMUTABLE_CACHE_CONTROL, CompressedAsset, StaticAssets
+from utils.suggestions import SuggestionService, load_suggestion_db
 
 
 # ============================================================================
@@ -31,20 +54,34 @@ from utils.med_mapper import generate_airtable_payload_med, generate_med_transpa
 # ============================================================================
 
 load_dotenv()
-
-# RecruitCRM API Configuration
-RECRUITCRM_API_KEY = os.getenv("RECRUITCRM_API_KEY")
-RECRUITCRM_BASE_URL = "https://api.recruitcrm.io/v1"
-HEADERS = {
-    "Authorization": f"Bearer {RECRUITCRM_API_KEY}",
-    "Content-Type": "application/json"
-}
-
-# PDFMonkey API Configuration
-PDFMONKEY_API_KEY = os.getenv("MONKEYPDF_API_KEY")
-PDFMONKEY_HEADERS = {
-    "Authorization": f"Bearer {PDFMONKEY_API_KEY}",
-    "Accept": "application/json"
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Upstream base URLs, API keys and connection pools live in utils.http_client
+
+# PDFMonkey Webhook Configuration
+# Shared secret appended to the webhook URL configured in PDFMonkey
+# (…/webhooks/pdfmonkey?token=<secret>); webhooks are disabled when unset
+PDFMONKEY_WEBHOOK_SECRET = os.getenv("PDFMONKEY_WEBHOOK_SECRET")
+# Callbacks only wake a poller in the process that received them; with several
+# workers the rest rely on the fallback poll, so keep it at the 5s baseline
+PDF_POLL_FALLBACK_INTERVAL = int(os.getenv("PDF_POLL_FALLBACK_INTERVAL", "5"))
+
+# While PDFMonkey's circuit is open, submits save CRM and Airtable data and
+# leave the PDFs to a "pdf_backfill" job, retried until PDFMonkey recovers
+PDF_BACKFILL_RETRY_SECONDS = int(os.getenv("PDF_BACKFILL_RETRY_SECONDS", "60"))
+PDF_BACKFILL_MAX_AGE = int(os.getenv("PDF_BACKFILL_MAX_AGE", str(24 * 60 * 60)))
+
+# Job progress streams (/api/jobs/<id>/events): idle streams get a keepalive
+# and re-read the job every JOB_EVENTS_POLL_SECONDS (catches jobs run by
+# another process); after JOB_EVENTS_MAX_SECONDS the stream ends and the
+# browser's EventSource reconnects where it left off
+JOB_EVENTS_POLL_SECONDS = int(os.getenv("JOB_EVENTS_POLL_SECONDS", "15"))
+JOB_EVENTS_MAX_SECONDS = int(os.getenv("JOB_EVENTS_MAX_SECONDS", "600"))
+SSE_RETRY_MS = 3000
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # stop nginx from buffering the stream
 }
 
 # PDF Template IDs for different document types
@@ -53,15 +90,61 @@ SALES_ANONYMOUS_TEMPLATE_ID = "E781DCB1-E3D2-41C8-AD05-F176481447AA"
 MED_TRANSPARENT_TEMPLATE_ID = "EB0C33E8-3458-4A19-BCE4-C609DDAA71F3"
 MED_ANONYMOUS_TEMPLATE_ID = "4AD5DBFA-4803-49FF-B7ED-44720FEEB14F"
 
-# Airtable API Configuration
-AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
+# Airtable Configuration
 BASE_ID = "appE2c4HLRRkHAr3y"
 SALES_TABLE_ID = "tbl3FmKzmSWmxJhS0"
 MED_TABLE_ID = "tbltjg6SO2Px8PzMy"
+airtable_index = AirtableRecordIndex(BASE_ID)
+# Airtable accepts at most 10 records per write; its 5 requests per second
+# are enforced by the rate limiter in utils.http_client
+AIRTABLE_BATCH_SIZE = 10
 skills = ""
 
+# Local RecruitCRM candidate mirror, kept current by a background delta sync
+CANDIDATE_MAX_AGE = int(os.getenv("CANDIDATE_MAX_AGE", "300"))
+CANDIDATE_SYNC_INTERVAL = int(os.getenv("CANDIDATE_SYNC_INTERVAL", "120"))
+# Multi-candidate loads: most IDs per request and fetches in flight per request
+CANDIDATES_MAX_IDS = int(os.getenv("CANDIDATES_MAX_IDS", "100"))
+CANDIDATE_FETCH_CONCURRENCY = int(os.getenv("CANDIDATE_FETCH_CONCURRENCY", "8"))
+candidate_store = CandidateStore(data_path("candidates.sqlite3"))
+
+# Last synced payloads, used to send only changed fields upstream
+SNAPSHOT_MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", str(24 * 60 * 60)))
+sync_snapshots = SnapshotStore(data_path("snapshots.sqlite3"), SNAPSHOT_MAX_AGE)
+
+# Finished PDFs are reused for identical re-submits
+PDF_CACHE_MAX_AGE = int(os.getenv("PDF_CACHE_MAX_AGE", str(7 * 24 * 60 * 60)))
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", "5000"))
+pdf_cache = PdfCache(data_path("pdf_cache.sqlite3"), PDF_CACHE_MAX_AGE, PDF_CACHE_MAX_ENTRIES)
+
+# Shared worker pool used to fan out independent upstream calls of a request
+UPSTREAM_WORKERS = int(os.getenv("UPSTREAM_WORKERS", "16"))
+upstream_executor = ThreadPoolExecutor(
+    max_workers=UPSTREAM_WORKERS, thread_name_prefix="upstream")
+
+# Batch submits: candidates processed at once (shared by all running
+# batches) and the largest accepted batch
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+batch_executor = ThreadPoolExecutor(
+    max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+
 app = Flask(__name__)
 
+# Typeahead suggestions: the index is rebuilt from the candidate mirror and
+# Airtable every SUGGEST_REFRESH_INTERVAL seconds; browsers may reuse an
+# answer for SUGGEST_CACHE_SECONDS
+SUGGEST_REFRESH_INTERVAL = int(os.getenv("SUGGEST_REFRESH_INTERVAL", "900"))
+SUGGEST_CACHE_SECONDS = int(os.getenv("SUGGEST_CACHE_SECONDS", "300"))
+SUGGEST_MAX_RESULTS = 25
+
+# Production asset mode: the form page is rendered once and served
+# pre-compressed with an ETag; static files get content-fingerprinted URLs
+# under /assets/ and are cached by browsers for good
+PRODUCTION_ASSETS = os.getenv("ASSET_MODE", "development") == "production"
+static_assets = StaticAssets(app.static_folder)
+_rendered_pages: dict[str, CompressedAsset] = {}
+
 
 # ============================================================================
 # Utility Functions
@@ -72,376 +155,514 @@ def fetch_candidate_from_list(candidate_id: int) -> dict | None:
     """
     Fallback method to find candidate by ID when direct API call fails.
 
+    Looks the candidate up in the local mirror; on a miss the mirror is
+    delta-synced once and checked again instead of crawling every page.
+
     Args:
         candidate_id: The candidate's ID
 
     Returns:
         Candidate data dictionary or None if not found
     """
-    url = f"{RECRUITCRM_BASE_URL}/candidates"
-    for candidate in paginated_fetch(url):
-        if candidate["id"] == candidate_id:
-            return candidate
-    return None
-
+    cached = candidate_store.get(candidate_id)
+    if cached is None:
+        try:
+            candidate_store.sync_delta()
+        except requests.exceptions.RequestException as e:
+            logger.error("Candidate mirror sync failed: %s", e)
+        cached = candidate_store.get(candidate_id)
+    return cached["data"] if cached else None
 
-# ============================================================================
-# Airtable Integration Functions
-# ============================================================================
 
-def update_or_create_sales_record(form_data):
+def is_mirror_fresh(cached: dict | None) -> bool:
     """
-    Update existing sales record or create new one based on email.
+    Whether a mirrored candidate may be served without asking RecruitCRM.
 
     Args:
-        form_data: Dictionary containing form submission data
+        cached: Entry from ``candidate_store.get`` (or None)
 
     Returns:
-        API response or None if operation failed
+        True if it was fetched, or confirmed unchanged by a delta sync,
+        within ``CANDIDATE_MAX_AGE`` seconds and not saved since
     """
-    email = form_data.get("email")
-    if not email:
-        print("❌ Email is required for sales record operation")
-        return None
+    # synced_at 0: saved since it was mirrored (see record_recruitcrm_response)
+    if not cached or not cached["synced_at"]:
+        return False
+    checked_at = max(cached["synced_at"], candidate_store.last_synced_at())
+    return time.time() - checked_at < CANDIDATE_MAX_AGE
 
-    headers = {
-        "Authorization": f"Bearer {AIRTABLE_API_KEY}",
-        "Content-Type": "application/json"
-    }
 
-    # Search for existing record by email
-    search_url = f"https://api.airtable.com/v0/{BASE_ID}/{SALES_TABLE_ID}"
-    search_params = {
-        "filterByFormula": f"LOWER({{email}}) = '{email.lower()}'"
-    }
+def load_candidate(candidate_id: int) -> dict | None:
+    """
+    Load a candidate, preferring the local mirror when it is fresh.
 
-    search_response = requests.get(
-        search_url, headers=headers, params=search_params)
+    A mirrored candidate counts as fresh if it was fetched, or confirmed
+    unchanged by a delta sync, within ``CANDIDATE_MAX_AGE`` seconds, and
+    has not been saved since without the mirror learning the result.
+    Otherwise RecruitCRM is asked directly and the mirror updated; if that
+    fails the mirrored copy (or an indexed fallback lookup) is used.
 
-    if search_response.status_code != 200:
-        print(f"❌ Error searching sales records: {
-              search_response.status_code}")
-        print(search_response.text)
-        return None
+    Args:
+        candidate_id: The candidate's ID
 
-    existing_records = search_response.json().get("records", [])
-    payload = {"fields": generate_airtable_payload_sales(form_data)}
+    Returns:
+        Candidate data dictionary or None if not found
+    """
+    cached = candidate_store.get(candidate_id)
+    if is_mirror_fresh(cached):
+        return cached["data"]
 
-    if existing_records:
-        # Update existing record
-        record_id = existing_records[0]["id"]
-        update_url = f"{search_url}/{record_id}"
-        response = requests.patch(update_url, headers=headers, json=payload)
+    try:
+        direct_response = get_session("recruitcrm").get(
+            f"candidates/{candidate_id}")
+    except requests.exceptions.RequestException as e:
+        logger.error("Failed to fetch candidate %s: %s", candidate_id, e)
+        direct_response = None
 
-        if response.status_code == 200:
-            print("✅ Sales record updated successfully")
-            return response.json()
-        else:
-            print(f"❌ Failed to update sales record: {response.status_code}")
-            print(response.text)
-            return None
-    else:
-        # Create new record
-        response = requests.post(search_url, headers=headers, json=payload)
+    if direct_response is not None and direct_response.ok:
+        candidate_data = direct_response.json()
+        candidate_store.upsert([candidate_data])
+        return candidate_data
 
-        if response.status_code in [200, 201]:
-            print("✅ New sales record created successfully")
-            return response.json()
-        else:
-            print(f"❌ Failed to create sales record: {response.status_code}")
-            print(response.text)
-            return None
+    if cached:
+        return cached["data"]
+    return fetch_candidate_from_list(candidate_id)
 
 
-def update_or_create_medical_record(form_data):
+@app.template_global()
+def asset_url(filename):
     """
-    Update existing medical record or create new one based on email.
+    URL to reference a static file by in templates.
 
     Args:
-        form_data: Dictionary containing form submission data
+        filename: Path relative to the static folder, e.g. "js/autocomplete.js"
 
     Returns:
-        API response or None if operation failed
+        Fingerprinted /assets/ URL in production asset mode, else /static/
     """
-    email = form_data.get("email")
-    if not email:
-        print("❌ Email is required for medical record operation")
-        return None
+    if PRODUCTION_ASSETS:
+        return static_assets.url(filename)
+    return f"/static/{filename}"
 
-    headers = {
-        "Authorization": f"Bearer {AIRTABLE_API_KEY}",
-        "Content-Type": "application/json"
-    }
 
-    # Search for existing record by email
-    search_url = f"https://api.airtable.com/v0/{BASE_ID}/{MED_TABLE_ID}"
-    search_params = {
-        "filterByFormula": f"LOWER({{email}}) = '{email.lower()}'"
-    }
+def render_page(template_name):
+    """
+    Render a page template, cached and compressed in production asset mode.
 
-    search_response = requests.get(
-        search_url, headers=headers, params=search_params)
+    Cached pages are revalidated by the browser on every load and answered
+    with ``304 Not Modified`` while unchanged.
 
-    if search_response.status_code != 200:
-        print(f"❌ Error searching medical records: {
-              search_response.status_code}")
-        print(search_response.text)
-        return None
+    Args:
+        template_name: Template to render (takes no context)
 
-    existing_records = search_response.json().get("records", [])
-    payload = {"fields": generate_airtable_payload_med(form_data)}
+    Returns:
+        Rendered HTML or a response with the cached page
+    """
+    if not PRODUCTION_ASSETS:
+        return render_template(template_name)
 
-    if existing_records:
-        # Update existing record
-        record_id = existing_records[0]["id"]
-        update_url = f"{search_url}/{record_id}"
-        response = requests.patch(update_url, headers=headers, json=payload)
+    page = _rendered_pages.get(template_name)
+    if page is None:
+        page = _rendered_pages[template_name] = CompressedAsset(
+            render_template(template_name).encode(), "text/html; charset=utf-8")
+    return page.response("no-cache")
 
-        if response.status_code == 200:
-            print("✅ Medical record updated successfully")
-            return response.json()
-        else:
-            print(f"❌ Failed to update medical record: {response.status_code}")
-            print(response.text)
-            return None
-    else:
-        # Create new record
-        response = requests.post(search_url, headers=headers, json=payload)
 
-        if response.status_code in [200, 201]:
-            print("✅ New medical record created successfully")
-            return response.json()
-        else:
-            print(f"❌ Failed to create medical record: {response.status_code}")
-            print(response.text)
-            return None
+def parse_candidate_ids(values):
+    """
+    Parse the ``ids`` query parameter of ``/api/kandidaten``.
 
+    Args:
+        values: Parameter values, each a comma-separated list of IDs
 
-def update_skills_in_airtable(email, skills, branch):
+    Returns:
+        Unique candidate IDs in request order
+
+    Raises:
+        ValueError: If an ID is not a positive integer or there are too many
     """
-    Update skills field for a candidate record in Airtable.
+    candidate_ids = []
+    for value in values:
+        for part in value.split(","):
+            if not part.strip():
+                continue
+            if not part.strip().isdigit() or int(part) < 1:
+                raise ValueError(f"Invalid candidate ID: {part.strip()}")
+            candidate_ids.append(int(part))
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    if len(candidate_ids) > CANDIDATES_MAX_IDS:
+        raise ValueError(f"At most {CANDIDATES_MAX_IDS} IDs per request")
+    return candidate_ids
+
+
+def load_candidates(candidate_ids):
+    """
+    Load several candidates concurrently on the upstream worker pool.
+
+    At most ``CANDIDATE_FETCH_CONCURRENCY`` loads of one request are in
+    flight at a time, so a long list does not crowd out submissions.
 
     Args:
-        email: Candidate's email address
-        skills: Skills data to update
-        branch: String indicating whether the candidate is in the Med or Sales branch
+        candidate_ids: Candidate IDs to load
+
+    Returns:
+        {candidate ID: candidate data, None if not found, or the exception
+        the load raised}
     """
-    if not email or not skills:
-        print("❌ Missing email or skills data")
-        return
+    results = {}
+    remaining = iter(candidate_ids)
+    pending = {}
+    while True:
+        for candidate_id in itertools.islice(
+                remaining, CANDIDATE_FETCH_CONCURRENCY - len(pending)):
+            pending[upstream_executor.submit(load_candidate, candidate_id)] = candidate_id
+        if not pending:
+            return results
+
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            candidate_id = pending.pop(future)
+            try:
+                results[candidate_id] = future.result()
+            except Exception as e:
+                logger.error("Failed to load candidate %s: %s", candidate_id, e)
+                results[candidate_id] = e
+
+
+def build_candidates_response(candidate_ids, results):
+    """
+    Map loaded candidates to form data and collect the failures.
 
-    table_id = MED_TABLE_ID if "Med" in branch else SALES_TABLE_ID
+    Queues the skills sync for every loaded candidate, as
+    ``/api/kandidat/<id>`` does.
 
-    headers = {
-        "Authorization": f"Bearer {AIRTABLE_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    Args:
+        candidate_ids: Requested IDs, in request order
+        results: Output of ``load_candidates``
 
-    # Find record by email
-    search_url = f"https://api.airtable.com/v0/{BASE_ID}/{table_id}"
-    search_params = {
-        "filterByFormula": f"LOWER({{email}}) = '{email.lower()}'"
+    Returns:
+        JSON-ready dictionary with ``candidates`` (ID → form data) and
+        ``errors`` (one entry per candidate that could not be loaded)
+    """
+    candidates, errors = {}, []
+    for candidate_id in candidate_ids:
+        candidate_data = results.get(candidate_id)
+        if candidate_data is None:
+            errors.append({"id": candidate_id, "status_code": 404,
+                           "message": f"Candidate {candidate_id} not found"})
+            continue
+        if isinstance(candidate_data, Exception):
+            errors.append({"id": candidate_id, "status_code": 502,
+                           "message": f"Failed to load candidate {candidate_id}: "
+                                      f"{candidate_data}"})
+            continue
+
+        try:
+            candidates[str(candidate_id)] = recruit_to_form(candidate_data)
+        except Exception as e:
+            logger.exception("Failed to map candidate %s", candidate_id)
+            errors.append({"id": candidate_id, "status_code": 500,
+                           "message": f"Failed to map candidate {candidate_id}: {e}"})
+            continue
+        schedule_skills_sync(candidate_data)
+
+    return {
+        "candidates": candidates,
+        "errors": errors,
+        "requested": len(candidate_ids),
+        "loaded": len(candidates),
     }
 
-    response = requests.get(search_url, headers=headers, params=search_params)
-    if response.status_code != 200:
-        print("❌ Failed to search for candidate record:", response.text)
-        return
 
-    records = response.json().get("records", [])
-    if not records:
-        print("⚠️ No candidate record found with that email")
-        return
+def format_custom_fields_metadata(fields):
+    """
+    Render custom field metadata as an HTML ``<pre>`` table.
 
-    # Update skills field
-    record_id = records[0]["id"]
-    update_payload = {"fields": {"skills": skills}}
+    Args:
+        fields: Field list from ``/custom-fields/candidates``
 
-    update_response = requests.patch(
-        f"{search_url}/{record_id}",
-        headers=headers,
-        json=update_payload
-    )
+    Returns:
+        HTML string with one line per field
+    """
+    formatted_output = []
 
-    if update_response.status_code == 200:
-        print("✅ Skills updated successfully in Airtable")
-    else:
-        print("❌ Failed to update skills:", update_response.text)
+    for field in fields:
+        line = f'{field["field_id"]:>4} | {
+            field["field_name"]:<40} | {field["field_type"]:>10}'
+
+        # Add dropdown options if applicable
+        if field["field_type"] == "dropdown":
+            options = [option["value"]
+                       for option in field.get("dropdown_options", [])]
+            line += f' → {options}'
+
+        formatted_output.append(line)
+
+    return "<pre>" + "\n".join(formatted_output) + "</pre>"
 
 
 # ============================================================================
-# PDF Generation Functions
+# Airtable Integration Functions
 # ============================================================================
 
-def generate_pdf_document(form_data, template_id):
+def find_airtable_record_id(table_id, email, use_index=True):
     """
-    Generate PDF document using PDFMonkey API.
+    Resolve the Airtable record id for a candidate email.
+
+    Uses the local email index first and only falls back to a
+    ``filterByFormula`` search on a miss; search hits are indexed.
 
     Args:
-        form_data: Form data for PDF generation
-        template_id: PDFMonkey template ID
+        table_id: Airtable table ID
+        email: Candidate's email address
+        use_index: Set to False to force a search (e.g. after a 404)
 
     Returns:
-        API response from PDFMonkey
+        Record id or None if no record exists
+
+    Raises:
+        requests.HTTPError: If the search request fails
     """
-    # Select appropriate payload generator based on template
-    if template_id in [SALES_TRANSPARENT_TEMPLATE_ID, SALES_ANONYMOUS_TEMPLATE_ID]:
-        pdf_payload = generate_transparent_sales_pdf(form_data)
-    else:  # Medical templates
-        pdf_payload = generate_med_transparent_pdf(form_data)
+    if use_index:
+        record_id = airtable_index.get(table_id, email)
+        if record_id:
+            return record_id
 
-    response = requests.post(
-        "https://api.pdfmonkey.io/api/v1/documents",
-        json={
-            "document": {
-                "document_template_id": template_id,
-                "payload": pdf_payload,
-                "status": "pending"
-            }
-        },
-        headers={"Authorization": f"Bearer {PDFMONKEY_API_KEY}"},
-        timeout=30
-    )
+    search_params = {
+        "filterByFormula": f"LOWER({{email}}) = '{email.lower()}'"
+    }
+    response = get_session("airtable").get(
+        f"{BASE_ID}/{table_id}", params=search_params)
+    response.raise_for_status()
 
-    return response
+    records = response.json().get("records", [])
+    if not records:
+        return None
+
+    airtable_index.put(table_id, email, records[0]["id"])
+    return records[0]["id"]
 
 
-def poll_pdf_generation_status(document_id, max_wait_seconds=60, check_interval=5):
+def write_airtable_record(table_id, email, payload, create=True):
     """
-    Poll PDFMonkey API until document is ready or timeout occurs.
+    Update the record for an email, or create it.
+
+    A known record is written with a single PATCH. If the indexed record
+    was deleted in the meantime (404) the entry is dropped and the record
+    is looked up again.
 
     Args:
-        document_id: PDFMonkey document ID
-        max_wait_seconds: Maximum time to wait (default: 60 seconds)
-        check_interval: Time between status checks (default: 5 seconds)
+        table_id: Airtable table ID
+        email: Candidate's email address
+        payload: Request body ({"fields": {...}})
+        create: Create a new record when none exists
+
+    Returns:
+        API response, or None if no record exists and create is False
+
+    Raises:
+        requests.HTTPError: If the record search fails
+    """
+    session = get_session("airtable")
+    table_url = f"{BASE_ID}/{table_id}"
+
+    record_id = find_airtable_record_id(table_id, email)
+    if record_id:
+        response = session.patch(f"{table_url}/{record_id}", json=payload)
+        if response.status_code != 404:
+            return response
+
+        # Indexed record no longer exists upstream
+        airtable_index.invalidate(table_id, email)
+        record_id = find_airtable_record_id(table_id, email, use_index=False)
+        if record_id:
+            return session.patch(f"{table_url}/{record_id}", json=payload)
+
+    if not create:
+        return None
+
+    response = session.post(table_url, json=payload)
+    if response.status_code in [200, 201]:
+        airtable_index.put(table_id, email, response.json().get("id"))
+    return response
+
+
+def route_airtable_form(form):
+    """
+    Pick the Airtable table of a candidate form and build its fields.
 
     Returns:
-        Download URL if successful, None if failed or timed out
+        (table_id, fields) for the Med or Sales table
     """
-    status_url = f"https://api.pdfmonkey.io/api/v1/document_cards/{
-        document_id}"
-    elapsed_time = 0
+    if "Med" in (form.get("branche") or ""):
+        return MED_TABLE_ID, generate_airtable_payload_med(form)
+    return SALES_TABLE_ID, generate_airtable_payload_sales(form)
 
-    while elapsed_time < max_wait_seconds:
-        response = requests.get(status_url, headers=PDFMONKEY_HEADERS)
 
-        if response.status_code != 200:
-            print("❌ Error checking PDF generation status:", response.text)
-            return None
+airtable_upserts = AirtableUpserts(airtable_index, sync_snapshots, route_airtable_form)
 
-        document_data = response.json()
-        print(f"PDF Status Check: {document_data}")
 
-        status = document_data["document_card"]["status"]
+def _upsert_airtable_batch(table_id, batch):
+    """
+    Send up to 10 records in one ``performUpsert`` PATCH.
 
-        if status == "success":
-            print("✅ PDF generated successfully")
-            return document_data["document_card"]["public_share_link"]
-        elif status == "failure":
-            print("❌ PDF generation failed")
-            return None
+    Returns:
+        API response
+    """
+    return get_session("airtable").patch(
+        f"{BASE_ID}/{table_id}", json=airtable_upserts.upsert_body(table_id, batch))
 
-        time.sleep(check_interval)
-        elapsed_time += check_interval
 
-    print("⏰ PDF generation timed out")
-    return None
+def upsert_airtable_batch(table_id, batch, retry_stale=True):
+    """
+    Upsert one batch, losing only the records Airtable rejects.
 
+    A 404/422 about a stale record id drops those ids and retries the batch
+    matching on email. Any other 422 (e.g. an invalid value) is answered by
+    splitting the batch in halves until the rejected record is isolated.
 
-# ============================================================================
-# Flask Routes
-# ============================================================================
+    Args:
+        table_id: Airtable table ID
+        batch: Up to 10 field dictionaries, each containing "email"
+        retry_stale: Whether stale record ids may still be dropped and retried
 
-@app.route("/")
-def index():
-    """Render the main candidate form page."""
-    return render_template("kandidatenformular.html")
+    Returns:
+        List of saved records (None where a record failed), in input order
+    """
+    response = _upsert_airtable_batch(table_id, batch)
+    if response.status_code == 200:
+        records = response.json().get("records", [])
+        airtable_upserts.index_records(table_id, records)
+        return records
 
+    stale = airtable_upserts.stale_records(table_id, batch, response) if retry_stale else []
+    if stale:
+        airtable_upserts.forget_batch(table_id, stale)
+        return upsert_airtable_batch(table_id, batch, retry_stale=False)
 
-@app.route("/test")
-def test_page():
-    """Render the test form page for development/testing."""
-    return render_template("test_form.html")
+    if response.status_code == 422 and len(batch) > 1:
+        middle = len(batch) // 2
+        return (upsert_airtable_batch(table_id, batch[:middle])
+                + upsert_airtable_batch(table_id, batch[middle:]))
 
+    logger.error("Failed to upsert Airtable records %s: %s %s",
+                 [fields["email"] for fields in batch], response.status_code, response.text)
+    return [None] * len(batch)
 
-@app.route("/api/custom-fields")
-def api_custom_fields():
+
+def upsert_airtable_records(table_id, fields_list):
     """
-    API endpoint to get all custom fields mapping.
+    Create or update records matched on email, in batches of 10.
+
+    One request per batch replaces the former search-then-PATCH/POST pair
+    per record; batches queue on the Airtable rate limiter.
+
+    Args:
+        table_id: Airtable table ID
+        fields_list: List of field dictionaries, each containing "email"
 
     Returns:
-        JSON mapping of field IDs to field names
+        List of saved records (None where saving failed), in input order
     """
-    return jsonify(build_custom_fields_map())
+    results = []
+    for start in range(0, len(fields_list), AIRTABLE_BATCH_SIZE):
+        results += upsert_airtable_batch(
+            table_id, fields_list[start:start + AIRTABLE_BATCH_SIZE])
+    return results
 
 
-@app.route("/debug/cf-meta")
-def debug_custom_fields_metadata():
+def upsert_candidate_records(forms):
     """
-    Debug endpoint to display custom field metadata in readable format.
+    Save one or many candidate forms to their branch's Airtable table.
+
+    Forms are grouped per table (Med vs. Sales) and upserted in batches.
+    Only fields that changed since the last sync are sent; records with no
+    changes are not sent at all and come back as ``{"id": …, "unchanged": True}``.
+    Forms without an email are skipped; if the same email appears more than
+    once per table, the last form wins.
+
+    Args:
+        forms: List of form dictionaries / MultiDicts
 
     Returns:
-        HTML formatted display of custom fields with their properties
+        List of saved records (None where saving failed), in input order
     """
-    url = f"{RECRUITCRM_BASE_URL}/custom-fields/candidates"
-    response = requests.get(url, headers=HEADERS, timeout=20)
+    results, plans = airtable_upserts.plan(forms)
 
-    if not response.ok:
-        return jsonify(
-            error=True,
-            message=f"Failed to fetch custom fields metadata: {
-                response.status_code} {response.text}"
-        )
+    for table_id, entries in plans:
+        records = upsert_airtable_records(
+            table_id, [changes for _, _, _, changes in entries])
+        airtable_upserts.record(table_id, entries, records, results)
 
-    fields = response.json()
-    formatted_output = []
+    saved = sum(record is not None for record in results)
+    logger.info("Saved %d/%d Airtable records", saved, len(forms))
+    return results
 
-    for field in fields:
-        line = f'{field["field_id"]:>4} | {
-            field["field_name"]:<40} | {field["field_type"]:>10}'
 
-        # Add dropdown options if applicable
-        if field["field_type"] == "dropdown":
-            options = [option["value"]
-                       for option in field.get("dropdown_options", [])]
-            line += f' → {options}'
+def upsert_candidate_record(form_data):
+    """
+    Save a single candidate form to Airtable.
 
-        formatted_output.append(line)
+    Args:
+        form_data: Dictionary containing form submission data
 
-    return "<pre>" + "\n".join(formatted_output) + "</pre>"
+    Returns:
+        Saved record or None if operation failed
+    """
+    return upsert_candidate_records([form_data])[0]
 
 
-@app.route("/api/kandidat/<int:candidate_id>")
-def api_get_candidate(candidate_id: int):
+def update_skills_in_airtable(email, skills, branch):
     """
-    Get candidate data by ID and update skills in Airtable.
+    Update skills field for a candidate record in Airtable.
 
     Args:
-        candidate_id: The candidate's ID
+        email: Candidate's email address
+        skills: Skills data to update
+        branch: String indicating whether the candidate is in the Med or Sales branch
 
     Returns:
-        JSON response with candidate data or error message
+        True if the skills were written
     """
+    if not email or not skills:
+        logger.error("Missing email or skills data")
+        return False
 
-    # Try direct API call first
-    direct_response = requests.get(
-        f"{RECRUITCRM_BASE_URL}/candidates/{candidate_id}",
-        headers=HEADERS,
-        timeout=20
-    )
+    table_id = MED_TABLE_ID if "Med" in (branch or "") else SALES_TABLE_ID
+    update_payload = {"fields": {"skills": skills}}
 
-    # Use direct response if successful, otherwise fallback to list search
-    candidate_data = (
-        direct_response.json() if direct_response.ok
-        else fetch_candidate_from_list(candidate_id)
-    )
+    try:
+        update_response = write_airtable_record(
+            table_id, email, update_payload, create=False)
+    except requests.exceptions.HTTPError as e:
+        logger.error("Failed to search for candidate record: %s", e)
+        return False
+
+    if update_response is None:
+        logger.warning("No candidate record found with that email")
+        return False
+    elif update_response.status_code == 200:
+        logger.info("Skills updated successfully in Airtable")
+        return True
+    else:
+        logger.error("Failed to update skills: %s", update_response.text)
+        return False
 
-    if not candidate_data:
-        return jsonify(
-            error=True,
-            message=f"Candidate {candidate_id} not found"
-        ), 404
 
+# Candidate loads hand skills to this writer instead of syncing inline
+skills_syncer = SkillsSyncer(
+    update_skills_in_airtable,
+    delay=float(os.getenv("SKILLS_SYNC_DELAY", "2"))
+)
+
+
+def schedule_skills_sync(candidate_data):
+    """
+    Queue a deferred Airtable skills sync for a loaded candidate.
+
+    Args:
+        candidate_data: Candidate dictionary from RecruitCRM
+    """
     def get_custom_field_value(custom_fields, field_name):
         for field in custom_fields:
             if field.get("field_name") == field_name:
@@ -454,133 +675,1059 @@ def api_get_candidate(candidate_id: int):
         candidate_data.get("custom_fields", []), "Branche")
 
     if email and skills:
-        update_skills_in_airtable(email, skills, branch)
-        print(f"Updated skills for {email}: {skills} : {branch}")
+        if skills_syncer.schedule(email, skills, branch):
+            logger.debug("Queued skills sync for %s: %s : %s", email, skills, branch)
 
-    return jsonify(recruit_to_form(candidate_data))
 
+# ============================================================================
+# Typeahead Suggestions
+# ============================================================================
 
-@app.route("/api/submit", methods=["POST"])
-def submit_candidate_form():
+# Form fields with server-side suggestions → registry fields whose
+# RecruitCRM and Airtable values feed them, and whether those values are
+# comma-separated lists. The lists in utils/suggestion-db.js (the seed
+# corpus, no longer shipped to browsers) are added too.
+SUGGEST_FIELDS = {
+    "zusatzqualifikation": (("zusatzqualifikation", "zusatzbezeichnungen[]"), True),
+    "arbeitgeber_name": (("arbeitgeber_name",), False),
+    "wohnort": (("wohnort", "arbeitgeber_standort"), False),
+}
+SUGGESTION_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "utils", "suggestion-db.js")
+
+
+def _split_suggestion_values(value, split):
+    """Turn a stored field value into the individual suggestion values."""
+    values = value if isinstance(value, list) else [value]
+    for value in values:
+        if not isinstance(value, str):
+            continue
+        for part in value.split(",") if split else [value]:
+            if part.strip():
+                yield part.strip()
+
+
+def fetch_airtable_column_values(table_id, columns):
     """
-    Process candidate form submission.
+    Page through a table, reading only the given columns.
 
-    Handles:
-    - PDF generation (transparent and anonymous versions)
-    - Airtable record creation/update
-    - RecruitCRM candidate update
+    Args:
+        table_id: Airtable table ID
+        columns: Column names to read
 
-    Returns:
-        JSON response indicating success or failure
+    Yields:
+        The ``fields`` dict of every record
     """
-    print(f"[{dt.datetime.now():%H:%M:%S}] Processing form submission")
+    params = {"fields[]": sorted(columns), "pageSize": 100}
+    while True:
+        response = get_session("airtable").get(f"{BASE_ID}/{table_id}", params=params)
+        response.raise_for_status()
+        data = response.json()
 
-    form_data = request.form.copy()
-    candidate_id = form_data.get("kandidat_slug")
+        for record in data.get("records", []):
+            yield record.get("fields", {})
 
-    if not candidate_id:
-        return jsonify(
-            status="error",
-            message="No candidate ID provided"
-        ), 400
+        if not data.get("offset"):
+            return
+        params["offset"] = data["offset"]
 
-    branch = form_data.get("branche", "")
 
-    try:
-        # Generate PDFs based on branch type
-        if "Med" in branch:
-            pdf_transparent = generate_pdf_document(
-                form_data, MED_TRANSPARENT_TEMPLATE_ID)
-            pdf_anonymous = generate_pdf_document(
-                form_data, MED_ANONYMOUS_TEMPLATE_ID)
-            update_or_create_medical_record(form_data)
-        else:
-            pdf_transparent = generate_pdf_document(
-                form_data, SALES_TRANSPARENT_TEMPLATE_ID)
-            pdf_anonymous = generate_pdf_document(
-                form_data, SALES_ANONYMOUS_TEMPLATE_ID)
-            update_or_create_sales_record(form_data)
+def collect_suggestion_corpus():
+    """
+    Count the values used per suggestion field.
 
-        # Extract document IDs from responses
-        anonymous_doc_id = pdf_anonymous.json()["document"]["id"]
-        transparent_doc_id = pdf_transparent.json()["document"]["id"]
+    Sources are the static lists, every mirrored RecruitCRM candidate and
+    the Airtable columns of the fields in ``SUGGEST_FIELDS``. Each value is
+    counted once per candidate and source.
 
-        # Wait for PDFs to be generated and get download URLs
-        anonymous_url = poll_pdf_generation_status(anonymous_doc_id)
-        transparent_url = poll_pdf_generation_status(transparent_doc_id)
-
-        # Add PDF URLs to form data
-        form_data["auswertung"] = transparent_url
-        form_data["anonym_auswertung"] = anonymous_url
-        print(anonymous_url)
-        print(transparent_url)
-
-        # Prepare RecruitCRM payload
-        custom_fields = build_custom_field_payload(form_data)
-
-        # Process contact number
-        contact_raw = form_data.get("phone")
-        contact_number = (
-            int(contact_raw) if contact_raw and contact_raw.isdigit()
-            else None
-        )
+    Returns:
+        {form field: Counter(value → number of uses)}
+    """
+    corpus = {field: Counter() for field in SUGGEST_FIELDS}
+    for field, values in load_suggestion_db(SUGGESTION_DB_PATH).items():
+        corpus.setdefault(field, Counter()).update(values)
+
+    registry = {field.form: field for field in FIELDS if isinstance(field.form, str)}
+
+    for candidate in candidate_store.iter_all():
+        custom = {cf.get("field_name"): cf.get("value")
+                  for cf in candidate.get("custom_fields") or []}
+        for target, (sources, split) in SUGGEST_FIELDS.items():
+            values = set()
+            for source in sources:
+                field = registry[source]
+                if field.crm:
+                    values.update(_split_suggestion_values(custom.get(field.crm), split))
+                if field.crm_attr:
+                    values.update(_split_suggestion_values(candidate.get(field.crm_attr), split))
+            corpus[target].update(values)
+
+    for table_id, column_attr in ((SALES_TABLE_ID, "airtable_sales"),
+                                  (MED_TABLE_ID, "airtable_med")):
+        columns = {}
+        for target, (sources, split) in SUGGEST_FIELDS.items():
+            for source in sources:
+                column = getattr(registry[source], column_attr)
+                if column:
+                    column = column[0] if isinstance(column, tuple) else column
+                    columns.setdefault(column, []).append((target, split))
+        if not columns:
+            continue
 
-        # Process gender ID
         try:
-            gender_id = int(form_data.get("geschlecht", 3))
-        except (ValueError, TypeError):
-            gender_id = 3  # Default gender ID
-
-        recruitcrm_payload = {
-            "first_name": form_data.get("vorname"),
-            "last_name": form_data.get("nachname"),
-            "email": form_data.get("email"),
-            "contact_number": contact_number,
-            "position": form_data.get("aktuelle_position"),
-            "gender_id": gender_id,
-            "city": form_data.get("wohnort"),
-            "current_organization": form_data.get("arbeitgeber_name"),
-            "slug": form_data.get("slug"),
-            "owner": form_data.get("consultant"),
-            "resume": form_data.get("cv_link") if form_data.get("cv_link") else None,
-            "xing": form_data.get("xing_link"),
-            "linkedin": form_data.get("linkedin_link"),
-            "current_salary": form_data.get("current_salary"),
-            "salary_expectation": form_data.get("expected_salary"),
-            "available_from": form_data.get("verfuegbar_ab"),
-            "locality": form_data.get("erreichbare_stadtname"),
-            "notice_period": form_data.get("kuendigungsfrist"),
-            "work_ex_year": form_data.get("berufserfahrung_in_jahren", 0),
-            "custom_fields": custom_fields
-        }
-
-        # print("RecruitCRM Payload:")
-        # print(json.dumps(recruitcrm_payload, indent=2))
+            for fields in fetch_airtable_column_values(table_id, columns):
+                for column, targets in columns.items():
+                    for target, split in targets:
+                        corpus[target].update(
+                            set(_split_suggestion_values(fields.get(column), split)))
+        except requests.exceptions.RequestException as e:
+            logger.error("Skipping Airtable suggestions from %s: %s", table_id, e)
 
-        # Submit to RecruitCRM
-        recruitcrm_url = f"{RECRUITCRM_BASE_URL}/candidates/{candidate_id}"
-        recruitcrm_response = requests.post(
-            recruitcrm_url,
-            headers={**HEADERS, "Accept": "application/json"},
-            json=recruitcrm_payload,
-            timeout=20
-        )
+    return corpus
 
-        # print("RecruitCRM Response:")
-        # print(recruitcrm_response.json())
 
-        if recruitcrm_response.status_code != 200:
-            return jsonify(
-                status="error",
-                message=f"RecruitCRM API Error {
-                    recruitcrm_response.status_code}: {recruitcrm_response.text}"
-            ), recruitcrm_response.status_code
+suggestion_service = SuggestionService(
+    collect_suggestion_corpus,
+    initial={**{field: Counter() for field in SUGGEST_FIELDS},
+             **{field: Counter(values)
+                for field, values in load_suggestion_db(SUGGESTION_DB_PATH).items()}},
+)
 
-        return jsonify(
-            status="success",
-            message="Candidate data saved successfully"
-        )
 
+# ============================================================================
+# PDF Generation Functions
+# ============================================================================
+
+# Form fields receiving the PDF URLs, in pick_pdf_templates order
+PDF_FIELDS = ("auswertung", "anonym_auswertung")
+
+
+def pick_pdf_templates(branch):
+    """
+    Pick the PDF templates for a candidate's branch.
+
+    Args:
+        branch: Value of the "branche" form field
+
+    Returns:
+        (transparent template ID, anonymous template ID)
+    """
+    if "Med" in (branch or ""):
+        return MED_TRANSPARENT_TEMPLATE_ID, MED_ANONYMOUS_TEMPLATE_ID
+    return SALES_TRANSPARENT_TEMPLATE_ID, SALES_ANONYMOUS_TEMPLATE_ID
+
+
+def build_pdf_payload(form_data, template_id):
+    """
+    Build the PDFMonkey payload for a template.
+
+    Args:
+        form_data: Form data for PDF generation
+        template_id: PDFMonkey template ID
+
+    Returns:
+        Payload dict for the template
+    """
+    # Select appropriate payload generator based on template
+    if template_id in [SALES_TRANSPARENT_TEMPLATE_ID, SALES_ANONYMOUS_TEMPLATE_ID]:
+        return generate_transparent_sales_pdf(form_data)
+    return generate_med_transparent_pdf(form_data)  # Medical templates
+
+
+def generate_pdf_document(form_data, template_id, pdf_payload=None):
+    """
+    Generate PDF document using PDFMonkey API.
+
+    Args:
+        form_data: Form data for PDF generation
+        template_id: PDFMonkey template ID
+        pdf_payload: Prebuilt payload (built from form_data if omitted)
+
+    Returns:
+        API response from PDFMonkey
+    """
+    if pdf_payload is None:
+        pdf_payload = build_pdf_payload(form_data, template_id)
+
+    response = get_session("pdfmonkey").post(
+        "documents",
+        json={
+            "document": {
+                "document_template_id": template_id,
+                "payload": pdf_payload,
+                "status": "pending"
+            }
+        }
+    )
+
+    return response
+
+
+def poll_pdf_generation_status(document_id, max_wait_seconds=60, check_interval=None):
+    """
+    Wait until a PDFMonkey document is ready or timeout occurs.
+
+    When the PDFMonkey webhook is configured the wait is woken as soon as the
+    "document generated" callback arrives; status GETs then only run as a
+    fallback every ``PDF_POLL_FALLBACK_INTERVAL`` seconds.
+
+    Args:
+        document_id: PDFMonkey document ID
+        max_wait_seconds: Maximum time to wait (default: 60 seconds)
+        check_interval: Time between status checks (default: 5 seconds, or
+            the fallback interval when webhooks are enabled)
+
+    Returns:
+        Download URL if successful, None if generation failed
+
+    Raises:
+        requests.exceptions.Timeout: If the document is not ready in time
+            (counted as a PDFMonkey failure by its circuit breaker)
+    """
+    if check_interval is None:
+        check_interval = (
+            PDF_POLL_FALLBACK_INTERVAL if PDFMONKEY_WEBHOOK_SECRET else 5)
+
+    status_url = f"document_cards/{document_id}"
+    deadline = time.monotonic() + max_wait_seconds
+
+    checks = 0
+    result = "error"
+
+    pdf_webhooks.register(document_id)
+    try:
+        while time.monotonic() < deadline:
+            response = get_session("pdfmonkey").get(status_url)
+            checks += 1
+
+            if response.status_code != 200:
+                logger.error("Error checking PDF generation status: %s", response.text)
+                return None
+
+            document_data = response.json()
+            log_payload(logger, "PDF status check:", document_data)
+
+            status = document_data["document_card"]["status"]
+
+            if status == "success":
+                logger.info("PDF %s generated successfully", document_id)
+                result = "success"
+                return document_data["document_card"]["public_share_link"]
+            elif status == "failure":
+                logger.error("PDF %s generation failed", document_id)
+                result = "failure"
+                return None
+
+            remaining = deadline - time.monotonic()
+            document = pdf_webhooks.wait(
+                document_id, max(0, min(check_interval, remaining)))
+
+            if document and document.get("status") == "success" \
+                    and document.get("public_share_link"):
+                logger.info("PDF %s generated successfully (webhook)", document_id)
+                result = "success"
+                return document["public_share_link"]
+            elif document and document.get("status") == "failure":
+                logger.error("PDF %s generation failed (webhook)", document_id)
+                result = "failure"
+                return None
+            # Any other callback falls through to an immediate status check
+        result = "timeout"
+    finally:
+        pdf_webhooks.unregister(document_id)
+        metrics.PDF_POLL_ITERATIONS.observe(checks, result)
+
+    get_circuit_breaker("pdfmonkey").record_failure()
+    raise requests.exceptions.Timeout(
+        f"PDF {document_id} not ready after {max_wait_seconds}s")
+
+
+def generate_pdf_and_wait(form_data, template_id):
+    """
+    Create a PDFMonkey document and block until it is rendered.
+
+    Meant to run on the upstream worker pool so several documents can be
+    rendered side by side.
+
+    Args:
+        form_data: Form data for PDF generation
+        template_id: PDFMonkey template ID
+
+    Returns:
+        Public share link if successful, None if generation failed
+
+    Raises:
+        requests.exceptions.RequestException: If PDFMonkey is unavailable
+            or the document timed out
+    """
+    pdf_payload = build_pdf_payload(form_data, template_id)
+
+    # Identical payload rendered before: reuse that document
+    cached_url = pdf_cache.get(template_id, pdf_payload)
+    if cached_url:
+        logger.info("Reusing cached PDF for template %s", template_id)
+        return cached_url
+
+    response = generate_pdf_document(form_data, template_id, pdf_payload)
+    response.raise_for_status()
+    document_id = response.json()["document"]["id"]
+    download_url = poll_pdf_generation_status(document_id)
+
+    if download_url:
+        pdf_cache.put(template_id, pdf_payload, download_url)
+    return download_url
+
+
+# ============================================================================
+# Submission Pipeline
+# ============================================================================
+
+class SubmissionError(Exception):
+    """Raised when an upstream rejects a form submission."""
+
+    def __init__(self, message, status_code=500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def build_recruitcrm_payload(form_data):
+    """
+    Build the RecruitCRM candidate update payload from form data.
+
+    Args:
+        form_data: Form data including the generated PDF URLs
+
+    Returns:
+        Dictionary ready to be POSTed to ``/candidates/<slug>``
+    """
+    return {
+        **apply_view(CRM_ATTR_VIEW, form_data),
+        "custom_fields": build_custom_field_payload(form_data)
+    }
+
+
+def _flatten_recruitcrm_payload(payload):
+    """Flatten a RecruitCRM payload to {attribute | "cf:<field_id>": value}."""
+    flat = {key: value for key, value in payload.items() if key != "custom_fields"}
+    for field in payload.get("custom_fields", []):
+        flat[f"cf:{field['field_id']}"] = field["value"]
+    return flat
+
+
+def diff_recruitcrm_payload(candidate_slug, payload):
+    """
+    Reduce a RecruitCRM payload to the fields that changed since the last sync.
+
+    The full payload is sent when there is no snapshot, or when the local
+    mirror shows the candidate was edited upstream after our last write.
+
+    Args:
+        candidate_slug: Candidate slug the update is sent to
+        payload: Full payload from ``build_recruitcrm_payload``
+
+    Returns:
+        Payload to send, or None if nothing changed
+    """
+    snapshot = sync_snapshots.get("recruitcrm", candidate_slug)
+    if not snapshot:
+        return payload
+
+    mirrored = candidate_store.get_by_slug(candidate_slug)
+    upstream_version = mirrored and mirrored["data"].get("updated_on")
+    if upstream_version and upstream_version > (snapshot["version"] or ""):
+        return payload
+
+    changed = diff_fields(snapshot["payload"], _flatten_recruitcrm_payload(payload))
+    if not changed:
+        return None
+
+    partial = {key: value for key, value in changed.items()
+               if not key.startswith("cf:")}
+    custom_fields = [{"field_id": int(key[3:]), "value": value}
+                     for key, value in changed.items() if key.startswith("cf:")]
+    if custom_fields:
+        partial["custom_fields"] = custom_fields
+    return partial
+
+
+def record_recruitcrm_response(candidate_slug, payload, response):
+    """
+    Check a RecruitCRM update response and snapshot what was saved.
+
+    The candidate returned by the update replaces the mirrored copy, so a
+    reload right after saving shows the saved data. Without a usable
+    candidate in the response, the mirrored copy is marked stale instead.
+
+    Args:
+        candidate_slug: Candidate slug the update was sent to
+        payload: Full payload from ``build_recruitcrm_payload``
+        response: Response of the update (requests or httpx)
+
+    Raises:
+        SubmissionError: If RecruitCRM rejected the update
+    """
+    if response.status_code != 200:
+        raise SubmissionError(
+            f"RecruitCRM API Error {response.status_code}: {response.text}",
+            response.status_code
+        )
+
+    try:
+        candidate = response.json()
+    except ValueError:
+        candidate = None
+    if not isinstance(candidate, dict):
+        candidate = {}
+    sync_snapshots.put(
+        "recruitcrm", candidate_slug,
+        _flatten_recruitcrm_payload(payload), candidate.get("updated_on"))
+
+    if candidate.get("id") is not None and "custom_fields" in candidate:
+        candidate_store.upsert([candidate])
+    else:
+        candidate_store.mark_stale(candidate_slug)
+
+
+def save_recruitcrm_candidate(form_data):
+    """
+    Send the changed fields of a submitted form to RecruitCRM.
+
+    Args:
+        form_data: Form data including the generated PDF URLs
+
+    Returns:
+        True if saved, False if nothing changed since the last save
+
+    Raises:
+        SubmissionError: If RecruitCRM rejects the update
+    """
+    candidate_id = form_data.get("kandidat_slug")
+    recruitcrm_payload = build_recruitcrm_payload(form_data)
+    changes = diff_recruitcrm_payload(candidate_id, recruitcrm_payload)
+
+    log_payload(logger, "RecruitCRM changes:", changes)
+
+    if changes is None:
+        # Nothing changed since the last save; skip the upstream call
+        return False
+
+    # Submit only the changed fields to RecruitCRM
+    recruitcrm_response = get_session("recruitcrm").post(
+        f"candidates/{candidate_id}",
+        json=changes
+    )
+
+    log_payload(logger, "RecruitCRM response:", recruitcrm_response.text)
+
+    record_recruitcrm_response(candidate_id, recruitcrm_payload, recruitcrm_response)
+    return True
+
+
+def collect_pdf_urls(pdf_futures):
+    """
+    Wait for the PDF futures of a submission.
+
+    Args:
+        pdf_futures: {form field: future of ``generate_pdf_and_wait``}
+
+    Returns:
+        ({form field: URL or None}, [fields whose PDF has to be deferred
+        because PDFMonkey was unavailable])
+
+    Raises:
+        SubmissionError: If PDFMonkey rejected a render request (4xx)
+    """
+    urls, deferred = {}, []
+    for field, future in pdf_futures.items():
+        try:
+            urls[field] = future.result()
+        except requests.exceptions.RequestException as e:
+            if not is_unavailable_error(e):
+                raise pdf_rejected_error(e) from e
+            logger.warning("Deferring %s PDF: %s", field, e)
+            urls[field] = None
+            deferred.append(field)
+    return urls, deferred
+
+
+def abandon_submission_futures(pdf_futures, airtable_future):
+    """
+    Clean up the upstream calls of a submission that failed midway.
+
+    Calls that have not started yet are cancelled. An Airtable upsert that
+    is already running is waited for, so its outcome is logged rather than
+    lost; running PDF renders finish on their own and are discarded.
+
+    Args:
+        pdf_futures: {form field: future of ``generate_pdf_and_wait``}
+        airtable_future: Future of ``upsert_candidate_record``
+    """
+    for future in pdf_futures.values():
+        future.cancel()
+    if airtable_future.cancel():
+        return
+    try:
+        airtable_future.result()
+    except Exception as e:
+        logger.error("Airtable upsert of a failed submission failed: %s", e)
+
+
+def pdf_rejected_error(error):
+    """
+    Turn a PDFMonkey 4xx (bad template id, auth, invalid payload) into the
+    error reported to the caller; retrying would fail the same way.
+
+    Args:
+        error: Error raised for the request (requests or httpx)
+
+    Returns:
+        SubmissionError with the upstream status and message
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        message = f"PDFMonkey request failed: {error}"
+    else:
+        message = f"PDFMonkey API Error {response.status_code}: {response.text}"
+    logger.error("PDFMonkey rejected the render request: %s", message)
+    return SubmissionError(message, 502)
+
+
+def defer_pdf_generation(form_data, fields, report):
+    """
+    Queue a "pdf_backfill" job for PDFs that could not be rendered.
+
+    Returns:
+        The backfill job id
+    """
+    job_id = job_queue.enqueue("pdf_backfill", {
+        "form": list(form_data.items(multi=True)),
+        "fields": fields,
+        "deferred_at": time.time(),
+    })
+    report("pdf_deferred", fields=fields, job_id=job_id)
+    return job_id
+
+
+def process_candidate_submission(form_data, report=None):
+    """
+    Run the PDFMonkey → Airtable → RecruitCRM pipeline for one form.
+
+    Both PDFs and the Airtable upsert run concurrently on the upstream
+    worker pool; only the RecruitCRM update waits for the PDF URLs.
+
+    While PDFMonkey is unavailable (circuit open, or the render failed with
+    a connection error or timeout) the candidate data is saved without the
+    PDF URLs and a "pdf_backfill" job adds them once PDFMonkey recovers.
+
+    Args:
+        form_data: MultiDict with the submitted form fields
+        report: Optional callback ``report(stage, **details)`` invoked as
+            each stage finishes (may be called from worker threads)
+
+    Returns:
+        Dictionary with the transparent and anonymous PDF URLs (None while
+        deferred) and, if PDFs were deferred, the backfill job id
+
+    Raises:
+        SubmissionError: If RecruitCRM rejects the update
+    """
+    report = report or (lambda stage, **details: None)
+    branch = form_data.get("branche", "")
+
+    transparent_template, anonymous_template = pick_pdf_templates(branch)
+
+    # Render both PDFs and upsert Airtable concurrently
+    pdf_futures = {}
+    if get_circuit_breaker("pdfmonkey").is_open():
+        logger.warning("PDFMonkey unavailable, deferring PDF generation")
+    else:
+        pdf_futures = {
+            "auswertung": upstream_executor.submit(
+                generate_pdf_and_wait, form_data, transparent_template),
+            "anonym_auswertung": upstream_executor.submit(
+                generate_pdf_and_wait, form_data, anonymous_template),
+        }
+        report("pdf_queued")
+    airtable_future = upstream_executor.submit(
+        upsert_candidate_record, form_data)
+
+    def on_pdf_done(stage):
+        def callback(future):
+            if future.exception() is None:
+                report(stage, url=future.result())
+        return callback
+
+    def on_airtable_done(future):
+        if future.exception() is None:
+            record = future.result()
+            if not record:
+                report("airtable_failed")
+            else:
+                report("airtable_unchanged" if record.get("unchanged")
+                       else "airtable_saved")
+
+    if pdf_futures:
+        pdf_futures["auswertung"].add_done_callback(
+            on_pdf_done("transparent_pdf_ready"))
+        pdf_futures["anonym_auswertung"].add_done_callback(
+            on_pdf_done("anonymous_pdf_ready"))
+    airtable_future.add_done_callback(on_airtable_done)
+
+    try:
+        # Wait for PDFs to be generated and get download URLs
+        if pdf_futures:
+            urls, deferred = collect_pdf_urls(pdf_futures)
+        else:
+            urls = dict.fromkeys(PDF_FIELDS)
+            deferred = list(PDF_FIELDS)
+
+        # Add PDF URLs to form data (deferred ones are left out of the update)
+        for field, url in urls.items():
+            form_data[field] = url
+        logger.debug("PDF URLs: %s", urls)
+        result = dict(urls)
+
+        saved = save_recruitcrm_candidate(form_data)
+    except Exception:
+        abandon_submission_futures(pdf_futures, airtable_future)
+        raise
+
+    # Surface Airtable errors the same way as before
+    airtable_future.result()
+    report("recruitcrm_saved" if saved else "recruitcrm_unchanged")
+
+    if deferred:
+        result["pdf_backfill_job"] = defer_pdf_generation(form_data, deferred, report)
+    return result
+
+
+def parse_batch_forms(data, mimetype):
+    """
+    Parse the candidate forms of a batch submit.
+
+    Accepts a JSON list of forms (or ``{"forms": [...]}``), where list
+    values become multi-value fields, or CSV with the field names as header
+    row and one form per row (repeated columns become multi-value fields).
+
+    Args:
+        data: Request body or uploaded file as text
+        mimetype: Its content type, used to tell JSON from CSV
+
+    Returns:
+        List of MultiDict forms
+
+    Raises:
+        ValueError: If the data cannot be parsed
+    """
+    if mimetype.endswith("json") or data.lstrip().startswith(("[", "{")):
+        items = json.loads(data)
+        if isinstance(items, dict):
+            items = items.get("forms")
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValueError("Expected a JSON list of forms")
+
+        forms = []
+        for item in items:
+            form = MultiDict()
+            for key, value in item.items():
+                for single in value if isinstance(value, list) else [value]:
+                    if single is not None and single != "":
+                        form.add(key, str(single))
+            forms.append(form)
+        return forms
+
+    try:
+        rows = list(csv.reader(io.StringIO(data)))
+    except csv.Error as e:
+        raise ValueError(f"Invalid CSV: {e}") from e
+    if not rows:
+        raise ValueError("Expected a CSV header row")
+    header = [name.strip() for name in rows[0]]
+    return [
+        MultiDict([(name, value) for name, value in zip(header, row) if value.strip()])
+        for row in rows[1:] if any(value.strip() for value in row)
+    ]
+
+
+def describe_submission_error(error):
+    """
+    Map a failed submission to the message and status ``/api/submit`` uses.
+
+    Returns:
+        (message, HTTP status code)
+    """
+    if isinstance(error, SubmissionError):
+        return str(error), error.status_code
+    if isinstance(error, CircuitOpenError):
+        return str(error), 503
+    if isinstance(error, requests.exceptions.RequestException):
+        return f"API Request Error: {str(error)}", 500
+    return f"Unexpected error occurred: {str(error)}", 500
+
+
+def batch_item_result(index, form_data, result=None, error=None):
+    """Build the NDJSON line reported for one form of a batch submit."""
+    item = {"index": index, "kandidat_slug": form_data.get("kandidat_slug")}
+    if error is not None:
+        message, status_code = describe_submission_error(error)
+        return {**item, "status": "error", "status_code": status_code,
+                "message": message}
+    return {**item, "status": "success", "status_code": 200, **result}
+
+
+def run_batch_item(index, form_data):
+    """Run one form of a batch submit through the pipeline."""
+    if not form_data.get("kandidat_slug"):
+        return batch_item_result(
+            index, form_data, error=SubmissionError("No candidate ID provided", 400))
+    try:
+        return batch_item_result(
+            index, form_data, process_candidate_submission(form_data))
+    except Exception as e:
+        logger.exception("Batch item %d (%s) failed", index,
+                         form_data.get("kandidat_slug"))
+        return batch_item_result(index, form_data, error=e)
+
+
+def enqueue_batch_forms(forms):
+    """
+    Queue every form of a batch submit as its own submission job.
+
+    Returns:
+        One entry per form with its job id, or an error if it has no
+        candidate ID
+    """
+    jobs = []
+    for index, form_data in enumerate(forms):
+        if not form_data.get("kandidat_slug"):
+            jobs.append(batch_item_result(
+                index, form_data, error=SubmissionError("No candidate ID provided", 400)))
+            continue
+        job_id = job_queue.enqueue(
+            "submission", {"form": list(form_data.items(multi=True))})
+        jobs.append({"index": index, "kandidat_slug": form_data.get("kandidat_slug"),
+                     "status": "queued", "job_id": job_id,
+                     "status_url": f"/api/jobs/{job_id}",
+                     "events_url": f"/api/jobs/{job_id}/events"})
+    return jobs
+
+
+def run_submission_job(payload, report):
+    """Job queue handler: replay a queued form through the pipeline."""
+    return process_candidate_submission(MultiDict(payload["form"]), report)
+
+
+def run_pdf_backfill_job(payload, report):
+    """
+    Job queue handler: render PDFs deferred while PDFMonkey was down.
+
+    Retries every ``PDF_BACKFILL_RETRY_SECONDS`` until PDFMonkey is back,
+    then writes only the PDF fields to RecruitCRM so later edits made in
+    the CRM are kept. A render request PDFMonkey rejects (4xx) fails the
+    job at once with the upstream message.
+    """
+    form_data = MultiDict(payload["form"])
+    candidate_id = form_data.get("kandidat_slug")
+    if time.time() - payload["deferred_at"] > PDF_BACKFILL_MAX_AGE:
+        raise RuntimeError(
+            f"PDFMonkey unavailable for {PDF_BACKFILL_MAX_AGE}s, "
+            f"giving up on PDFs for {candidate_id}")
+
+    templates = dict(zip(PDF_FIELDS, pick_pdf_templates(form_data.get("branche", ""))))
+    pdf_futures = {field: upstream_executor.submit(
+        generate_pdf_and_wait, form_data, templates[field])
+        for field in payload["fields"]}
+    urls, deferred = collect_pdf_urls(pdf_futures)
+    if deferred:
+        raise RetryLater(f"PDFMonkey still unavailable for {deferred}",
+                         PDF_BACKFILL_RETRY_SECONDS)
+    report("pdf_ready", urls=urls)
+
+    changes = {"custom_fields": build_custom_field_payload(MultiDict(urls))}
+    if not changes["custom_fields"]:
+        return urls  # both renders failed outright; nothing to back-fill
+
+    try:
+        response = get_session("recruitcrm").post(
+            f"candidates/{candidate_id}", json=changes)
+    except requests.exceptions.RequestException as e:
+        raise RetryLater(f"RecruitCRM unavailable: {e}", PDF_BACKFILL_RETRY_SECONDS)
+    log_payload(logger, "RecruitCRM response:", response.text)
+    if response.status_code != 200:
+        raise SubmissionError(
+            f"RecruitCRM API Error {response.status_code}: {response.text}",
+            response.status_code
+        )
+
+    # Fold the back-filled fields into the last synced snapshot
+    snapshot = sync_snapshots.get("recruitcrm", candidate_id)
+    if snapshot:
+        sync_snapshots.put(
+            "recruitcrm", candidate_id,
+            {**snapshot["payload"], **_flatten_recruitcrm_payload(changes)},
+            response.json().get("updated_on") or snapshot["version"])
+    report("recruitcrm_saved")
+    return urls
+
+
+job_events = JobEventBroker()
+job_queue = JobQueue(
+    data_path("jobs.sqlite3"),
+    handlers={
+        "submission": run_submission_job,
+        "pdf_backfill": run_pdf_backfill_job,
+    },
+    max_workers=int(os.getenv("JOB_WORKERS", "4")),
+    on_change=job_events.publish
+)
+
+
+def last_event_id(headers, args):
+    """
+    Number of job events a reconnecting client already has.
+
+    Browsers send it as ``Last-Event-ID``; ``?last_event_id=`` serves
+    clients that cannot set headers.
+    """
+    value = headers.get("Last-Event-ID") or args.get("last_event_id", "")
+    return int(value) if value.isdigit() else 0
+
+
+# ============================================================================
+# Flask Routes
+# ============================================================================
+
+@app.before_request
+def start_request_timer():
+    """Remember when handling of the current request started."""
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Record duration and status of the handled request per route."""
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.ROUTE_LATENCY.observe(
+        time.perf_counter() - g.request_started, route, request.method)
+    metrics.ROUTE_REQUESTS.inc(route, request.method, str(response.status_code))
+    return response
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    """
+    Expose route, upstream and PDF polling metrics for Prometheus.
+
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route("/")
+def index():
+    """Render the main candidate form page."""
+    return render_page("kandidatenformular.html")
+
+
+@app.route("/test")
+def test_page():
+    """Render the test form page for development/testing."""
+    return render_template("test_form.html")
+
+
+@app.route("/assets/<path:filename>")
+def fingerprinted_asset(filename: str):
+    """
+    Serve a static file by its fingerprinted URL (see ``asset_url``).
+
+    Args:
+        filename: Fingerprinted path, e.g. "js/autocomplete.3f2a1b9c0d4e.js"
+
+    Returns:
+        The pre-compressed file with immutable caching, or 404
+    """
+    asset = static_assets.get(filename)
+    if asset is None:
+        return jsonify(error=True, message=f"Asset {filename} not found"), 404
+
+    return asset.response(IMMUTABLE_CACHE_CONTROL)
+
+
+@app.route("/api/suggest/<field>")
+def api_suggest(field: str):
+    """
+    Typeahead suggestions for a form field.
+
+    Query parameters: ``q`` (text typed so far) and ``limit`` (default 10).
+    Matches value and word prefixes and, from three characters on, any
+    part of a value; more frequently used values rank higher.
+
+    Args:
+        field: Form field name, e.g. "arbeitgeber_name"
+
+    Returns:
+        JSON with the ranked suggestions
+    """
+    if field not in suggestion_service.index:
+        return jsonify(error=True, message=f"No suggestions for {field}"), 404
+
+    query = request.args.get("q", "")
+    limit = max(1, min(request.args.get("limit", 10, type=int), SUGGEST_MAX_RESULTS))
+
+    response = jsonify(
+        field=field,
+        query=query,
+        suggestions=suggestion_service.suggest(field, query, limit)
+    )
+    response.headers["Cache-Control"] = f"public, max-age={SUGGEST_CACHE_SECONDS}"
+    return response
+
+
+@app.route("/api/custom-fields")
+def api_custom_fields():
+    """
+    API endpoint to get all custom fields mapping.
+
+    Returns:
+        JSON mapping of field IDs to field names
+    """
+    return jsonify(build_custom_fields_map())
+
+
+@app.route("/debug/cf-meta")
+def debug_custom_fields_metadata():
+    """
+    Debug endpoint to display custom field metadata in readable format.
+
+    Returns:
+        HTML formatted display of custom fields with their properties
+    """
+    response = get_session("recruitcrm").get("custom-fields/candidates")
+
+    if not response.ok:
+        return jsonify(
+            error=True,
+            message=f"Failed to fetch custom fields metadata: {
+                response.status_code} {response.text}"
+        )
+
+    return format_custom_fields_metadata(response.json())
+
+
+@app.route("/api/kandidat/<int:candidate_id>")
+def api_get_candidate(candidate_id: int):
+    """
+    Get candidate data by ID and queue a skills sync to Airtable.
+
+    Args:
+        candidate_id: The candidate's ID
+
+    Returns:
+        JSON response with candidate data or error message
+    """
+
+    candidate_data = load_candidate(candidate_id)
+
+    if not candidate_data:
+        return jsonify(
+            error=True,
+            message=f"Candidate {candidate_id} not found"
+        ), 404
+
+    schedule_skills_sync(candidate_data)
+
+    return jsonify(recruit_to_form(candidate_data))
+
+
+@app.route("/api/kandidaten")
+def api_get_candidates():
+    """
+    Get several candidates at once, e.g. a consultant's interview list.
+
+    IDs are passed as ``?ids=1,2,3`` (or repeated ``ids``) and fetched
+    concurrently. Candidates that cannot be loaded are reported under
+    ``errors`` without failing the whole request.
+
+    Returns:
+        JSON with form data per candidate ID and the per-candidate errors
+    """
+    try:
+        candidate_ids = parse_candidate_ids(request.args.getlist("ids"))
+    except ValueError as e:
+        return jsonify(error=True, message=str(e)), 400
+    if not candidate_ids:
+        return jsonify(error=True, message="No candidate IDs provided"), 400
+
+    return jsonify(build_candidates_response(
+        candidate_ids, load_candidates(candidate_ids)))
+
+
+@app.route("/api/submit", methods=["POST"])
+def submit_candidate_form():
+    """
+    Process candidate form submission.
+
+    Handles:
+    - PDF generation (transparent and anonymous versions)
+    - Airtable record creation/update
+    - RecruitCRM candidate update
+
+    With ``?async=1`` the form is only validated and queued; the response is
+    ``202`` with a job id that can be followed via ``/api/jobs/<job_id>``
+    or streamed via ``/api/jobs/<job_id>/events``.
+
+    Returns:
+        JSON response indicating success or failure
+    """
+    logger.info("Processing form submission")
+
+    form_data = request.form.copy()
+    candidate_id = form_data.get("kandidat_slug")
+
+    if not candidate_id:
+        return jsonify(
+            status="error",
+            message="No candidate ID provided"
+        ), 400
+
+    if request.args.get("async", "").lower() in ("1", "true", "yes"):
+        job_id = job_queue.enqueue(
+            "submission", {"form": list(form_data.items(multi=True))})
+        return jsonify(
+            status="queued",
+            job_id=job_id,
+            status_url=f"/api/jobs/{job_id}",
+            events_url=f"/api/jobs/{job_id}/events"
+        ), 202
+
+    try:
+        result = process_candidate_submission(form_data)
+
+        if result.get("pdf_backfill_job"):
+            job_id = result["pdf_backfill_job"]
+            return jsonify(
+                status="success",
+                message="Candidate data saved; PDFs will be added once PDFMonkey is available",
+                pdf_job_id=job_id,
+                pdf_status_url=f"/api/jobs/{job_id}"
+            )
+
+        return jsonify(
+            status="success",
+            message="Candidate data saved successfully"
+        )
+
+    except SubmissionError as e:
+        return jsonify(
+            status="error",
+            message=str(e)
+        ), e.status_code
+    except CircuitOpenError as e:
+        return jsonify(
+            status="error",
+            message=str(e)
+        ), 503, {"Retry-After": str(max(1, round(e.retry_in)))}
     except requests.exceptions.RequestException as e:
         return jsonify(
             status="error",
@@ -593,18 +1740,339 @@ def submit_candidate_form():
         ), 500
 
 
+@app.route("/api/submit/batch", methods=["POST"])
+def submit_candidate_batch():
+    """
+    Process many candidate forms, e.g. after a recruiting event.
+
+    Takes a JSON list of forms or CSV (body or ``file`` upload, see
+    ``parse_batch_forms``). Forms run through the same pipeline as
+    ``/api/submit``, ``BATCH_WORKERS`` candidates at a time, sharing the
+    upstream rate limits. Results are streamed as NDJSON, one line per form
+    in completion order (with its ``index`` in the batch), followed by a
+    summary line.
+
+    With ``?async=1`` every form is queued as its own job instead and the
+    job ids are returned at once.
+
+    Returns:
+        Streamed NDJSON results, or JSON with the queued job ids
+    """
+    upload = request.files.get("file")
+    try:
+        if upload:
+            forms = parse_batch_forms(
+                upload.read().decode("utf-8-sig"), upload.mimetype or "")
+        else:
+            forms = parse_batch_forms(request.get_data(as_text=True), request.mimetype)
+    except ValueError as e:
+        return jsonify(status="error", message=f"Invalid batch: {e}"), 400
+
+    if not forms:
+        return jsonify(status="error", message="No candidate forms provided"), 400
+    if len(forms) > BATCH_MAX_ITEMS:
+        return jsonify(
+            status="error",
+            message=f"At most {BATCH_MAX_ITEMS} forms per batch"
+        ), 413
+
+    logger.info("Processing batch of %d forms", len(forms))
+
+    if request.args.get("async", "").lower() in ("1", "true", "yes"):
+        return jsonify(status="queued", jobs=enqueue_batch_forms(forms)), 202
+
+    futures = [batch_executor.submit(run_batch_item, index, form)
+               for index, form in enumerate(forms)]
+
+    def stream():
+        succeeded = 0
+        for future in as_completed(futures):
+            item = future.result()
+            succeeded += item["status"] == "success"
+            yield json.dumps(item) + "\n"
+        yield json.dumps({"summary": {
+            "total": len(forms),
+            "succeeded": succeeded,
+            "failed": len(forms) - succeeded,
+        }}) + "\n"
+
+    return Response(stream(), content_type="application/x-ndjson")
+
+
+@app.route("/api/jobs/<job_id>")
+def api_get_job(job_id: str):
+    """
+    Report progress of a queued form submission.
+
+    Args:
+        job_id: Identifier returned by ``/api/submit?async=1``
+
+    Returns:
+        JSON job record with status, stages, result (PDF URLs) or error
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify(
+            error=True,
+            message=f"Job {job_id} not found"
+        ), 404
+
+    return jsonify(job)
+
+
+@app.route("/api/jobs/<job_id>/events")
+def api_job_events(job_id: str):
+    """
+    Stream progress of a queued job as Server-Sent Events.
+
+    Sends every stage the job reports ("pdf_queued",
+    "transparent_pdf_ready" with its URL, "airtable_saved",
+    "recruitcrm_saved", …) as soon as it happens, then a final "succeeded"
+    or "failed" event. Stages reported before the stream was opened are
+    replayed, starting after ``Last-Event-ID`` on reconnects.
+
+    Under WSGI every open stream holds a worker thread; served through
+    asgi.py streams are asyncio tasks instead.
+
+    Args:
+        job_id: Identifier returned by ``/api/submit?async=1``
+
+    Returns:
+        ``text/event-stream`` response
+    """
+    if not job_queue.get(job_id):
+        return jsonify(
+            error=True,
+            message=f"Job {job_id} not found"
+        ), 404
+    sent = last_event_id(request.headers, request.args)
+
+    def stream():
+        nonlocal sent
+        changed = threading.Event()
+        unsubscribe = job_events.subscribe(job_id, changed.set)
+        deadline = time.monotonic() + JOB_EVENTS_MAX_SECONDS
+        try:
+            # Opens the stream at once and sets the browser's reconnect delay
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while True:
+                changed.clear()
+                messages, finished = job_sse_events(job_queue.get(job_id), sent)
+                if messages:
+                    sent += len(messages)
+                    yield "".join(messages)
+                if finished or time.monotonic() > deadline:
+                    return
+                if not changed.wait(JOB_EVENTS_POLL_SECONDS):
+                    yield ": keepalive\n\n"
+        finally:
+            unsubscribe()
+
+    return Response(
+        stream(),
+        content_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@app.route("/webhooks/pdfmonkey", methods=["POST"])
+def pdfmonkey_webhook():
+    """
+    Receive PDFMonkey "document generated" callbacks.
+
+    The callback must carry the shared secret as ``?token=`` (or the
+    ``X-Webhook-Token`` header). Verified callbacks wake the submission
+    waiting for that document; the status poller stays as a fallback.
+
+    Returns:
+        JSON acknowledgement
+    """
+    if not PDFMONKEY_WEBHOOK_SECRET:
+        return jsonify(error=True, message="Webhooks are not enabled"), 404
+
+    token = request.args.get("token") or request.headers.get("X-Webhook-Token", "")
+    # Compared as bytes: compare_digest rejects non-ASCII str with TypeError
+    if not hmac.compare_digest(token.encode(), PDFMONKEY_WEBHOOK_SECRET.encode()):
+        return jsonify(error=True, message="Invalid webhook token"), 403
+
+    body = request.get_json(silent=True) or {}
+    document = body.get("document") or body.get("document_card")
+    if not isinstance(document, dict) or not document.get("id"):
+        return jsonify(error=True, message="Missing document"), 400
+
+    woken = pdf_webhooks.notify(document)
+    logger.info("PDFMonkey webhook for %s: %s (waiting: %s)",
+                document["id"], document.get("status"), woken)
+
+    return jsonify(status="ok")
+
+
+# ============================================================================
+# CLI Commands
+# ============================================================================
+
+def backfill_candidate_page(page, page_size):
+    """
+    Copy one page of RecruitCRM candidates into Airtable.
+
+    Args:
+        page: 1-based RecruitCRM page number
+        page_size: Candidates per page
+
+    Returns:
+        Dictionary with per-page counts and whether a next page exists
+    """
+    candidates, has_next = fetch_page("candidates", page, page_size)
+    forms = [
+        recruit_to_submission_form(candidate)
+        for candidate in candidates
+        if candidate.get("email")
+    ]
+    records = upsert_candidate_records(forms) if forms else []
+
+    return {
+        "read": len(candidates),
+        "written": sum(record is not None for record in records),
+        "failed": sum(record is None for record in records),
+        "skipped": len(candidates) - len(forms),
+        "has_next": has_next,
+    }
+
+
+@app.cli.command("backfill-airtable")
+@click.option("--page-size", default=100, show_default=True,
+              help="Candidates fetched per RecruitCRM page.")
+@click.option("--concurrency", default=3, show_default=True,
+              help="Pages processed in parallel (Airtable stays at 5 req/s).")
+@click.option("--max-pages", type=int, default=None,
+              help="Stop after this many pages.")
+@click.option("--checkpoint", default=lambda: data_path("backfill_checkpoint.json"),
+              show_default="data/backfill_checkpoint.json",
+              help="File recording the next page to process.")
+@click.option("--restart", is_flag=True,
+              help="Ignore an existing checkpoint and start at page 1.")
+def backfill_airtable_command(page_size, concurrency, max_pages, checkpoint, restart):
+    """Stream all RecruitCRM candidates into Airtable."""
+    start_page = 1
+    if not restart and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            start_page = json.load(f).get("next_page", 1)
+        logger.info("Resuming backfill at page %d", start_page)
+
+    totals = {"pages": 0, "read": 0, "written": 0, "failed": 0, "skipped": 0}
+    started = time.monotonic()
+    next_page = start_page     # every page before this one is done
+    page = start_page          # next page to schedule
+    done_pages = set()
+    pending = {}
+    exhausted = False
+    error = None
+    reached_end = False
+
+    def report():
+        elapsed = time.monotonic() - started
+        rate = totals["read"] / elapsed if elapsed else 0.0
+        logger.info(
+            "[%7.1fs] pages %d | read %d | written %d | failed %d | "
+            "skipped %d | %.1f candidates/s",
+            elapsed, totals["pages"], totals["read"], totals["written"],
+            totals["failed"], totals["skipped"], rate)
+
+    with ThreadPoolExecutor(max_workers=concurrency,
+                            thread_name_prefix="backfill") as pool:
+        while pending or not exhausted:
+            while (not exhausted and len(pending) < concurrency
+                   and (max_pages is None or page < start_page + max_pages)):
+                pending[pool.submit(backfill_candidate_page, page, page_size)] = page
+                page += 1
+            if max_pages is not None and page >= start_page + max_pages:
+                exhausted = True
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                finished_page = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = error or f"page {finished_page}: {e}"
+                    exhausted = True
+                    continue
+
+                done_pages.add(finished_page)
+                totals["pages"] += 1 if result["read"] else 0
+                for key in ("read", "written", "failed", "skipped"):
+                    totals[key] += result[key]
+                if not result["has_next"]:
+                    exhausted = reached_end = True
+
+            while next_page in done_pages:
+                done_pages.discard(next_page)
+                next_page += 1
+            with open(checkpoint, "w") as f:
+                json.dump({"next_page": next_page, **totals}, f)
+            report()
+
+    report()
+    if error:
+        raise click.ClickException(
+            f"Backfill stopped at {error}; rerun to resume from page {next_page}")
+    if reached_end:
+        # A complete run leaves nothing to resume
+        os.remove(checkpoint)
+        logger.info("Backfill finished")
+    else:
+        logger.info("Backfill stopped, resume from page %d", next_page)
+
+
 # ============================================================================
 # Application Startup
 # ============================================================================
 
+_background_services_started = False
+_background_services_lock = threading.Lock()
+
+
+def start_background_services():
+    """
+    Start the job queue, background candidate mirror sync and suggestion
+    index refresh.
+
+    Called when the app starts serving (first request under WSGI,
+    ``before_serving`` under asgi.py), not on import, so CLI commands,
+    tools and tests importing app.py neither page through RecruitCRM and
+    Airtable nor resume or take over queued submissions. Safe to call
+    more than once.
+    """
+    global _background_services_started
+    with _background_services_lock:
+        if _background_services_started:
+            return
+        _background_services_started = True
+
+    job_queue.start()
+    if CANDIDATE_SYNC_INTERVAL > 0:
+        candidate_store.start_background_sync(CANDIDATE_SYNC_INTERVAL)
+    if SUGGEST_REFRESH_INTERVAL > 0:
+        suggestion_service.start_background_refresh(SUGGEST_REFRESH_INTERVAL)
+
+
+@app.before_request
+def start_background_services_on_first_request():
+    """Start the background services once the WSGI app serves requests."""
+    if not _background_services_started:
+        start_background_services()
+
+
 def print_flask_routes():
-    """Print all registered Flask routes for debugging."""
-    print("\n=== Registered Flask Routes ===")
+    """Log all registered Flask routes for debugging."""
+    lines = ["=== Registered Flask Routes ==="]
     for rule in app.url_map.iter_rules():
         methods = sorted(
             [method for method in rule.methods if method not in ['HEAD', 'OPTIONS']])
-        print(f"{str(rule):<30} → {methods}")
-    print()
+        lines.append(f"{str(rule):<30} → {methods}")
+    logger.info("\n".join(lines))
 
 
 if __name__ == "__main__":
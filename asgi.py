@@ -0,0 +1,775 @@
+"""
+Emploio Interview Sheet - ASGI Entry Point
+
+Serves asyncio implementations of the I/O-bound routes, so a single process
+can keep many submissions and candidate loads in flight without a worker
+thread each:
+
+- POST /api/submit
+- POST /api/submit/batch
+- GET  /api/kandidat/<id>
+- GET  /api/kandidaten?ids=…
+- GET  /api/jobs/<id>/events
+- GET  /debug/cf-meta
+
+Every other route (form pages, job status, webhooks, …) falls through to the
+Flask app in app.py, which stays usable on its own as a WSGI app.
+
+The SQLite-backed stores shared with app.py (candidate mirror, snapshots,
+PDF cache, job queue) are only used via ``asyncio.to_thread`` here, so a
+slow disk or a locked database never stalls the event loop.
+
+Run with:
+
+    hypercorn asgi:application --bind 0.0.0.0:8000
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+import requests
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from quart import Quart, g, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+from app import (
+    AIRTABLE_BATCH_SIZE,
+    BASE_ID,
+    BATCH_MAX_ITEMS,
+    BATCH_WORKERS,
+    CANDIDATE_FETCH_CONCURRENCY,
+    JOB_EVENTS_MAX_SECONDS,
+    JOB_EVENTS_POLL_SECONDS,
+    PDF_FIELDS,
+    PDF_POLL_FALLBACK_INTERVAL,
+    PDFMONKEY_WEBHOOK_SECRET,
+    SSE_HEADERS,
+    SSE_RETRY_MS,
+    SubmissionError,
+    airtable_upserts,
+    app as flask_app,
+    batch_item_result,
+    build_candidates_response,
+    build_pdf_payload,
+    build_recruitcrm_payload,
+    candidate_store,
+    defer_pdf_generation,
+    diff_recruitcrm_payload,
+    enqueue_batch_forms,
+    fetch_candidate_from_list,
+    is_mirror_fresh,
+    format_custom_fields_metadata,
+    job_events,
+    job_queue,
+    last_event_id,
+    parse_batch_forms,
+    parse_candidate_ids,
+    pdf_rejected_error,
+    pdf_cache,
+    pick_pdf_templates,
+    record_recruitcrm_response,
+    schedule_skills_sync,
+    start_background_services,
+)
+from utils import metrics, pdf_webhooks
+from utils.async_http import close_async_clients, get_async_client, is_unavailable_error
+from utils.circuit_breaker import CircuitOpenError
+from utils.http_client import get_circuit_breaker
+from utils.job_events import job_sse_events
+from utils.logging_config import log_payload
+from utils.recruit_mapper import recruit_to_form
+
+logger = logging.getLogger(__name__)
+
+# Largest request body handed to the Flask fallback
+WSGI_MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# Candidates of batch submits processed at once, across all batches
+batch_slots = asyncio.Semaphore(BATCH_WORKERS)
+
+# Static files are left to the Flask app
+async_app = Quart(__name__, static_folder=None)
+
+
+# ============================================================================
+# Candidate Loading
+# ============================================================================
+
+async def load_candidate_async(candidate_id: int) -> dict | None:
+    """
+    Async version of ``app.load_candidate``.
+
+    Args:
+        candidate_id: The candidate's ID
+
+    Returns:
+        Candidate data dictionary or None if not found
+    """
+    cached = await asyncio.to_thread(candidate_store.get, candidate_id)
+    if await asyncio.to_thread(is_mirror_fresh, cached):
+        return cached["data"]
+
+    try:
+        direct_response = await get_async_client("recruitcrm").get(
+            f"candidates/{candidate_id}")
+    except (httpx.HTTPError, CircuitOpenError) as e:
+        logger.error("Failed to fetch candidate %s: %s", candidate_id, e)
+        direct_response = None
+
+    if direct_response is not None and direct_response.is_success:
+        candidate_data = direct_response.json()
+        await asyncio.to_thread(candidate_store.upsert, [candidate_data])
+        return candidate_data
+
+    if cached:
+        return cached["data"]
+    # Rare path (mirror miss + API failure): sync the mirror off the loop
+    return await asyncio.to_thread(fetch_candidate_from_list, candidate_id)
+
+
+async def load_candidates_async(candidate_ids):
+    """
+    Async version of ``app.load_candidates``.
+
+    Returns:
+        {candidate ID: candidate data, None if not found, or the exception
+        the load raised}
+    """
+    slots = asyncio.Semaphore(CANDIDATE_FETCH_CONCURRENCY)
+
+    async def load(candidate_id):
+        async with slots:
+            try:
+                return await load_candidate_async(candidate_id)
+            except Exception as e:
+                logger.error("Failed to load candidate %s: %s", candidate_id, e)
+                return e
+
+    loaded = await asyncio.gather(*(load(candidate_id) for candidate_id in candidate_ids))
+    return dict(zip(candidate_ids, loaded))
+
+
+# ============================================================================
+# Airtable Integration
+# ============================================================================
+
+async def _upsert_airtable_batch_async(table_id, batch):
+    """Send up to 10 records in one ``performUpsert`` PATCH."""
+    return await get_async_client("airtable").patch(
+        f"{BASE_ID}/{table_id}", json=airtable_upserts.upsert_body(table_id, batch))
+
+
+async def upsert_airtable_batch_async(table_id, batch, retry_stale=True):
+    """
+    Async version of ``app.upsert_airtable_batch``.
+
+    Returns:
+        List of saved records (None where a record failed), in input order
+    """
+    response = await _upsert_airtable_batch_async(table_id, batch)
+    if response.status_code == 200:
+        records = response.json().get("records", [])
+        airtable_upserts.index_records(table_id, records)
+        return records
+
+    stale = airtable_upserts.stale_records(table_id, batch, response) if retry_stale else []
+    if stale:
+        await asyncio.to_thread(airtable_upserts.forget_batch, table_id, stale)
+        return await upsert_airtable_batch_async(table_id, batch, retry_stale=False)
+
+    if response.status_code == 422 and len(batch) > 1:
+        middle = len(batch) // 2
+        return (await upsert_airtable_batch_async(table_id, batch[:middle])
+                + await upsert_airtable_batch_async(table_id, batch[middle:]))
+
+    logger.error("Failed to upsert Airtable records %s: %s %s",
+                 [fields["email"] for fields in batch], response.status_code, response.text)
+    return [None] * len(batch)
+
+
+async def upsert_airtable_records_async(table_id, fields_list):
+    """
+    Async version of ``app.upsert_airtable_records``.
+
+    Returns:
+        List of saved records (None where saving failed), in input order
+    """
+    results = []
+    for start in range(0, len(fields_list), AIRTABLE_BATCH_SIZE):
+        results += await upsert_airtable_batch_async(
+            table_id, fields_list[start:start + AIRTABLE_BATCH_SIZE])
+    return results
+
+
+async def upsert_candidate_record_async(form_data):
+    """
+    Async version of ``app.upsert_candidate_record``.
+
+    Returns:
+        Saved record or None if operation failed
+    """
+    results, plans = await asyncio.to_thread(airtable_upserts.plan, [form_data])
+
+    for table_id, entries in plans:
+        records = await upsert_airtable_records_async(
+            table_id, [changes for _, _, _, changes in entries])
+        await asyncio.to_thread(
+            airtable_upserts.record, table_id, entries, records, results)
+
+    return results[0]
+
+
+# ============================================================================
+# PDF Generation
+# ============================================================================
+
+async def poll_pdf_generation_status_async(document_id, max_wait_seconds=60,
+                                           check_interval=None):
+    """
+    Async version of ``app.poll_pdf_generation_status``.
+
+    Waits on the webhook (or the fallback interval) without holding a thread.
+
+    Returns:
+        Download URL if successful, None if generation failed
+
+    Raises:
+        httpx.TimeoutException: If the document is not ready in time
+    """
+    if check_interval is None:
+        check_interval = (
+            PDF_POLL_FALLBACK_INTERVAL if PDFMONKEY_WEBHOOK_SECRET else 5)
+
+    status_url = f"document_cards/{document_id}"
+    deadline = time.monotonic() + max_wait_seconds
+
+    checks = 0
+    result = "error"
+
+    pdf_webhooks.register(document_id)
+    try:
+        while time.monotonic() < deadline:
+            response = await get_async_client("pdfmonkey").get(status_url)
+            checks += 1
+
+            if response.status_code != 200:
+                logger.error("Error checking PDF generation status: %s", response.text)
+                return None
+
+            document_data = response.json()
+            log_payload(logger, "PDF status check:", document_data)
+
+            status = document_data["document_card"]["status"]
+
+            if status == "success":
+                logger.info("PDF %s generated successfully", document_id)
+                result = "success"
+                return document_data["document_card"]["public_share_link"]
+            elif status == "failure":
+                logger.error("PDF %s generation failed", document_id)
+                result = "failure"
+                return None
+
+            remaining = deadline - time.monotonic()
+            document = await pdf_webhooks.wait_async(
+                document_id, max(0, min(check_interval, remaining)))
+
+            if document and document.get("status") == "success" \
+                    and document.get("public_share_link"):
+                logger.info("PDF %s generated successfully (webhook)", document_id)
+                result = "success"
+                return document["public_share_link"]
+            elif document and document.get("status") == "failure":
+                logger.error("PDF %s generation failed (webhook)", document_id)
+                result = "failure"
+                return None
+        result = "timeout"
+    finally:
+        pdf_webhooks.unregister(document_id)
+        metrics.PDF_POLL_ITERATIONS.observe(checks, result)
+
+    get_circuit_breaker("pdfmonkey").record_failure()
+    raise httpx.TimeoutException(
+        f"PDF {document_id} not ready after {max_wait_seconds}s")
+
+
+async def generate_pdf_and_wait_async(form_data, template_id):
+    """
+    Async version of ``app.generate_pdf_and_wait``.
+
+    Returns:
+        Public share link if successful, None if generation failed
+    """
+    pdf_payload = build_pdf_payload(form_data, template_id)
+
+    cached_url = await asyncio.to_thread(pdf_cache.get, template_id, pdf_payload)
+    if cached_url:
+        logger.info("Reusing cached PDF for template %s", template_id)
+        return cached_url
+
+    response = await get_async_client("pdfmonkey").post(
+        "documents",
+        json={
+            "document": {
+                "document_template_id": template_id,
+                "payload": pdf_payload,
+                "status": "pending"
+            }
+        }
+    )
+    response.raise_for_status()
+    document_id = response.json()["document"]["id"]
+    download_url = await poll_pdf_generation_status_async(document_id)
+
+    if download_url:
+        await asyncio.to_thread(pdf_cache.put, template_id, pdf_payload, download_url)
+    return download_url
+
+
+# ============================================================================
+# Submission Pipeline
+# ============================================================================
+
+async def save_recruitcrm_candidate_async(form_data):
+    """
+    Async version of ``app.save_recruitcrm_candidate``.
+
+    Returns:
+        True if saved, False if nothing changed since the last save
+    """
+    candidate_id = form_data.get("kandidat_slug")
+    recruitcrm_payload = build_recruitcrm_payload(form_data)
+    changes = await asyncio.to_thread(
+        diff_recruitcrm_payload, candidate_id, recruitcrm_payload)
+
+    if changes is None:
+        return False
+
+    recruitcrm_response = await get_async_client("recruitcrm").post(
+        f"candidates/{candidate_id}",
+        json=changes
+    )
+
+    await asyncio.to_thread(
+        record_recruitcrm_response, candidate_id, recruitcrm_payload, recruitcrm_response)
+    return True
+
+
+async def collect_pdf_urls_async(pdf_tasks):
+    """
+    Async version of ``app.collect_pdf_urls``.
+
+    Returns:
+        ({form field: URL or None}, [fields to defer])
+    """
+    urls, deferred = {}, []
+    for field, task in pdf_tasks.items():
+        try:
+            urls[field] = await task
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            if not is_unavailable_error(e):
+                raise pdf_rejected_error(e) from e
+            logger.warning("Deferring %s PDF: %s", field, e)
+            urls[field] = None
+            deferred.append(field)
+    return urls, deferred
+
+
+async def cancel_tasks(tasks):
+    """
+    Cancel the unfinished tasks of a failed submission and wait for them,
+    so none is left running or reports an unretrieved exception.
+    """
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def process_candidate_submission_async(form_data, report=None):
+    """
+    Async version of ``app.process_candidate_submission``.
+
+    Both PDFs and the Airtable upsert run as concurrent tasks; only the
+    RecruitCRM update waits for the PDF URLs. PDFs are deferred to a
+    backfill job while PDFMonkey is unavailable.
+
+    Returns:
+        Dictionary with the transparent and anonymous PDF URLs (None while
+        deferred) and, if PDFs were deferred, the backfill job id
+
+    Raises:
+        SubmissionError: If RecruitCRM rejects the update
+    """
+    report = report or (lambda stage, **details: None)
+    transparent_template, anonymous_template = pick_pdf_templates(
+        form_data.get("branche", ""))
+
+    pdf_tasks = {}
+    if get_circuit_breaker("pdfmonkey").is_open():
+        logger.warning("PDFMonkey unavailable, deferring PDF generation")
+    else:
+        pdf_tasks = {
+            "auswertung": asyncio.create_task(
+                generate_pdf_and_wait_async(form_data, transparent_template)),
+            "anonym_auswertung": asyncio.create_task(
+                generate_pdf_and_wait_async(form_data, anonymous_template)),
+        }
+        report("pdf_queued")
+    airtable_task = asyncio.create_task(upsert_candidate_record_async(form_data))
+
+    def on_pdf_done(stage):
+        def callback(task):
+            if not task.cancelled() and task.exception() is None:
+                report(stage, url=task.result())
+        return callback
+
+    def on_airtable_done(task):
+        if not task.cancelled() and task.exception() is None:
+            record = task.result()
+            if not record:
+                report("airtable_failed")
+            else:
+                report("airtable_unchanged" if record.get("unchanged")
+                       else "airtable_saved")
+
+    if pdf_tasks:
+        pdf_tasks["auswertung"].add_done_callback(
+            on_pdf_done("transparent_pdf_ready"))
+        pdf_tasks["anonym_auswertung"].add_done_callback(
+            on_pdf_done("anonymous_pdf_ready"))
+    airtable_task.add_done_callback(on_airtable_done)
+
+    try:
+        if pdf_tasks:
+            urls, deferred = await collect_pdf_urls_async(pdf_tasks)
+        else:
+            urls = dict.fromkeys(PDF_FIELDS)
+            deferred = list(PDF_FIELDS)
+
+        for field, url in urls.items():
+            form_data[field] = url
+        result = dict(urls)
+
+        saved = await save_recruitcrm_candidate_async(form_data)
+    except BaseException:
+        # Includes cancellation of the request itself
+        await cancel_tasks([*pdf_tasks.values(), airtable_task])
+        raise
+
+    # Surface Airtable errors the same way as the sync pipeline
+    await airtable_task
+    report("recruitcrm_saved" if saved else "recruitcrm_unchanged")
+
+    if deferred:
+        result["pdf_backfill_job"] = await asyncio.to_thread(
+            defer_pdf_generation, form_data, deferred, report)
+    return result
+
+
+async def run_batch_item_async(index, form_data):
+    """Async version of ``app.run_batch_item``, bounded by ``batch_slots``."""
+    if not form_data.get("kandidat_slug"):
+        return batch_item_result(
+            index, form_data, error=SubmissionError("No candidate ID provided", 400))
+    async with batch_slots:
+        try:
+            return batch_item_result(
+                index, form_data, await process_candidate_submission_async(form_data))
+        except Exception as e:
+            logger.exception("Batch item %d (%s) failed", index,
+                             form_data.get("kandidat_slug"))
+            error = e
+            if isinstance(e, httpx.HTTPError):
+                # Reported like the sync pipeline's requests errors
+                error = requests.exceptions.RequestException(str(e))
+            return batch_item_result(index, form_data, error=error)
+
+
+# ============================================================================
+# Async Routes
+# ============================================================================
+
+@async_app.before_request
+async def start_request_timer():
+    """Remember when handling of the current request started."""
+    g.request_started = time.perf_counter()
+
+
+@async_app.after_request
+async def record_request_metrics(response):
+    """Record duration and status of the handled request per route."""
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.ROUTE_LATENCY.observe(
+        time.perf_counter() - g.request_started, route, request.method)
+    metrics.ROUTE_REQUESTS.inc(route, request.method, str(response.status_code))
+    return response
+
+
+@async_app.route("/debug/cf-meta")
+async def debug_custom_fields_metadata():
+    """
+    Debug endpoint to display custom field metadata in readable format.
+
+    Returns:
+        HTML formatted display of custom fields with their properties
+    """
+    response = await get_async_client("recruitcrm").get("custom-fields/candidates")
+
+    if not response.is_success:
+        return jsonify(
+            error=True,
+            message=f"Failed to fetch custom fields metadata: {
+                response.status_code} {response.text}"
+        )
+
+    return format_custom_fields_metadata(response.json())
+
+
+@async_app.route("/api/kandidaten")
+async def api_get_candidates():
+    """
+    Get several candidates at once (see ``app.api_get_candidates``).
+
+    Returns:
+        JSON with form data per candidate ID and the per-candidate errors
+    """
+    try:
+        candidate_ids = parse_candidate_ids(request.args.getlist("ids"))
+    except ValueError as e:
+        return jsonify(error=True, message=str(e)), 400
+    if not candidate_ids:
+        return jsonify(error=True, message="No candidate IDs provided"), 400
+
+    return jsonify(build_candidates_response(
+        candidate_ids, await load_candidates_async(candidate_ids)))
+
+
+@async_app.route("/api/kandidat/<int:candidate_id>")
+async def api_get_candidate(candidate_id: int):
+    """
+    Get candidate data by ID and queue a skills sync to Airtable.
+
+    Args:
+        candidate_id: The candidate's ID
+
+    Returns:
+        JSON response with candidate data or error message
+    """
+    candidate_data = await load_candidate_async(candidate_id)
+
+    if not candidate_data:
+        return jsonify(
+            error=True,
+            message=f"Candidate {candidate_id} not found"
+        ), 404
+
+    schedule_skills_sync(candidate_data)
+
+    return jsonify(recruit_to_form(candidate_data))
+
+
+@async_app.route("/api/submit", methods=["POST"])
+async def submit_candidate_form():
+    """
+    Process candidate form submission (see ``app.submit_candidate_form``).
+
+    Returns:
+        JSON response indicating success or failure
+    """
+    logger.info("Processing form submission")
+
+    form_data = (await request.form).copy()
+    candidate_id = form_data.get("kandidat_slug")
+
+    if not candidate_id:
+        return jsonify(
+            status="error",
+            message="No candidate ID provided"
+        ), 400
+
+    if request.args.get("async", "").lower() in ("1", "true", "yes"):
+        job_id = await asyncio.to_thread(
+            job_queue.enqueue, "submission", {"form": list(form_data.items(multi=True))})
+        return jsonify(
+            status="queued",
+            job_id=job_id,
+            status_url=f"/api/jobs/{job_id}",
+            events_url=f"/api/jobs/{job_id}/events"
+        ), 202
+
+    try:
+        result = await process_candidate_submission_async(form_data)
+
+        if result.get("pdf_backfill_job"):
+            job_id = result["pdf_backfill_job"]
+            return jsonify(
+                status="success",
+                message="Candidate data saved; PDFs will be added once PDFMonkey is available",
+                pdf_job_id=job_id,
+                pdf_status_url=f"/api/jobs/{job_id}"
+            )
+
+        return jsonify(
+            status="success",
+            message="Candidate data saved successfully"
+        )
+
+    except SubmissionError as e:
+        return jsonify(
+            status="error",
+            message=str(e)
+        ), e.status_code
+    except CircuitOpenError as e:
+        return jsonify(
+            status="error",
+            message=str(e)
+        ), 503, {"Retry-After": str(max(1, round(e.retry_in)))}
+    except httpx.HTTPError as e:
+        return jsonify(
+            status="error",
+            message=f"API Request Error: {str(e)}"
+        ), 500
+    except Exception as e:
+        return jsonify(
+            status="error",
+            message=f"Unexpected error occurred: {str(e)}"
+        ), 500
+
+
+@async_app.route("/api/submit/batch", methods=["POST"])
+async def submit_candidate_batch():
+    """
+    Process many candidate forms (see ``app.submit_candidate_batch``).
+
+    Returns:
+        Streamed NDJSON results, or JSON with the queued job ids
+    """
+    files = await request.files
+    upload = files.get("file")
+    try:
+        if upload:
+            forms = parse_batch_forms(
+                upload.read().decode("utf-8-sig"), upload.mimetype or "")
+        else:
+            forms = parse_batch_forms(
+                await request.get_data(as_text=True), request.mimetype)
+    except ValueError as e:
+        return jsonify(status="error", message=f"Invalid batch: {e}"), 400
+
+    if not forms:
+        return jsonify(status="error", message="No candidate forms provided"), 400
+    if len(forms) > BATCH_MAX_ITEMS:
+        return jsonify(
+            status="error",
+            message=f"At most {BATCH_MAX_ITEMS} forms per batch"
+        ), 413
+
+    logger.info("Processing batch of %d forms", len(forms))
+
+    if request.args.get("async", "").lower() in ("1", "true", "yes"):
+        jobs = await asyncio.to_thread(enqueue_batch_forms, forms)
+        return jsonify(status="queued", jobs=jobs), 202
+
+    tasks = [asyncio.create_task(run_batch_item_async(index, form))
+             for index, form in enumerate(forms)]
+
+    async def stream():
+        succeeded = 0
+        for next_done in asyncio.as_completed(tasks):
+            item = await next_done
+            succeeded += item["status"] == "success"
+            yield (json.dumps(item) + "\n").encode()
+        yield (json.dumps({"summary": {
+            "total": len(forms),
+            "succeeded": succeeded,
+            "failed": len(forms) - succeeded,
+        }}) + "\n").encode()
+
+    return stream(), 200, {"Content-Type": "application/x-ndjson"}
+
+
+@async_app.route("/api/jobs/<job_id>/events")
+async def api_job_events(job_id: str):
+    """
+    Stream progress of a queued job (see ``app.api_job_events``).
+
+    An open stream costs one task and one subscription, so many people can
+    follow submissions at once.
+
+    Returns:
+        ``text/event-stream`` response
+    """
+    if not await asyncio.to_thread(job_queue.get, job_id):
+        return jsonify(
+            error=True,
+            message=f"Job {job_id} not found"
+        ), 404
+    sent = last_event_id(request.headers, request.args)
+
+    async def stream():
+        nonlocal sent
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        # Jobs report from worker threads
+        unsubscribe = job_events.subscribe(
+            job_id, lambda: loop.call_soon_threadsafe(changed.set))
+        deadline = time.monotonic() + JOB_EVENTS_MAX_SECONDS
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+            while True:
+                changed.clear()
+                job = await asyncio.to_thread(job_queue.get, job_id)
+                messages, finished = job_sse_events(job, sent)
+                if messages:
+                    sent += len(messages)
+                    yield "".join(messages).encode()
+                if finished or time.monotonic() > deadline:
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), JOB_EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            unsubscribe()
+
+    response = await async_app.make_response(
+        (stream(), 200, {"Content-Type": "text/event-stream", **SSE_HEADERS}))
+    # Keep the stream open past Quart's default response timeout
+    response.timeout = None
+    return response
+
+
+@async_app.before_serving
+async def start_background_services_async():
+    """Start the mirror sync and suggestion refresh with the server."""
+    start_background_services()
+
+
+@async_app.after_serving
+async def shutdown_async_clients():
+    """Close pooled upstream connections on shutdown."""
+    await close_async_clients()
+
+
+# ============================================================================
+# ASGI Application
+# ============================================================================
+
+wsgi_fallback = AsyncioWSGIMiddleware(flask_app, max_body_size=WSGI_MAX_BODY_SIZE)
+_async_routes = async_app.url_map.bind("")
+
+
+async def application(scope, receive, send):
+    """
+    ASGI callable: async routes go to Quart, everything else to Flask.
+    """
+    if scope["type"] in ("http", "websocket"):
+        try:
+            _async_routes.match(scope["path"], method=scope.get("method", "GET"))
+        except HTTPException:
+            await wsgi_fallback(scope, receive, send)
+            return
+    await async_app(scope, receive, send)
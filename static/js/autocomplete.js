@@ -1,25 +1,35 @@
 document.addEventListener("DOMContentLoaded", function () {
     const autocompleteFields = document.querySelectorAll('input[data-autocomplete="true"], textarea[data-autocomplete="true"]');
+    // Answers per "field|query", so retyping or deleting a character is instant
+    const cache = new Map();
 
     autocompleteFields.forEach(field => {
         const isMultiple = field.dataset.multipleValues === "true";
         const suggestionType = field.name;
-        const suggestions = window.suggestionDatabase?.[suggestionType] || [];
+        let debounceTimer = null;
+        let pending = null;
 
-        field.addEventListener("input", function () {
-            const container = createSuggestionBox(field);
-            container.innerHTML = "";
-
-            const rawValue = field.value;
-            const currentInput = isMultiple
-                ? rawValue.split(",").pop().trim().toLowerCase()
-                : rawValue.toLowerCase();
+        async function fetchSuggestions(query) {
+            const key = `${suggestionType}|${query.toLowerCase()}`;
+            if (cache.has(key)) return cache.get(key);
 
-            if (!currentInput) return;
+            if (pending) pending.abort();
+            pending = new AbortController();
+            const response = await fetch(
+                `/api/suggest/${encodeURIComponent(suggestionType)}?q=${encodeURIComponent(query)}&limit=10`,
+                { signal: pending.signal }
+            );
+            if (!response.ok) return [];
+            const matches = (await response.json()).suggestions.map(s => s.value);
+            cache.set(key, matches);
+            return matches;
+        }
 
-            const matches = suggestions.filter(s => s.toLowerCase().includes(currentInput));
+        function showSuggestions(rawValue, matches) {
+            const container = createSuggestionBox(field);
+            container.innerHTML = "";
 
-            matches.slice(0, 10).forEach(match => {
+            matches.forEach(match => {
                 const item = document.createElement("div");
                 item.classList.add("autocomplete-item");
                 item.textContent = match;
@@ -36,6 +46,29 @@ document.addEventListener("DOMContentLoaded", function () {
                 });
                 container.appendChild(item);
             });
+        }
+
+        field.addEventListener("input", function () {
+            const rawValue = field.value;
+            const currentInput = isMultiple
+                ? rawValue.split(",").pop().trim()
+                : rawValue.trim();
+
+            clearTimeout(debounceTimer);
+            if (!currentInput) {
+                createSuggestionBox(field).innerHTML = "";
+                return;
+            }
+
+            debounceTimer = setTimeout(async () => {
+                try {
+                    const matches = await fetchSuggestions(currentInput);
+                    // Drop answers for text the user has typed past
+                    if (field.value === rawValue) showSuggestions(rawValue, matches);
+                } catch (error) {
+                    if (error.name !== "AbortError") console.error("Vorschläge konnten nicht geladen werden:", error);
+                }
+            }, 120);
         });
 
         field.addEventListener("blur", () => {
@@ -60,4 +93,4 @@ document.addEventListener("DOMContentLoaded", function () {
         }
         return box;
     }
-});
\ No newline at end of file
+});
@@ -15,18 +15,29 @@ document.addEventListener("DOMContentLoaded", () => {
     return el?.tomselect ?? null;
   };
 
+  // Candidates loaded in advance from a list of IDs ("12, 15, 31")
+  const prefetched = new Map();
+
   loadBtn.addEventListener("click", async () => {
-    const kid = idInput.value.trim();
-    if (!kid) {
+    const ids = idInput.value.split(/[\s,;]+/).filter(Boolean);
+    if (!ids.length) {
       alert("Bitte eine Kandidaten-ID eingeben!");
       return;
     }
 
     try {
-      const r = await fetch(`/api/kandidat/${kid}`);
-      if (!r.ok) throw new Error(`HTTP ${r.status}`);
+      if (ids.length > 1) {
+        await loadCandidateList(ids);
+        return;
+      }
 
-      const d = await r.json();
+      const kid = ids[0];
+      let d = prefetched.get(kid);
+      if (!d) {
+        const r = await fetch(`/api/kandidat/${kid}`);
+        if (!r.ok) throw new Error(`HTTP ${r.status}`);
+        d = await r.json();
+      }
       fillForm(d);
       showNotice("Daten erfolgreich geladen!", "is-success");
     } catch (e) {
@@ -35,20 +46,62 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   });
 
+  // Load several candidates in one request and show the first one
+  async function loadCandidateList(ids) {
+    const r = await fetch(`/api/kandidaten?ids=${encodeURIComponent(ids.join(","))}`);
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+
+    const d = await r.json();
+    Object.entries(d.candidates).forEach(([id, c]) => prefetched.set(id, c));
+
+    const first = ids.find((id) => prefetched.has(id));
+    if (first) {
+      idInput.value = first;
+      fillForm(prefetched.get(first));
+    }
+
+    const failed = d.errors.map((e) => e.id).join(", ");
+    showNotice(
+      `${d.loaded} von ${d.requested} Kandidaten geladen` +
+        (failed ? ` (nicht geladen: ${failed})` : ""),
+      failed ? "is-warning" : "is-success"
+    );
+  }
+
   /* ---------- Save ---------------------------------------- */
   const submitBtn = document.getElementById("submitButton");
 
+  // Progress messages per job stage (see /api/jobs/<id>/events)
+  const stageLabels = {
+    pdf_queued: "PDFs werden erstellt …",
+    transparent_pdf_ready: "Transparentes PDF fertig",
+    anonymous_pdf_ready: "Anonymes PDF fertig",
+    airtable_saved: "In Airtable gespeichert",
+    airtable_unchanged: "Airtable unverändert",
+    airtable_failed: "Airtable-Speicherung fehlgeschlagen",
+    recruitcrm_saved: "In RecruitCRM gespeichert",
+    recruitcrm_unchanged: "RecruitCRM unverändert",
+    pdf_deferred: "PDFs werden nachgereicht, sobald PDFMonkey erreichbar ist",
+    requeued: "Verarbeitung wird neu gestartet …",
+  };
+  // Reconnects without any new stage before the progress panel gives up
+  const MAX_STREAM_RECONNECTS = 5;
+
   submitBtn?.addEventListener("click", () => {
     const fd = new FormData(form);
+    const slug = idInput.value.trim();
 
-    fetch("/api/submit", {
+    fetch("/api/submit?async=1", {
       method: "POST",
       body: fd,
     })
       .then((r) => r.json())
       .then((res) => {
-        const cls = res.status === "success" ? "is-success" : "is-danger";
-        showNotice(res.message || "Unbekannte Antwort", cls);
+        if (res.status !== "queued") {
+          showNotice(res.message || "Unbekannte Antwort", "is-danger");
+          return;
+        }
+        followSubmission(res.events_url, slug);
       })
       .catch((err) => {
         console.error(err);
@@ -56,6 +109,40 @@ document.addEventListener("DOMContentLoaded", () => {
       });
   });
 
+  // Show each stage of a queued submit as it happens, with the PDF links
+  function followSubmission(eventsUrl, slug) {
+    const panel = showProgress();
+    const events = new EventSource(eventsUrl);
+    let reconnects = 0;
+
+    Object.entries(stageLabels).forEach(([stage, label]) => {
+      events.addEventListener(stage, (e) => {
+        reconnects = 0;
+        const { url } = JSON.parse(e.data);
+        panel.add(label, url);
+      });
+    });
+
+    // EventSource reconnects on its own; stop once the stream keeps dying
+    events.onerror = () => {
+      reconnects += 1;
+      if (events.readyState === EventSource.CLOSED || reconnects > MAX_STREAM_RECONNECTS) {
+        events.close();
+        panel.finish("Verbindung zum Server verloren – Speicherstatus unbekannt", "is-danger");
+      }
+    };
+
+    events.addEventListener("succeeded", () => {
+      events.close();
+      prefetched.delete(slug);
+      panel.finish("Kandidatendaten erfolgreich gespeichert", "is-success");
+    });
+    events.addEventListener("failed", (e) => {
+      events.close();
+      panel.finish(JSON.parse(e.data).error || "Speichern fehlgeschlagen", "is-danger");
+    });
+  }
+
   /* ---------- Fill form -------------------------------- */
   function fillForm(data) {
     // Helper to set value by name
@@ -218,6 +305,39 @@ document.addEventListener("DOMContentLoaded", () => {
     }, 100);
   }
 
+  /* ---------- Submit progress (Bulma) ------------------------ */
+  function showProgress() {
+    const n = Object.assign(document.createElement("div"), {
+      className: "notification is-info",
+      style: "position:fixed;top:1rem;right:1rem;z-index:1000;max-width:24rem",
+    });
+    const list = document.createElement("ul");
+    n.append("Speichern …", list);
+    document.body.appendChild(n);
+
+    return {
+      add(label, url) {
+        const item = document.createElement("li");
+        item.textContent = label;
+        if (url) {
+          const link = Object.assign(document.createElement("a"), {
+            href: url,
+            target: "_blank",
+            textContent: " öffnen",
+          });
+          item.appendChild(link);
+        }
+        list.appendChild(item);
+      },
+      finish(msg, cls) {
+        n.className = `notification ${cls}`;
+        n.firstChild.textContent = msg;
+        // Leave time to open the PDF links
+        setTimeout(() => n.remove(), 15000);
+      },
+    };
+  }
+
   /* ---------- Mini-Notification (Bulma) ---------------------- */
   function showNotice(msg, cls = "is-info") {
     const n = Object.assign(document.createElement("div"), {
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+
+# app.py reads its settings at import time: point its data directory at a
+# scratch folder and keep background syncs from reaching real upstreams
+os.environ.setdefault("EMPLOIO_DATA_DIR", tempfile.mkdtemp(prefix="emploio-tests-"))
+os.environ.setdefault("CANDIDATE_SYNC_INTERVAL", "0")
+os.environ.setdefault("SUGGEST_REFRESH_INTERVAL", "0")
+# The stub upstreams have no quota
+os.environ.setdefault("RECRUITCRM_RATE_LIMIT", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+
+import pytest
+from flask import request
+from werkzeug.serving import make_server
+
+from tools.stub_servers import create_airtable_app, create_pdfmonkey_app, create_recruitcrm_app
+
+
+def _serve(stub):
+    """Run a stub upstream on a free port; returns its base URL."""
+    server = make_server("127.0.0.1", 0, stub, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def _start_upstreams():
+    """
+    Stub PDFMonkey, RecruitCRM and Airtable APIs (tools/stub_servers.py).
+
+    Started while conftest is imported: utils.http_client reads the base
+    URLs when it is first imported, which may happen during collection.
+    Every request the stubs receive is logged as (upstream, method, path).
+    """
+    calls = []
+    stubs = {
+        "pdfmonkey": (create_pdfmonkey_app(render_seconds=1.0), "/api/v1"),
+        "recruitcrm": (create_recruitcrm_app(50), "/v1"),
+        "airtable": (create_airtable_app(), "/v0"),
+    }
+    for name, (stub, prefix) in stubs.items():
+        stub.before_request(
+            lambda name=name: calls.append((name, request.method, request.path)))
+        os.environ[f"{name.upper()}_BASE_URL"] = _serve(stub) + prefix
+    return {"calls": calls, **{name: stub for name, (stub, _) in stubs.items()}}
+
+
+_upstreams = _start_upstreams()
+
+
+@pytest.fixture(scope="session")
+def upstreams():
+    """The stub upstreams; ``upstreams["calls"]`` logs their requests."""
+    return _upstreams
+
+
+@pytest.fixture(scope="session")
+def app_module(upstreams):
+    """app.py, imported once its upstreams point at the stubs."""
+    import app
+    return app
@@ -0,0 +1,58 @@
+import asyncio
+
+
+def fields(index, email=None):
+    return {"email": email or f"batch{index}@example.com", "vorname": f"B{index}"}
+
+
+def upsert_calls(upstreams, table_id):
+    return sum(1 for upstream, method, path in upstreams["calls"]
+               if upstream == "airtable" and method == "PATCH" and path.endswith(table_id))
+
+
+def test_invalid_record_costs_only_itself(app_module, upstreams):
+    table = "tblBatchInvalid"
+    app_module.airtable_index.refresh(table)
+    batch = [fields(index) for index in range(10)]
+    batch[6] = fields(6, email="not-an-email")
+
+    records = app_module.upsert_airtable_records(table, batch)
+
+    assert [record is None for record in records] == [index == 6 for index in range(10)]
+    assert [record["fields"]["email"] for record in records if record] == \
+        [item["email"] for index, item in enumerate(batch) if index != 6]
+    # [0-9] fails → [0-4] saved, [5-9] fails → [5, 6] fails, [7-9] saved
+    # → [5] saved, [6] fails
+    assert upsert_calls(upstreams, table) == 7
+
+
+def test_stale_record_id_is_forgotten_and_retried(app_module, upstreams):
+    table = "tblBatchStale"
+    index = app_module.airtable_index
+    index.refresh(table)
+    saved = app_module.upsert_airtable_records(table, [fields(0), fields(1)])
+    index.put(table, "batch1@example.com", "recDeletedUpstream")
+    app_module.sync_snapshots.put(f"airtable:{table}", "batch0@example.com", fields(0))
+
+    records = app_module.upsert_airtable_records(table, [fields(0), fields(1), fields(2)])
+
+    assert all(records)
+    assert records[0]["id"] == saved[0]["id"]
+    assert index.get(table, "batch0@example.com") == saved[0]["id"]
+    assert index.get(table, "batch1@example.com") == records[1]["id"]
+    # Only the record with the stale id is sent in full next time
+    assert app_module.sync_snapshots.get(f"airtable:{table}", "batch0@example.com")
+    assert upsert_calls(upstreams, table) == 3
+
+
+def test_async_invalid_record_costs_only_itself(app_module, upstreams):
+    import asgi
+
+    table = "tblBatchInvalidAsync"
+    app_module.airtable_index.refresh(table)
+    batch = [fields(index) for index in range(3)]
+    batch[0] = fields(0, email="not-an-email")
+
+    records = asyncio.run(asgi.upsert_airtable_records_async(table, batch))
+
+    assert [record is None for record in records] == [True, False, False]
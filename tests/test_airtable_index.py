@@ -0,0 +1,59 @@
+from utils import airtable_index
+from utils.airtable_index import AirtableRecordIndex
+from utils.http_client import get_session
+
+BASE = "appIndexTest"
+
+
+def create_record(table_id, email):
+    response = get_session("airtable").post(f"{BASE}/{table_id}", json={"fields": {"email": email}})
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def delete_record(table_id, record_id):
+    get_session("airtable").delete(f"{BASE}/{table_id}/{record_id}").raise_for_status()
+
+
+def test_refresh_evicts_deleted_and_corrects_recreated_records(upstreams):
+    table = "tblIndexRefresh"
+    index = AirtableRecordIndex(BASE)
+    kept = create_record(table, "kept@example.com")
+    deleted = create_record(table, "deleted@example.com")
+    old_id = create_record(table, "Recreated@example.com")
+    index.refresh(table)
+
+    delete_record(table, deleted)
+    delete_record(table, old_id)
+    new_id = create_record(table, "recreated@example.com")
+    index.refresh(table)
+
+    assert index.get(table, "kept@example.com") == kept
+    assert index.get(table, "deleted@example.com") is None
+    assert index.get(table, "recreated@example.com") == new_id
+
+
+def test_writes_during_refresh_override_the_listing(upstreams, monkeypatch):
+    table = "tblIndexRace"
+    index = AirtableRecordIndex(BASE)
+    create_record(table, "written@example.com")
+    create_record(table, "gone@example.com")
+    index.refresh(table)
+
+    session = get_session("airtable")
+
+    class WritesWhileListing:
+        def get(self, *args, **kwargs):
+            response = session.get(*args, **kwargs)
+            # Lands after the page was read, before the refresh finishes
+            index.put(table, "written@example.com", "recNew")
+            index.put(table, "new@example.com", "recCreated")
+            index.invalidate(table, "gone@example.com")
+            return response
+
+    monkeypatch.setattr(airtable_index, "get_session", lambda name: WritesWhileListing())
+    index.refresh(table)
+
+    assert index.get(table, "written@example.com") == "recNew"
+    assert index.get(table, "new@example.com") == "recCreated"
+    assert index.get(table, "gone@example.com") is None
@@ -0,0 +1,79 @@
+import ast
+import asyncio
+import os
+
+import httpx
+import pytest
+from werkzeug.datastructures import MultiDict
+
+
+@pytest.fixture(scope="module")
+def asgi_module(app_module):
+    import asgi
+    return asgi
+
+
+def test_asgi_uses_only_public_app_helpers():
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "asgi.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    imported = [alias.name for node in ast.walk(tree)
+                if isinstance(node, ast.ImportFrom) and node.module == "app"
+                for alias in node.names]
+    assert imported
+    assert [name for name in imported if name.startswith("_")] == []
+
+
+def test_async_candidate_load_and_submit(asgi_module, upstreams):
+    async def scenario():
+        client = asgi_module.async_app.test_client()
+        loaded = await client.get("/api/kandidat/7")
+        submitted = await client.post("/api/submit", form={
+            "kandidat_slug": "stub-7", "email": "candidate7@example.com",
+            "vorname": "K7", "branche": "Sales", "sonstiges": "async",
+        })
+        return loaded.status_code, await loaded.get_json(), \
+            submitted.status_code, await submitted.get_json()
+
+    status, candidate, submit_status, submitted = asyncio.run(scenario())
+
+    assert status == 200
+    assert candidate["email"] == "candidate7@example.com"
+    assert submit_status == 200, submitted
+    assert submitted["status"] == "success"
+
+
+def test_failed_submission_leaves_no_tasks_behind(asgi_module, monkeypatch):
+    cancelled = []
+
+    async def render(form_data, template_id):
+        if template_id == asgi_module.pick_pdf_templates("Sales")[0]:
+            request = httpx.Request("POST", "http://pdfmonkey.test/documents")
+            raise httpx.HTTPStatusError("rejected", request=request, response=httpx.Response(
+                422, request=request, text="Template not found"))
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append("pdf")
+            raise
+
+    async def upsert(form_data):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append("airtable")
+            raise
+
+    monkeypatch.setattr(asgi_module, "generate_pdf_and_wait_async", render)
+    monkeypatch.setattr(asgi_module, "upsert_candidate_record_async", upsert)
+
+    async def scenario():
+        with pytest.raises(asgi_module.SubmissionError, match="Template not found"):
+            await asgi_module.process_candidate_submission_async(
+                MultiDict({"kandidat_slug": "stub-3", "branche": "Sales"}))
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(scenario()) == []
+    assert sorted(cancelled) == ["airtable", "pdf"]
+
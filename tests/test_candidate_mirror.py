@@ -0,0 +1,41 @@
+from werkzeug.datastructures import MultiDict
+
+
+def custom_values(candidate):
+    return {field.get("value") for field in candidate["custom_fields"]}
+
+
+def test_reload_after_save_shows_saved_data(app_module, upstreams):
+    before = app_module.load_candidate(3)
+    assert "Nur vormittags erreichbar" not in custom_values(before)
+
+    saved = app_module.save_recruitcrm_candidate(MultiDict({
+        "kandidat_slug": "stub-3", "email": "candidate3@example.com",
+        "branche": "Med", "sonstiges": "Nur vormittags erreichbar",
+    }))
+    assert saved
+
+    calls = len(upstreams["calls"])
+    after = app_module.load_candidate(3)
+    assert "Nur vormittags erreichbar" in custom_values(after)
+    # Served from the mirror, updated with the save response
+    assert upstreams["calls"][calls:] == []
+
+
+def test_save_without_candidate_in_response_refetches(app_module, upstreams):
+    app_module.load_candidate(4)
+    app_module.candidate_store.mark_stale("stub-4")
+
+    calls = len(upstreams["calls"])
+    app_module.load_candidate(4)
+    assert ("recruitcrm", "GET", "/v1/candidates/4") in upstreams["calls"][calls:]
+
+
+def test_older_copy_does_not_replace_newer(tmp_path):
+    from utils.candidate_store import CandidateStore
+
+    store = CandidateStore(str(tmp_path / "candidates.sqlite3"))
+    store.upsert([{"id": 1, "slug": "a", "updated_on": "2024-05-02T10:00:00", "v": "new"}])
+    store.upsert([{"id": 1, "slug": "a", "updated_on": "2024-05-01T10:00:00", "v": "old"}])
+
+    assert store.get(1)["data"]["v"] == "new"
@@ -0,0 +1,101 @@
+"""
+The field registry must reproduce the hand-written mappers it replaced.
+
+Expected values are the outputs of those mappers for the same inputs.
+"""
+from werkzeug.datastructures import MultiDict
+
+from utils.med_mapper import generate_airtable_payload_med, generate_med_transparent_pdf
+from utils.recruit_mapper import recruit_to_form
+from utils.sales_mapper import generate_airtable_payload_sales, generate_transparent_sales_pdf
+
+SALES_PDF_KEYS = (
+    "vorname", "nachname", "email", "telefon", "wohnort", "aktuelle_organisation",
+    "aktuelle_position", "branche", "kuendigungsfrist", "verfuegbar_ab",
+    "homeoffice_aktuell", "homeoffice_wunsch", "arbeitsort", "aktuelles_gehalt",
+    "wechselmotiv", "foto_url", "wunschgehalt", "umzugsbereitschaft",
+    "wechselkommitment", "berufserfahrung", "erfolgsmethodik", "umgang_rueckschlaege",
+    "weiterentwicklung", "finanzielle_motivation", "sonstiges", "berufliche_ziele",
+    "private_ziele", "vertriebs_erfahrung",
+)
+AIRTABLE_SALES_KEYS = (
+    "foto_url", "vorname", "nachname", "email", "telefon", "aktuelle_position",
+    "aktuelle_organisation", "aktuelles_gehalt", "wunschgehalt", "verfuegbar_ab",
+    "kuendigungsfrist", "umzugsbereitschaft", "wechselkommitment", "fachbereich_aktuell",
+    "arbeitsort", "wuensche_an_den_neuen_job", "berufliche_erfahrung", "sonstiges",
+)
+AIRTABLE_MED_KEYS = (
+    "foto_url", "vorname", "nachname", "email", "telefon", "aktuelle_position",
+    "aktuelle_organisation", "aktuelles_gehalt", "wunschgehalt", "verfuegbar_ab",
+    "kuendigungsfrist", "wechselkommitment", "fachbereich_aktuell", "fachbereich_wunsch",
+    "geschlecht", "wohnort", "arbeitsort", "berufliche_ziele", "private_ziele",
+    "sonstiges", "berufliche_erfahrung",
+)
+
+SPARSE_FORM = MultiDict({"email": "a@example.com"})
+FILLED_FORM = MultiDict([
+    ("email", "a@example.com"), ("vorname", "Ada"), ("wohnort", "Köln"),
+    ("geschlecht", "1"), ("umzugsbereit[]", "Ja"), ("umzugsbereit[]", "Nein"),
+    ("locality", "Bonn"), ("current_salary", "50000"), ("avatar", "http://foto"),
+])
+
+
+def test_sales_views_match_previous_mappers():
+    assert generate_transparent_sales_pdf(SPARSE_FORM) == {"kandidat": {
+        **dict.fromkeys(SALES_PDF_KEYS), "email": "a@example.com",
+        "wechselkommitment": "Nein", "berufserfahrung": "0",
+        "vertriebs_erfahrung": "Keine Angaben",
+    }}
+    assert generate_airtable_payload_sales(SPARSE_FORM) == {
+        **dict.fromkeys(AIRTABLE_SALES_KEYS), "email": "a@example.com"}
+
+    pdf = generate_transparent_sales_pdf(FILLED_FORM)["kandidat"]
+    airtable = generate_airtable_payload_sales(FILLED_FORM)
+    assert (pdf["arbeitsort"], pdf["umzugsbereitschaft"], pdf["aktuelles_gehalt"]) == \
+        ("Köln", "Ja", None)
+    assert (airtable["arbeitsort"], airtable["umzugsbereitschaft"],
+            airtable["aktuelles_gehalt"]) == ("Köln", "Ja", "50000")
+
+
+def test_med_views_match_previous_mappers():
+    assert generate_airtable_payload_med(SPARSE_FORM) == {
+        **dict.fromkeys(AIRTABLE_MED_KEYS), "email": "a@example.com",
+        "geschlecht": "Männlich"}
+    assert generate_med_transparent_pdf(SPARSE_FORM) == {"kandidat": {
+        "foto_url": "", "vorname": "", "nachname": "", "email": "a@example.com",
+        "telefon": "", "aktuelle_position": "", "aktuelle_organisation": "",
+        "geschlecht": "Männlich", "aktuelles_gehalt": "Nicht angegeben",
+        "wunschgehalt": "Nicht angegeben", "verfuegbar_ab": "",
+        "kuendigungsfrist": "Nicht angegeben", "umzugsbereitschaft": "Nein",
+        "wechselkommitment": "0", "fachbereich_aktuell": None,
+        "fachbereich_wunsch": "Nicht angegeben", "wohnort": "",
+        "berufserfahrung_in_jahren": "0", "arbeitsort": "",
+        "wunschklinik": "Nicht angegeben", "wunscharbeitsort": "Nicht angegeben",
+        "wuensche_an_den_neuen_job": "Nicht angegeben",
+        "berufliche_erfahrung": "Nicht angegeben", "sonstiges": "Keine Bemerkungen",
+    }}
+
+    pdf = generate_med_transparent_pdf(FILLED_FORM)["kandidat"]
+    assert (pdf["geschlecht"], pdf["arbeitsort"], pdf["wunscharbeitsort"]) == \
+        ("Weiblich", "Köln", "Bonn")
+    assert generate_airtable_payload_med(FILLED_FORM)["geschlecht"] == "Weiblich"
+
+
+def test_load_view_matches_previous_mapper():
+    form = recruit_to_form({
+        "email": "a@example.com", "first_name": "Ada", "city": "Köln", "gender_id": 1,
+        "owner": 7, "resume": {"file_link": "http://cv"}, "work_ex_year": 4,
+        "custom_fields": [
+            {"field_name": "Branche", "value": "Sales"},
+            {"field_name": "Wohnort (Stadt)", "value": "Bonn"},
+            {"field_name": "Umzugsbereit", "value": "Ja"},
+        ],
+    })
+
+    # "Wohnort (Stadt)" overrides the standard city field, as before
+    assert {key: value for key, value in form.items() if value is not None} == {
+        "vorname": "Ada", "email": "a@example.com", "geschlecht": 1, "wohnort": "Bonn",
+        "consultant": "7", "cv_link": "http://cv", "berufserfahrung_in_jahren": 4,
+        "branche": "Sales", "umzugsbereit": "Ja",
+    }
+    assert recruit_to_form({"email": "a@example.com"})["consultant"] == "None"
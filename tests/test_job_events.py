@@ -0,0 +1,72 @@
+import json
+import threading
+
+from utils.job_events import JobEventBroker, format_sse, job_sse_events
+from utils.job_queue import JobQueue
+
+
+def parse_sse(text):
+    """Split an event stream into (id, event, data) tuples, skipping comments."""
+    events = []
+    for block in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines()
+                      if line and not line.startswith(":") and ": " in line)
+        if "event" in fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_format_sse_frames_one_event():
+    assert format_sse("pdf_queued", {"a": 1}, 3) == \
+        'id: 3\nevent: pdf_queued\ndata: {"a": 1}\n\n'
+
+
+def test_job_events_resume_after_last_id_and_finish():
+    job = {"status": "succeeded", "result": {"auswertung": "http://pdf"}, "error": None,
+           "stages": [{"stage": "pdf_queued"}, {"stage": "airtable_saved"}]}
+
+    messages, finished = job_sse_events(job, sent=1)
+
+    assert finished
+    assert [(event_id, event) for event_id, event, _ in parse_sse("".join(messages))] == [
+        ("2", "airtable_saved"), ("3", "succeeded")]
+
+
+def test_broker_wakes_subscribers_on_job_changes(tmp_path):
+    broker = JobEventBroker()
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"),
+                     handlers={"work": lambda payload, report: report("halfway")},
+                     on_change=broker.publish)
+    finished = threading.Event()
+
+    job_id = queue.enqueue("work", {})
+    unsubscribe = broker.subscribe(
+        job_id, lambda: queue.get(job_id)["status"] == "succeeded" and finished.set())
+
+    assert finished.wait(5)
+    unsubscribe()
+    assert broker.subscriber_count() == 0
+
+
+def test_submission_progress_stream(app_module, upstreams):
+    client = app_module.app.test_client()
+    queued = client.post("/api/submit?async=1", data={
+        "kandidat_slug": "stub-9", "email": "candidate9@example.com",
+        "vorname": "K9", "branche": "Sales", "sonstiges": "stream",
+    }).get_json()
+
+    response = client.get(queued["events_url"])
+    events = parse_sse(response.get_data(as_text=True))
+
+    assert response.content_type.startswith("text/event-stream")
+    assert [event_id for event_id, _, _ in events] == \
+        [str(number) for number in range(1, len(events) + 1)]
+    names = [event for _, event, _ in events]
+    assert names[-1] == "succeeded"
+    assert {"pdf_queued", "transparent_pdf_ready", "recruitcrm_saved"} <= set(names)
+    assert dict((event, data) for _, event, data in events)["transparent_pdf_ready"]["url"]
+
+    replay = client.get(queued["events_url"], headers={"Last-Event-ID": str(len(events) - 1)})
+    assert [event for _, event, _ in parse_sse(replay.get_data(as_text=True))] == ["succeeded"]
+
+    assert client.get("/api/jobs/unknown/events").status_code == 404
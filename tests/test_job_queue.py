@@ -0,0 +1,100 @@
+import json
+import sqlite3
+import threading
+import time
+
+from utils import job_queue
+from utils.job_queue import JobQueue
+
+
+def wait_for_status(queue, job_id, statuses, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job and job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {queue.get(job_id)['status']}")
+
+
+def insert_running_job(db_path, job_id, reclaims=0):
+    """A job left running by a process that died (its lease ran out)."""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at, "
+            "lease_until, reclaims) VALUES (?, 'echo', 'running', ?, 0, 0, 0, ?)",
+            (job_id, json.dumps({"value": 1}), reclaims))
+    conn.close()
+
+
+def test_expired_running_job_is_resumed(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    JobQueue(db_path, handlers={"echo": lambda payload, report: payload})
+    insert_running_job(db_path, "lost")
+
+    queue = JobQueue(db_path, handlers={"echo": lambda payload, report: payload})
+    queue.start()
+
+    job = wait_for_status(queue, "lost", ("succeeded", "failed"))
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"value": 1}
+    assert [stage["stage"] for stage in job["stages"]] == ["requeued"]
+
+
+def test_job_lost_too_often_fails(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    JobQueue(db_path, handlers={"echo": lambda payload, report: payload})
+    insert_running_job(db_path, "cursed", reclaims=job_queue.MAX_RECLAIMS)
+
+    changed = []
+    queue = JobQueue(db_path, handlers={"echo": lambda payload, report: payload},
+                     on_change=changed.append)
+    queue.start()
+
+    job = queue.get("cursed")
+    assert job["status"] == "failed"
+    assert "lost" in job["error"]
+    assert changed == ["cursed"]
+
+
+def test_lease_is_renewed_while_job_runs(tmp_path):
+    calls = []
+    release = threading.Event()
+
+    def slow(payload, report):
+        calls.append(payload)
+        release.wait(5)
+        return "done"
+
+    db_path = str(tmp_path / "jobs.sqlite3")
+    queue = JobQueue(db_path, handlers={"slow": slow}, lease_seconds=0.3)
+    job_id = queue.enqueue("slow", {})
+    wait_for_status(queue, job_id, ("running",))
+
+    # Several lease periods: another process sharing the file must not
+    # take the job over while this one is still working on it
+    time.sleep(1)
+    other = JobQueue(db_path, handlers={"slow": slow}, lease_seconds=0.3)
+    other.start()
+    time.sleep(0.3)
+    release.set()
+
+    assert wait_for_status(other, job_id, ("succeeded", "failed"))["status"] == "succeeded"
+    assert len(calls) == 1
+
+
+def test_queue_touches_persisted_jobs_only_once_started(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    JobQueue(db_path, handlers={"echo": lambda payload, report: payload})
+    insert_running_job(db_path, "lost")
+
+    # What a CLI command or tool importing the app constructs
+    queue = JobQueue(db_path, handlers={"echo": lambda payload, report: payload},
+                     lease_seconds=0.1)
+    time.sleep(0.3)
+    assert queue.get("lost")["status"] == "running"
+    assert queue._renewer is None
+
+    queue.start()
+    assert wait_for_status(queue, "lost", ("succeeded",))["result"] == {"value": 1}
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+
+def test_form_page_references_each_asset_once(app_module):
+    response = app_module.app.test_client().get("/")
+    page = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert page.count(app_module.asset_url("css/style.css")) == 1
+    assert page.count(app_module.asset_url("js/recruitcrm-api.js")) == 1
+
+
+def test_import_does_not_start_background_syncs(upstreams, tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import threading, app\n"
+        "names = lambda: sorted(t.name for t in threading.enumerate())\n"
+        "print(names())\n"
+        "app.start_background_services()\n"
+        "print(names())\n"
+    )
+    env = {**os.environ, "EMPLOIO_DATA_DIR": str(tmp_path),
+           "CANDIDATE_SYNC_INTERVAL": "3600", "SUGGEST_REFRESH_INTERVAL": "3600"}
+    output = subprocess.run([sys.executable, "-c", script], cwd=root, env=env,
+                            capture_output=True, text=True, timeout=60, check=True)
+    on_import, after_start = output.stdout.splitlines()[-2:]
+
+    assert "candidate-sync" not in on_import
+    assert "suggestion-index" not in on_import
+    assert "job-leases" not in on_import
+    assert "candidate-sync" in after_start
+    assert "suggestion-index" in after_start
+    assert "job-leases" in after_start
@@ -0,0 +1,114 @@
+import time
+from concurrent.futures import Future
+
+import httpx
+import pytest
+import requests
+from werkzeug.datastructures import MultiDict
+
+from utils import async_http, http_client
+from utils.circuit_breaker import CircuitOpenError
+
+
+def http_error(status, text='{"errors": ["invalid"]}'):
+    response = requests.Response()
+    response.status_code = status
+    response._content = text.encode()
+    return requests.exceptions.HTTPError(response=response)
+
+
+def failed(error):
+    future = Future()
+    future.set_exception(error)
+    return future
+
+
+def done(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+@pytest.mark.parametrize("error, unavailable", [
+    (requests.exceptions.ConnectionError("refused"), True),
+    (requests.exceptions.ReadTimeout("slow"), True),
+    (CircuitOpenError("pdfmonkey", 10), True),
+    (http_error(503), True),
+    (http_error(429), True),
+    (http_error(401), False),
+    (http_error(422), False),
+])
+def test_sync_error_classification(error, unavailable):
+    assert http_client.is_unavailable_error(error) is unavailable
+
+
+@pytest.mark.parametrize("status, unavailable", [(502, True), (429, True), (404, False)])
+def test_async_error_classification(status, unavailable):
+    request = httpx.Request("POST", "http://pdfmonkey.test/documents")
+    error = httpx.HTTPStatusError(
+        "failed", request=request, response=httpx.Response(status, request=request))
+    assert async_http.is_unavailable_error(error) is unavailable
+    assert async_http.is_unavailable_error(httpx.ConnectTimeout("slow", request=request))
+
+
+def test_pdf_outage_is_deferred(app_module):
+    urls, deferred = app_module.collect_pdf_urls({
+        "auswertung": done("http://pdf/1"),
+        "anonym_auswertung": failed(requests.exceptions.ConnectionError("refused")),
+    })
+    assert urls == {"auswertung": "http://pdf/1", "anonym_auswertung": None}
+    assert deferred == ["anonym_auswertung"]
+
+
+def test_rejected_pdf_is_reported_not_deferred(app_module):
+    with pytest.raises(app_module.SubmissionError) as raised:
+        app_module.collect_pdf_urls({
+            "auswertung": failed(http_error(422, "Template not found")),
+            "anonym_auswertung": done("http://pdf/2"),
+        })
+    assert "422" in str(raised.value)
+    assert "Template not found" in str(raised.value)
+
+
+def test_backfill_fails_on_rejected_pdf(app_module, monkeypatch):
+    def reject(form_data, template_id):
+        raise http_error(401, "Unauthorized")
+
+    monkeypatch.setattr(app_module, "generate_pdf_and_wait", reject)
+    payload = {"form": [["kandidat_slug", "stub-1"], ["branche", "Sales"]],
+               "fields": ["auswertung"], "deferred_at": time.time()}
+
+    with pytest.raises(app_module.SubmissionError, match="401"):
+        app_module.run_pdf_backfill_job(payload, lambda stage, **details: None)
+
+
+def test_backfill_retries_while_pdfmonkey_is_down(app_module, monkeypatch):
+    def down(form_data, template_id):
+        raise requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(app_module, "generate_pdf_and_wait", down)
+    payload = {"form": [["kandidat_slug", "stub-1"], ["branche", "Sales"]],
+               "fields": ["auswertung"], "deferred_at": time.time()}
+
+    with pytest.raises(app_module.RetryLater):
+        app_module.run_pdf_backfill_job(payload, lambda stage, **details: None)
+
+
+def test_rejected_pdf_waits_for_running_airtable_upsert(app_module, monkeypatch):
+    upserted = []
+
+    def reject(form_data, template_id):
+        raise http_error(422, "Template not found")
+
+    def upsert(form_data):
+        time.sleep(0.2)
+        upserted.append(form_data.get("kandidat_slug"))
+        return {"id": "rec1"}
+
+    monkeypatch.setattr(app_module, "generate_pdf_and_wait", reject)
+    monkeypatch.setattr(app_module, "upsert_candidate_record", upsert)
+
+    with pytest.raises(app_module.SubmissionError, match="Template not found"):
+        app_module.process_candidate_submission(
+            MultiDict({"kandidat_slug": "stub-4", "branche": "Sales"}))
+    assert upserted == ["stub-4"]
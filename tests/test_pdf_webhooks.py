@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+from utils import pdf_webhooks
+
+
+def test_each_callback_wakes_the_waiter_once():
+    pdf_webhooks.register("doc-1")
+    try:
+        assert pdf_webhooks.notify({"id": "doc-1", "status": "generating"})
+        assert pdf_webhooks.wait("doc-1", 1)["status"] == "generating"
+
+        # The consumed callback must not wake the next wait again
+        started = time.monotonic()
+        assert pdf_webhooks.wait("doc-1", 0.2) is None
+        assert time.monotonic() - started >= 0.2
+
+        threading.Timer(0.05, pdf_webhooks.notify,
+                        args=({"id": "doc-1", "status": "success"},)).start()
+        assert pdf_webhooks.wait("doc-1", 1)["status"] == "success"
+    finally:
+        pdf_webhooks.unregister("doc-1")
+
+
+def test_early_callback_is_delivered_once():
+    assert not pdf_webhooks.notify({"id": "doc-2", "status": "success"})
+    pdf_webhooks.register("doc-2")
+    try:
+        assert pdf_webhooks.wait("doc-2", 0)["status"] == "success"
+        assert pdf_webhooks.wait("doc-2", 0.05) is None
+    finally:
+        pdf_webhooks.unregister("doc-2")
+
+
+def test_async_waiter_consumes_callback():
+    async def scenario():
+        pdf_webhooks.register("doc-3")
+        try:
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.05, pdf_webhooks.notify,
+                            {"id": "doc-3", "status": "generating"})
+            first = await pdf_webhooks.wait_async("doc-3", 1)
+            second = await pdf_webhooks.wait_async("doc-3", 0.1)
+            return first, second
+        finally:
+            pdf_webhooks.unregister("doc-3")
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == "generating"
+    assert second is None
+
+
+def test_progress_callback_does_not_spin_the_poller(app_module, upstreams):
+    document_id = app_module.get_session("pdfmonkey").post(
+        "documents", json={"document": {"document_template_id": "t", "status": "pending"}}
+    ).json()["document"]["id"]
+
+    def on_generating():
+        pdf_webhooks.notify({"id": document_id, "status": "generating"})
+
+    threading.Timer(0.1, on_generating).start()
+    before = len(upstreams["calls"])
+    url = app_module.poll_pdf_generation_status(document_id, max_wait_seconds=10,
+                                                check_interval=0.5)
+
+    assert url
+    status_checks = [call for call in upstreams["calls"][before:]
+                     if call[0] == "pdfmonkey" and call[1] == "GET"]
+    # ~1s render at one check per 0.5s, plus one for the callback
+    assert len(status_checks) <= 5
+
+
+def test_webhook_rejects_bad_tokens(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "PDFMONKEY_WEBHOOK_SECRET", "s3cret")
+    client = app_module.app.test_client()
+    body = {"document": {"id": "doc-5", "status": "success"}}
+
+    assert client.post("/webhooks/pdfmonkey?token=%C3%A4", json=body).status_code == 403
+    assert client.post("/webhooks/pdfmonkey?token=wrong", json=body).status_code == 403
+    assert client.post("/webhooks/pdfmonkey", json=body,
+                       headers={"X-Webhook-Token": "s3cret"}).status_code == 200
+    pdf_webhooks.unregister("doc-5")
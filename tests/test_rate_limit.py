@@ -0,0 +1,28 @@
+from utils.rate_limit import TokenBucket
+
+
+def test_bucket_without_rate_learns_one_from_429():
+    bucket = TokenBucket(0, burst=1)
+    for _ in range(20):
+        assert bucket.reserve() == 0
+
+    bucket.throttle(0)
+
+    # 20 requests within the last second: the learned limit, halved
+    assert bucket.max_rate == 20
+    assert bucket.rate == 10
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits == sorted(waits)
+    assert waits[-1] > 0.3
+
+
+def test_pause_does_not_release_a_burst_afterwards():
+    bucket = TokenBucket(10, burst=1)
+    bucket.throttle(0.2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    # Queued callers are spread out after the pause at the halved rate
+    assert waits[0] >= 0.15
+    assert all(later - earlier > 0.15 for earlier, later in zip(waits, waits[1:]))
+
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from utils.skills_sync import SkillsSyncer
+
+
+def test_other_candidates_do_not_cut_the_window_short():
+    writes = []
+    syncer = SkillsSyncer(
+        lambda email, skills, branch: writes.append((email, skills)) or True, delay=0.3)
+
+    # a@ is edited and reloaded while other candidates keep getting scheduled
+    for index in range(6):
+        syncer.schedule("a@example.com", f"Vertrieb {index}", "Sales")
+        syncer.schedule(f"other{index}@example.com", "Pflege", "Med")
+        time.sleep(0.04)
+    time.sleep(0.6)
+
+    assert [skills for email, skills in writes if email == "a@example.com"] == ["Vertrieb 5"]
+    assert len(writes) == 7
+
+
+def test_write_is_due_after_delay_from_first_schedule():
+    written = threading.Event()
+    syncer = SkillsSyncer(lambda email, skills, branch: written.set() or True, delay=0.2)
+
+    started = time.monotonic()
+    syncer.schedule("b@example.com", "Vertrieb", "Sales")
+    assert written.wait(2)
+    assert time.monotonic() - started >= 0.2
+
+
+def test_unchanged_skills_are_not_written_again():
+    writes = []
+    syncer = SkillsSyncer(lambda email, skills, branch: writes.append(email) or True,
+                          delay=0.05)
+
+    assert syncer.schedule("c@example.com", "Vertrieb", "Sales")
+    time.sleep(0.3)
+    assert not syncer.schedule("C@example.com ", "Vertrieb", "Sales")
+    assert writes == ["c@example.com"]
@@ -0,0 +1,68 @@
+from utils.airtable_index import AirtableRecordIndex
+from utils.airtable_upserts import AirtableUpserts
+from utils.sync_snapshots import SnapshotStore, diff_fields
+
+TABLE = "tblSnapshotTest"
+
+
+def make_upserts(tmp_path, upstreams, max_age=3600):
+    index = AirtableRecordIndex("appStub")
+    index.refresh(TABLE)
+    snapshots = SnapshotStore(str(tmp_path / "snapshots.sqlite3"), max_age=max_age)
+    return index, AirtableUpserts(index, snapshots, lambda form: (TABLE, dict(form)))
+
+
+def test_diff_fields_keeps_changed_and_new_keys_only():
+    old = {"email": "a@example.com", "vorname": "Ada", "sonstiges": "x"}
+    new = {"email": "a@example.com", "vorname": "Ada", "sonstiges": "y", "wohnort": "Köln"}
+
+    assert diff_fields(old, new) == {"sonstiges": "y", "wohnort": "Köln"}
+    assert diff_fields(new, new) == {}
+
+
+def test_plan_sends_only_changed_fields_of_known_records(tmp_path, upstreams):
+    index, upserts = make_upserts(tmp_path, upstreams)
+    saved = {"email": "A@example.com", "vorname": "Ada", "sonstiges": "x"}
+    index.put(TABLE, saved["email"], "rec1")
+    upserts.record(TABLE, [("a@example.com", [0], saved, saved)],
+                   [{"id": "rec1"}], [None])
+
+    results, plans = upserts.plan([saved, {**saved, "sonstiges": "y"}])
+
+    assert results == [None, None]
+    assert plans == [(TABLE, [("a@example.com", [0, 1], {**saved, "sonstiges": "y"},
+                               {"sonstiges": "y", "email": "A@example.com"})])]
+
+    results, plans = upserts.plan([saved])
+    assert plans == []
+    assert results == [{"id": "rec1", "fields": {}, "unchanged": True}]
+
+
+def test_plan_sends_full_payload_without_index_entry_or_fresh_snapshot(tmp_path, upstreams):
+    index, upserts = make_upserts(tmp_path, upstreams)
+    saved = {"email": "b@example.com", "vorname": "Bea"}
+    upserts.record(TABLE, [("b@example.com", [0], saved, saved)], [{"id": "rec2"}], [None])
+
+    # Record deleted upstream: the snapshot alone must not shrink the payload
+    _, plans = upserts.plan([saved])
+    assert plans[0][1][0][3] == saved
+
+    index.put(TABLE, saved["email"], "rec2")
+    _, plans = upserts.plan([saved])
+    assert plans == []
+
+    upserts.forget_batch(TABLE, [saved])
+    _, plans = upserts.plan([saved])
+    assert plans[0][1][0][3] == saved
+
+
+
+def test_expired_snapshot_sends_full_payload(tmp_path, upstreams):
+    index, upserts = make_upserts(tmp_path, upstreams, max_age=-1)
+    saved = {"email": "c@example.com", "vorname": "Cem"}
+    index.put(TABLE, saved["email"], "rec3")
+    upserts.record(TABLE, [("c@example.com", [0], saved, saved)], [{"id": "rec3"}], [None])
+
+    _, plans = upserts.plan([saved])
+
+    assert plans[0][1][0][3] == saved
@@ -0,0 +1,308 @@
+"""
+End-to-end load benchmark for the candidate endpoints.
+
+Drives ``GET /api/kandidat/<id>`` and ``POST /api/submit`` at a fixed
+concurrency and reports throughput and p50/p95/p99 latency. Results are
+written as JSON so runs can be compared against a baseline.
+
+Fully offline run (stub upstreams + app started by the benchmark):
+
+    python -m tools.benchmark kandidat submit --launch flask \\
+        --requests 200 --concurrency 10 --latency 0.05 --render-seconds 1
+
+Against an app that is already running against the stubs
+(see ``tools/stub_servers.py``):
+
+    python -m tools.benchmark submit --base-url http://127.0.0.1:8000
+
+Compare with an earlier run:
+
+    python -m tools.benchmark kandidat --launch asgi \\
+        --compare data/benchmarks/baseline.json
+"""
+
+import argparse
+import datetime as dt
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from tools.stub_servers import DEFAULT_PORTS, start_stub_servers
+from utils.logging_config import configure_logging
+from utils.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEBHOOK_SECRET = "benchmark"
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: list[float], statuses: Counter, errors: Counter,
+              duration: float) -> dict:
+    """
+    Aggregate one scenario run.
+
+    Returns:
+        Dictionary with counts, throughput and latency statistics in ms
+    """
+    ordered = sorted(latencies)
+    total = len(ordered)
+    ok = sum(count for status, count in statuses.items()
+             if isinstance(status, int) and status < 400)
+    return {
+        "requests": total,
+        "ok": ok,
+        "failed": total - ok,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(total / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            **{f"p{pct}": round(percentile(ordered, pct) * 1000, 1)
+               for pct in PERCENTILES},
+            "mean": round(sum(ordered) / total * 1000, 1) if total else 0.0,
+            "max": round(ordered[-1] * 1000, 1) if total else 0.0,
+        },
+        "status_counts": {str(status): count for status, count in statuses.items()},
+        "errors": dict(errors),
+    }
+
+
+def kandidat_request(session, base_url, index, options):
+    candidate_id = index % options.candidates + 1
+    return session.get(f"{base_url}/api/kandidat/{candidate_id}", timeout=120)
+
+
+def submit_request(session, base_url, index, options):
+    candidate_id = index % options.candidates + 1
+    note = "Benchmark" if options.identical else f"Benchmark {options.run_id} #{index}"
+    form = {
+        "kandidat_slug": f"stub-{candidate_id}",
+        "email": f"candidate{candidate_id}@example.com",
+        "vorname": f"Kandidat{candidate_id}",
+        "nachname": "Stub",
+        "branche": "Med" if candidate_id % 2 else "Sales",
+        "aktuelle_position": "Vertriebsleiter",
+        "sonstiges": note,
+    }
+    return session.post(f"{base_url}/api/submit", data=form, timeout=300)
+
+
+SCENARIOS = {
+    "kandidat": kandidat_request,
+    "submit": submit_request,
+}
+
+
+def run_scenario(name, base_url, options) -> dict:
+    """
+    Fire ``options.requests`` requests at ``options.concurrency``.
+
+    Returns:
+        Summary from ``summarize``
+    """
+    send = SCENARIOS[name]
+    local = threading.local()
+    latencies, statuses, errors = [], Counter(), Counter()
+    lock = threading.Lock()
+
+    def one(index):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            status = send(session, base_url, index, options).status_code
+            error = None
+        except requests.exceptions.RequestException as e:
+            status, error = "error", type(e).__name__
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] += 1
+            if error:
+                errors[error] += 1
+
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        list(pool.map(one, range(-options.warmup, 0)))
+        latencies.clear()
+        statuses.clear()
+        errors.clear()
+
+        started = time.perf_counter()
+        list(pool.map(one, range(options.requests)))
+        duration = time.perf_counter() - started
+
+    return summarize(latencies, statuses, errors, duration)
+
+
+def wait_until_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/metrics", timeout=2).ok:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"App at {base_url} did not become ready")
+
+
+def launch_app(mode, port, data_dir):
+    """
+    Start the app in a subprocess, pointed at the stub upstreams.
+
+    Args:
+        mode: "flask" (threaded WSGI dev server) or "asgi" (hypercorn)
+        port: Port for the app
+        data_dir: Fresh data directory for caches and queues
+
+    Returns:
+        The running subprocess
+    """
+    env = {
+        **os.environ,
+        "RECRUITCRM_BASE_URL": f"http://127.0.0.1:{DEFAULT_PORTS['recruitcrm']}/v1",
+        "AIRTABLE_BASE_URL": f"http://127.0.0.1:{DEFAULT_PORTS['airtable']}/v0",
+        "PDFMONKEY_BASE_URL": f"http://127.0.0.1:{DEFAULT_PORTS['pdfmonkey']}/api/v1",
+        "PDFMONKEY_WEBHOOK_SECRET": WEBHOOK_SECRET,
+        "EMPLOIO_DATA_DIR": data_dir,
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    }
+    if mode == "asgi":
+        command = [sys.executable, "-m", "hypercorn", "asgi:application",
+                   "--bind", f"127.0.0.1:{port}"]
+    else:
+        command = [sys.executable, "-m", "flask", "--app", "app", "run",
+                   "--port", str(port), "--with-threads"]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, baseline=None):
+    """Log one line per scenario, with changes against a baseline if given."""
+    for name, stats in report["scenarios"].items():
+        latency = stats["latency_ms"]
+        line = (f"{name:<9} {stats['requests']} req | {stats['throughput_rps']:.1f} req/s | "
+                f"p50 {latency['p50']} ms | p95 {latency['p95']} ms | "
+                f"p99 {latency['p99']} ms | failed {stats['failed']}")
+
+        before = (baseline or {}).get("scenarios", {}).get(name)
+        if before:
+            def change(new, old):
+                return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            line += (f"\n{'':<9} vs baseline: throughput "
+                     f"{change(stats['throughput_rps'], before['throughput_rps'])}, "
+                     + ", ".join(
+                         f"p{pct} {change(latency[f'p{pct}'], before['latency_ms'][f'p{pct}'])}"
+                         for pct in PERCENTILES))
+        logger.info(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("scenarios", nargs="+", choices=list(SCENARIOS))
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000",
+                        help="App to benchmark (ignored with --launch)")
+    parser.add_argument("--launch", choices=["flask", "asgi"],
+                        help="Start stub upstreams and the app for the run")
+    parser.add_argument("--app-port", type=int, default=5099)
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10,
+                        help="Unmeasured requests before each scenario")
+    parser.add_argument("--candidates", type=int, default=200,
+                        help="Candidate ids 1..N are used round-robin")
+    parser.add_argument("--identical", action="store_true",
+                        help="Re-submit identical forms (exercises the caches)")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--render-seconds", type=float, default=1.0)
+    parser.add_argument("--output", help="Result file (default: data/benchmarks/…)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    options = parser.parse_args()
+    options.run_id = uuid.uuid4().hex[:8]
+
+    configure_logging()
+    base_url = options.base_url.rstrip("/")
+    app_process = None
+    stubs = {}
+
+    try:
+        if options.launch:
+            base_url = f"http://127.0.0.1:{options.app_port}"
+            stubs = start_stub_servers(
+                candidate_count=options.candidates,
+                render_seconds=options.render_seconds,
+                webhook_url=f"{base_url}/webhooks/pdfmonkey?token={WEBHOOK_SECRET}",
+                latency=options.latency,
+                jitter=options.jitter,
+                error_rate=options.error_rate,
+            )
+            app_process = launch_app(
+                options.launch, options.app_port, tempfile.mkdtemp(prefix="emploio-bench-"))
+        wait_until_ready(base_url)
+
+        report = {
+            "created_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "base_url": base_url,
+            "settings": {key: value for key, value in vars(options).items()
+                         if key not in ("output", "compare", "base_url")},
+            "scenarios": {},
+        }
+        for name in options.scenarios:
+            logger.info("Running %s (%d requests, concurrency %d)",
+                        name, options.requests, options.concurrency)
+            report["scenarios"][name] = run_scenario(name, base_url, options)
+    finally:
+        if app_process:
+            app_process.terminate()
+            app_process.wait(timeout=10)
+        for server in stubs.values():
+            server.shutdown()
+
+    output = options.output or data_path(os.path.join(
+        "benchmarks", f"benchmark-{dt.datetime.now():%Y%m%d-%H%M%S}.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    logger.info("Results written to %s", output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Local stand-ins for the paid upstream APIs.
+
+Run fakes of RecruitCRM, Airtable and PDFMonkey with configurable latency,
+error rate and PDF render time. PDFMonkey fires the "document generated"
+webhook back at the app:
+
+    python -m tools.stub_servers all --latency 0.05 --error-rate 0.01 \\
+        --webhook-url "http://127.0.0.1:5000/webhooks/pdfmonkey?token=secret"
+
+Then start the app against them:
+
+    RECRUITCRM_BASE_URL=http://127.0.0.1:5102/v1 \\
+    AIRTABLE_BASE_URL=http://127.0.0.1:5103/v0 \\
+    PDFMONKEY_BASE_URL=http://127.0.0.1:5101/api/v1 \\
+    PDFMONKEY_WEBHOOK_SECRET=secret flask run
+
+Single services can be started with ``pdfmonkey``, ``recruitcrm`` or
+``airtable`` instead of ``all``.
+"""
+
+import argparse
+import datetime as dt
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+
+from flask import Flask, jsonify, request
+import requests
+from werkzeug.serving import make_server
+
+from utils.field_registry import CRM_CUSTOM_FIELDS
+from utils.logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {"pdfmonkey": 5101, "recruitcrm": 5102, "airtable": 5103}
+
+
+def add_faults(app, latency=0.0, jitter=0.0, error_rate=0.0):
+    """
+    Delay every request and fail a share of them with 503.
+
+    Args:
+        app: Stub Flask application
+        latency: Fixed delay per request in seconds
+        jitter: Extra uniformly random delay of up to this many seconds
+        error_rate: Probability (0.0 - 1.0) of answering 503
+    """
+    @app.before_request
+    def inject_faults():
+        delay = latency + random.uniform(0, jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if error_rate and random.random() < error_rate:
+            return jsonify(error="Injected stub failure"), 503
+        return None
+
+    return app
+
+
+def _timestamp(seconds_ago=0.0):
+    moment = dt.datetime.now(dt.timezone.utc) - dt.timedelta(seconds=seconds_ago)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def create_pdfmonkey_app(render_seconds=2.0, webhook_url=None):
+    """
+    Build a fake PDFMonkey API.
+
+    Args:
+        render_seconds: Time until a created document switches to success
+        webhook_url: URL to POST the generated document to, if any
+
+    Returns:
+        Flask application
+    """
+    app = Flask("fake_pdfmonkey")
+    documents = {}
+    request_host = {}
+    lock = threading.Lock()
+
+    def render(document_id):
+        time.sleep(render_seconds)
+        with lock:
+            document = documents[document_id]
+            document["status"] = "success"
+            document["public_share_link"] = (
+                f"{request_host[document_id]}/share/{document_id}.pdf")
+            document["download_url"] = document["public_share_link"]
+            snapshot = dict(document)
+
+        if webhook_url:
+            try:
+                requests.post(webhook_url, json={"document": snapshot}, timeout=5)
+            except requests.exceptions.RequestException as e:
+                logger.error("Webhook delivery failed: %s", e)
+
+    @app.post("/api/v1/documents")
+    def create_document():
+        body = request.get_json(silent=True) or {}
+        document_id = str(uuid.uuid4())
+        with lock:
+            documents[document_id] = {
+                "id": document_id,
+                "document_template_id": body.get("document", {}).get("document_template_id"),
+                "status": "pending",
+                "public_share_link": None,
+                "download_url": None,
+            }
+            request_host[document_id] = request.host_url.rstrip("/")
+        threading.Thread(target=render, args=(document_id,), daemon=True).start()
+        return jsonify(document=documents[document_id]), 201
+
+    @app.get("/api/v1/document_cards/<document_id>")
+    def document_card(document_id):
+        with lock:
+            document = documents.get(document_id)
+            if document is None:
+                return jsonify(errors=[{"detail": "Not found"}]), 404
+            return jsonify(document_card=dict(document))
+
+    return app
+
+
+def create_recruitcrm_app(candidate_count=200):
+    """
+    Build a fake RecruitCRM API with synthetic candidates.
+
+    Candidates have ids ``1..candidate_count``, slugs ``stub-<id>`` and
+    emails ``candidate<id>@example.com``; the custom field schema matches
+    the app's field registry.
+
+    Args:
+        candidate_count: Number of candidates to serve
+
+    Returns:
+        Flask application
+    """
+    app = Flask("fake_recruitcrm")
+    lock = threading.Lock()
+    field_names = list(dict.fromkeys(name for name, _ in CRM_CUSTOM_FIELDS))
+    schema = [
+        {"field_id": field_id, "field_name": name, "field_type": "text"}
+        for field_id, name in enumerate(field_names, start=1)
+    ]
+    field_ids = {field["field_name"]: field["field_id"] for field in schema}
+
+    candidates = {}
+    for candidate_id in range(1, candidate_count + 1):
+        candidates[candidate_id] = {
+            "id": candidate_id,
+            "slug": f"stub-{candidate_id}",
+            "first_name": f"Kandidat{candidate_id}",
+            "last_name": "Stub",
+            "email": f"candidate{candidate_id}@example.com",
+            "skill": "Vertrieb, Verhandlung",
+            "updated_on": _timestamp(seconds_ago=candidate_id * 60),
+            "custom_fields": [
+                {"field_id": field_ids["Branche"], "field_name": "Branche",
+                 "value": "Med" if candidate_id % 2 else "Sales"},
+            ],
+        }
+    slugs = {candidate["slug"]: candidate_id
+             for candidate_id, candidate in candidates.items()}
+
+    @app.get("/v1/candidates")
+    def list_candidates():
+        page = int(request.args.get("page", 1))
+        limit = int(request.args.get("limit", 100))
+        with lock:
+            ordered = sorted(candidates.values(),
+                             key=lambda candidate: candidate["updated_on"],
+                             reverse=request.args.get("sort_order") == "desc")
+        items = ordered[(page - 1) * limit:page * limit]
+        has_next = page * limit < len(ordered)
+        return jsonify(
+            current_page=page,
+            data=items,
+            next_page_url=f"{request.base_url}?page={page + 1}" if has_next else None,
+        )
+
+    @app.get("/v1/candidates/<int:candidate_id>")
+    def get_candidate(candidate_id):
+        with lock:
+            candidate = candidates.get(candidate_id)
+        if candidate is None:
+            return jsonify(message="Candidate not found"), 404
+        return jsonify(candidate)
+
+    @app.post("/v1/candidates/<slug>")
+    def update_candidate(slug):
+        body = request.get_json(silent=True) or {}
+        with lock:
+            candidate = candidates.get(slugs.get(slug))
+            if candidate is None:
+                return jsonify(message="Candidate not found"), 404
+            custom_fields = {
+                field["field_id"]: field for field in candidate["custom_fields"]}
+            for field in body.pop("custom_fields", []):
+                custom_fields[field["field_id"]] = {
+                    **custom_fields.get(field["field_id"], {}), **field}
+            candidate.update(body)
+            candidate["custom_fields"] = list(custom_fields.values())
+            candidate["updated_on"] = _timestamp()
+            return jsonify(candidate)
+
+    @app.get("/v1/custom-fields/candidates")
+    def custom_fields_schema():
+        return jsonify(schema)
+
+    return app
+
+
+def create_airtable_app():
+    """
+    Build a fake Airtable API (record list/search, create, upsert, update).
+
+    Returns:
+        Flask application
+    """
+    app = Flask("fake_airtable")
+    lock = threading.Lock()
+    tables = {}
+
+    def new_record(table, fields):
+        record_id = "rec" + uuid.uuid4().hex[:14]
+        table[record_id] = dict(fields)
+        return record_id
+
+    @app.get("/v0/<base_id>/<table_id>")
+    def list_records(base_id, table_id):
+        formula = request.args.get("filterByFormula")
+        page_size = int(request.args.get("pageSize", 100))
+        offset = int(request.args.get("offset", 0))
+        with lock:
+            records = [{"id": record_id, "fields": dict(fields)}
+                       for record_id, fields in tables.get(table_id, {}).items()]
+
+        if formula:
+            match = re.search(r"= '(.*)'", formula)
+            email = match.group(1) if match else ""
+            records = [record for record in records
+                       if record["fields"].get("email", "").lower() == email]
+
+        page = records[offset:offset + page_size]
+        body = {"records": page}
+        if offset + page_size < len(records):
+            body["offset"] = str(offset + page_size)
+        return jsonify(body)
+
+    @app.post("/v0/<base_id>/<table_id>")
+    def create_record(base_id, table_id):
+        fields = (request.get_json(silent=True) or {}).get("fields", {})
+        with lock:
+            table = tables.setdefault(table_id, {})
+            record_id = new_record(table, fields)
+            return jsonify(id=record_id, fields=table[record_id])
+
+    def invalid_record(table, record):
+        """Airtable's 422 for a record it rejects, or None if it is valid."""
+        record_id = record.get("id")
+        if record_id and record_id not in table:
+            return {"type": "ROW_DOES_NOT_EXIST",
+                    "message": f"Record ID {record_id} does not exist"}
+        email = record.get("fields", {}).get("email")
+        if email is not None and "@" not in email:
+            return {"type": "INVALID_VALUE_FOR_COLUMN",
+                    "message": f'Field "email" cannot accept the value {email!r}'}
+        return None
+
+    @app.patch("/v0/<base_id>/<table_id>")
+    def upsert_records(base_id, table_id):
+        body = request.get_json(silent=True) or {}
+        merge_on = body.get("performUpsert", {}).get("fieldsToMergeOn", [])
+        records, created, updated = [], [], []
+        with lock:
+            table = tables.setdefault(table_id, {})
+            # The whole batch is rejected if any record is invalid
+            for record in body.get("records", []):
+                error = invalid_record(table, record)
+                if error:
+                    return jsonify(error=error), 422
+
+            for record in body.get("records", []):
+                record_id = record.get("id")
+                if not record_id and merge_on:
+                    record_id = next(
+                        (existing_id for existing_id, fields in table.items()
+                         if all(fields.get(name) == record["fields"].get(name)
+                                for name in merge_on)),
+                        None)
+                if record_id:
+                    table[record_id].update(record["fields"])
+                    updated.append(record_id)
+                else:
+                    record_id = new_record(table, record["fields"])
+                    created.append(record_id)
+                records.append({"id": record_id, "fields": dict(table[record_id])})
+        return jsonify(records=records, createdRecords=created, updatedRecords=updated)
+
+    @app.route("/v0/<base_id>/<table_id>/<record_id>", methods=["PATCH", "DELETE"])
+    def update_record(base_id, table_id, record_id):
+        with lock:
+            table = tables.setdefault(table_id, {})
+            if record_id not in table:
+                return jsonify(error={"type": "NOT_FOUND"}), 404
+            if request.method == "DELETE":
+                del table[record_id]
+                return jsonify(id=record_id, deleted=True)
+            table[record_id].update(
+                (request.get_json(silent=True) or {}).get("fields", {}))
+            return jsonify(id=record_id, fields=dict(table[record_id]))
+
+    return app
+
+
+def create_stub_app(service, candidate_count=200, render_seconds=2.0,
+                    webhook_url=None, latency=0.0, jitter=0.0, error_rate=0.0):
+    """
+    Build one stub upstream with fault injection applied.
+
+    Args:
+        service: "pdfmonkey", "recruitcrm" or "airtable"
+
+    Returns:
+        Flask application
+    """
+    if service == "pdfmonkey":
+        app = create_pdfmonkey_app(render_seconds, webhook_url)
+    elif service == "recruitcrm":
+        app = create_recruitcrm_app(candidate_count)
+    else:
+        app = create_airtable_app()
+    return add_faults(app, latency, jitter, error_rate)
+
+
+def start_stub_servers(services=tuple(DEFAULT_PORTS), host="127.0.0.1",
+                       ports=None, **options):
+    """
+    Serve stubs on background threads.
+
+    Args:
+        services: Services to start
+        host: Interface to bind
+        ports: Port per service (defaults to ``DEFAULT_PORTS``)
+        **options: Passed to ``create_stub_app``
+
+    Returns:
+        Dictionary of service name → running werkzeug server
+    """
+    ports = {**DEFAULT_PORTS, **(ports or {})}
+    servers = {}
+    for service in services:
+        server = make_server(host, ports[service],
+                             create_stub_app(service, **options), threaded=True)
+        threading.Thread(target=server.serve_forever,
+                         name=f"stub-{service}", daemon=True).start()
+        servers[service] = server
+    return servers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("service", choices=["all", *DEFAULT_PORTS])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int,
+                        help="Port for a single service (default: 5101-5103)")
+    parser.add_argument("--render-seconds", type=float, default=2.0)
+    parser.add_argument("--webhook-url")
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Delay added to every stub response, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Extra random delay of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Share of requests answered with 503")
+    args = parser.parse_args()
+
+    configure_logging()
+    services = list(DEFAULT_PORTS) if args.service == "all" else [args.service]
+    ports = {args.service: args.port} if args.port and args.service != "all" else None
+    servers = start_stub_servers(
+        services, args.host, ports,
+        candidate_count=args.candidates,
+        render_seconds=args.render_seconds,
+        webhook_url=args.webhook_url,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    for service, server in servers.items():
+        logger.info("Stub %s listening on http://%s:%d",
+                    service, args.host, server.server_port)
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        for server in servers.values():
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
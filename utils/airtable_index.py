@@ -0,0 +1,141 @@
+import logging
+import os
+import threading
+import time
+
+from utils.http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+# Rebuild a table's index from a full listing once it is older than this
+REFRESH_INTERVAL = int(os.getenv("AIRTABLE_INDEX_REFRESH_SECONDS", str(15 * 60)))
+
+
+class AirtableRecordIndex:
+    """
+    Local email → record id index per Airtable table.
+
+    Lets writes go straight to ``PATCH /<table>/<record_id>`` instead of
+    running a ``filterByFormula`` search (a full table scan on Airtable's
+    side) first. Entries are added on every write, rebuilt in the
+    background from a paged table listing, and dropped when a write for
+    them comes back 404.
+
+    The listing is authoritative: a refresh drops records deleted upstream
+    and corrects ids of re-created ones. Only entries put or invalidated
+    while the listing was running override it.
+    """
+
+    def __init__(self, base_id: str, email_field: str = "email"):
+        self.base_id = base_id
+        self.email_field = email_field
+        self._records: dict[str, dict[str, str]] = {}
+        self._refreshed_at: dict[str, float] = {}
+        self._refreshing: set[str] = set()
+        # table_id -> {email key: monotonic time of the last put/invalidate}
+        self._touched: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return email.strip().lower()
+
+    def get(self, table_id: str, email: str) -> str | None:
+        """
+        Look up the record id for an email, scheduling a refresh if stale.
+
+        Args:
+            table_id: Airtable table ID
+            email: Candidate email (case-insensitive)
+
+        Returns:
+            Record id or None if the email is not indexed
+        """
+        if time.time() - self._refreshed_at.get(table_id, 0) > REFRESH_INTERVAL:
+            self.refresh_async(table_id)
+
+        with self._lock:
+            return self._records.get(table_id, {}).get(self._key(email))
+
+    def put(self, table_id: str, email: str, record_id: str):
+        """Remember the record id written for an email."""
+        if not email or not record_id:
+            return
+        key = self._key(email)
+        with self._lock:
+            self._records.setdefault(table_id, {})[key] = record_id
+            self._touched.setdefault(table_id, {})[key] = time.monotonic()
+
+    def invalidate(self, table_id: str, email: str):
+        """Forget an email, e.g. after its record was deleted upstream."""
+        key = self._key(email)
+        with self._lock:
+            self._records.get(table_id, {}).pop(key, None)
+            self._touched.setdefault(table_id, {})[key] = time.monotonic()
+
+    def refresh_async(self, table_id: str):
+        """Rebuild a table's index on a background thread (at most one at a time)."""
+        with self._lock:
+            if table_id in self._refreshing:
+                return
+            self._refreshing.add(table_id)
+
+        threading.Thread(
+            target=self._refresh_guarded, args=(table_id,),
+            name=f"airtable-index-{table_id}", daemon=True
+        ).start()
+
+    def _refresh_guarded(self, table_id: str):
+        try:
+            self.refresh(table_id)
+        except Exception as e:
+            logger.error("Failed to refresh Airtable index for %s: %s", table_id, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(table_id)
+
+    def refresh(self, table_id: str) -> int:
+        """
+        Rebuild a table's index from a paged listing of only the email field.
+
+        Args:
+            table_id: Airtable table ID
+
+        Returns:
+            Number of indexed records
+        """
+        url = f"{self.base_id}/{table_id}"
+        params = {"fields[]": self.email_field, "pageSize": 100}
+        records = {}
+        started = time.monotonic()
+
+        while True:
+            response = get_session("airtable").get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+
+            for record in data.get("records", []):
+                email = record.get("fields", {}).get(self.email_field)
+                if email:
+                    records.setdefault(self._key(email), record["id"])
+
+            if not data.get("offset"):
+                break
+            params["offset"] = data["offset"]
+
+        with self._lock:
+            # Writes and 404s seen while the listing was running are newer
+            current = self._records.get(table_id, {})
+            touched = {key: at for key, at in self._touched.get(table_id, {}).items()
+                       if at >= started}
+            for key in touched:
+                if key in current:
+                    records[key] = current[key]
+                else:
+                    records.pop(key, None)
+            self._records[table_id] = records
+            self._touched[table_id] = touched
+            self._refreshed_at[table_id] = time.time()
+
+        logger.info("Indexed %d Airtable records for %s", len(records), table_id)
+        return len(records)
@@ -0,0 +1,172 @@
+import logging
+
+from utils.sync_snapshots import diff_fields
+
+logger = logging.getLogger(__name__)
+
+# Error types of a 422 that names a record id which no longer exists
+STALE_RECORD_ERRORS = ("ROW_DOES_NOT_EXIST", "MODEL_ID_NOT_FOUND", "NOT_FOUND")
+
+
+class AirtableUpserts:
+    """
+    Planning and bookkeeping around batched Airtable upserts.
+
+    Shared by the threaded pipeline in app.py and the asyncio one in
+    asgi.py, which only differ in how they send the requests. Methods
+    touching the snapshot store hit SQLite; async callers run them via
+    ``asyncio.to_thread``.
+    """
+
+    def __init__(self, index, snapshots, route):
+        """
+        Args:
+            index: ``AirtableRecordIndex`` (email → record id per table)
+            snapshots: ``SnapshotStore`` holding the last synced fields
+            route: Callable ``route(form) -> (table_id, fields)`` picking
+                the table of a form and building its Airtable fields
+        """
+        self.index = index
+        self.snapshots = snapshots
+        self.route = route
+
+    def upsert_body(self, table_id, batch):
+        """
+        Build the ``performUpsert`` body for up to 10 records.
+
+        Records whose email is already indexed carry their record id, so
+        they are updated directly and matching stays case-insensitive.
+        """
+        records = []
+        for fields in batch:
+            record = {"fields": fields}
+            record_id = self.index.get(table_id, fields["email"])
+            if record_id:
+                record["id"] = record_id
+            records.append(record)
+
+        return {
+            "performUpsert": {"fieldsToMergeOn": ["email"]},
+            "records": records,
+        }
+
+    def forget_batch(self, table_id, batch):
+        """Drop index entries and snapshots of records with a stale record id."""
+        for fields in batch:
+            self.index.invalidate(table_id, fields["email"])
+            self.snapshots.invalidate(f"airtable:{table_id}", fields["email"].lower())
+
+    def stale_records(self, table_id, batch, response):
+        """
+        Pick the records of a failed batch whose indexed record id is stale.
+
+        Airtable answers a write to a deleted record with 404, or with a 422
+        of one of the ``STALE_RECORD_ERRORS`` types. If the error message
+        names record ids, only those records are returned; otherwise every
+        record sent with an id is. Other errors (invalid values, unknown
+        fields) return an empty list.
+
+        Args:
+            table_id: Airtable table ID
+            batch: Field dictionaries sent in the failed request
+            response: The failed ``requests`` or ``httpx`` response
+        """
+        if response.status_code not in (404, 422):
+            return []
+        try:
+            error = response.json().get("error")
+        except ValueError:
+            error = None
+        if isinstance(error, dict):
+            error_type, message = error.get("type"), error.get("message") or ""
+        else:
+            error_type, message = error, ""
+        if response.status_code == 422 and error_type not in STALE_RECORD_ERRORS:
+            return []
+
+        indexed = [(fields, self.index.get(table_id, fields["email"])) for fields in batch]
+        indexed = [(fields, record_id) for fields, record_id in indexed if record_id]
+        named = [fields for fields, record_id in indexed if record_id in message]
+        return named or [fields for fields, _ in indexed]
+
+    def index_records(self, table_id, records):
+        """Remember the record ids returned by an upsert."""
+        for record in records:
+            self.index.put(
+                table_id, record.get("fields", {}).get("email"), record["id"])
+
+    def diff_fields(self, table_id, email_key, fields):
+        """
+        Reduce an Airtable payload to the fields that changed since the last sync.
+
+        A diff is only used for records the email index knows about, so a
+        record deleted upstream is recreated in full.
+
+        Args:
+            table_id: Airtable table ID
+            email_key: Lower-cased candidate email
+            fields: Full field dictionary for the record
+
+        Returns:
+            Fields to send (always including "email"), or None if nothing changed
+        """
+        snapshot = self.snapshots.get(f"airtable:{table_id}", email_key)
+        if not snapshot or not self.index.get(table_id, email_key):
+            return fields
+
+        changed = diff_fields(snapshot["payload"], fields)
+        if not changed:
+            return None
+        return {**changed, "email": fields["email"]}
+
+    def plan(self, forms):
+        """
+        Group forms per table and reduce them to the fields that changed.
+
+        Forms without an email are skipped; if the same email appears more
+        than once per table, the last form wins.
+
+        Returns:
+            (results, plans): ``results`` is pre-filled for unchanged records;
+            ``plans`` is a list of ``(table_id, entries)`` where each entry is
+            ``(email_key, form indices, full fields, changed fields)``
+        """
+        results = [None] * len(forms)
+        groups = {}  # table_id -> {email: (form indices, fields)}
+
+        for index, form in enumerate(forms):
+            email = form.get("email")
+            if not email:
+                logger.error("Email is required for Airtable record operation")
+                continue
+
+            table_id, fields = self.route(form)
+            table_group = groups.setdefault(table_id, {})
+            indices, _ = table_group.get(email.lower(), ([], None))
+            table_group[email.lower()] = (indices + [index], fields)
+
+        plans = []
+        for table_id, table_group in groups.items():
+            entries = []
+            for email_key, (indices, fields) in table_group.items():
+                changes = self.diff_fields(table_id, email_key, fields)
+                if changes is None:
+                    unchanged = {"id": self.index.get(table_id, email_key),
+                                 "fields": {}, "unchanged": True}
+                    for index in indices:
+                        results[index] = unchanged
+                    continue
+                entries.append((email_key, indices, fields, changes))
+
+            if entries:
+                plans.append((table_id, entries))
+
+        return results, plans
+
+    def record(self, table_id, entries, records, results):
+        """Snapshot saved records and fill in their results."""
+        for (email_key, indices, fields, _), record in zip(entries, records):
+            if record is not None:
+                self.snapshots.put(f"airtable:{table_id}", email_key, fields)
+            for index in indices:
+                results[index] = record
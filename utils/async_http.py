@@ -0,0 +1,159 @@
+import asyncio
+import os
+import time
+
+import httpx
+
+from utils import metrics
+from utils.circuit_breaker import CircuitOpenError
+from utils.http_client import (
+    MAX_RETRIES,
+    POOL_SIZE,
+    RATE_LIMIT_RETRIES,
+    RETRY_BACKOFF,
+    UPSTREAMS,
+    admit,
+    get_rate_limiter,
+    rate_limit_delay,
+)
+
+# Methods that are safe to retry, as in the sync client's urllib3 Retry
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+RETRY_STATUSES = {500, 502, 503, 504}
+
+_clients: dict[str, "AsyncUpstreamClient"] = {}
+
+
+class AsyncUpstreamClient(httpx.AsyncClient):
+    """
+    asyncio counterpart of ``UpstreamSession`` for one upstream API.
+
+    Same base URL, bearer token, default timeout, retry policy, rate
+    limiter and circuit breaker, so the async routes behave like the sync
+    ones.
+    """
+
+    def __init__(self, name: str, base_url: str, api_key: str | None, timeout):
+        connect_timeout, read_timeout = timeout
+        super().__init__(
+            base_url=base_url.rstrip("/") + "/",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Accept": "application/json",
+            },
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        )
+        self.name = name
+
+    async def request(self, method, url, **kwargs):
+        url = str(url)
+        if not url.startswith(("http://", "https://")):
+            url = url.lstrip("/")
+
+        method = method.upper()
+        breaker = admit(self.name)
+        try:
+            response = await self._request_limited(method, url, **kwargs)
+        except httpx.HTTPError:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def _request_limited(self, method, url, **kwargs):
+        limiter = get_rate_limiter(self.name)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            wait = limiter.reserve()
+            metrics.UPSTREAM_QUEUE_WAIT.observe(wait, self.name)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # A 429 seen by another caller while we waited pauses us too
+            while (pause := limiter.paused_for()) > 0:
+                await asyncio.sleep(pause)
+
+            response = await self._send(method, url, **kwargs)
+            if response.status_code != 429:
+                limiter.recover()
+                return response
+
+            metrics.UPSTREAM_RATE_LIMITED.inc(self.name)
+            limiter.throttle(rate_limit_delay(response, attempt))
+        return response
+
+    async def _send(self, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self._request_with_retries(method, url, **kwargs)
+        except httpx.HTTPError:
+            metrics.UPSTREAM_REQUESTS.inc(self.name, method, "error")
+            raise
+        finally:
+            metrics.UPSTREAM_LATENCY.observe(
+                time.perf_counter() - started, self.name, method)
+
+        metrics.UPSTREAM_REQUESTS.inc(self.name, method, str(response.status_code))
+        return response
+
+    async def _request_with_retries(self, method, url, **kwargs):
+        retries = MAX_RETRIES if method in IDEMPOTENT_METHODS else 0
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(RETRY_BACKOFF * (2 ** (attempt - 1)))
+                metrics.UPSTREAM_RETRIES.inc(self.name)
+            try:
+                response = await super().request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+                await response.aclose()
+
+
+def is_unavailable_error(error: Exception) -> bool:
+    """Async counterpart of ``utils.http_client.is_unavailable_error``."""
+    if isinstance(error, CircuitOpenError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, httpx.TransportError)
+
+
+def get_async_client(name: str) -> AsyncUpstreamClient:
+    """
+    Return the shared async client for an upstream, creating it on first use.
+
+    Clients belong to the event loop that first used them; the ASGI
+    entry point closes them on shutdown via ``close_async_clients``.
+
+    Args:
+        name: One of "recruitcrm", "airtable" or "pdfmonkey"
+
+    Returns:
+        AsyncUpstreamClient with pooled keep-alive connections
+    """
+    client = _clients.get(name)
+    if client is None:
+        config = UPSTREAMS[name]
+        client = AsyncUpstreamClient(
+            name,
+            config["base_url"],
+            os.getenv(config["api_key_env"]),
+            config["timeout"],
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_async_clients():
+    """Close all async clients (call on application shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,214 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from utils.custom_field_mapper import iter_pages
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id          INTEGER PRIMARY KEY,
+    slug        TEXT,
+    email       TEXT,
+    updated_on  TEXT,
+    synced_at   REAL NOT NULL,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_slug ON candidates (slug);
+CREATE INDEX IF NOT EXISTS candidates_email ON candidates (email);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+"""
+
+# RecruitCRM list ordering used for delta syncs (most recently updated first)
+DELTA_SORT = {"sort_by": "updatedon", "sort_order": "desc"}
+
+
+class CandidateStore:
+    """
+    Local SQLite mirror of RecruitCRM candidates, keyed by id, slug and email.
+
+    ``sync_delta`` walks the candidate list newest-update-first and stops at
+    the first page that is entirely older than the last sync, so routine
+    syncs cost one or two requests. The first sync is a full (parallel) scan.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the mirror database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------ #
+    # Reads
+    # ------------------------------------------------------------------ #
+
+    def _get_where(self, column: str, value) -> dict | None:
+        row = self._connect().execute(
+            f"SELECT data, synced_at FROM candidates WHERE {column} = ? "
+            "ORDER BY updated_on DESC LIMIT 1",
+            (value,)
+        ).fetchone()
+        if not row:
+            return None
+        return {"data": json.loads(row["data"]), "synced_at": row["synced_at"]}
+
+    def get(self, candidate_id: int) -> dict | None:
+        """
+        Look up a mirrored candidate by id.
+
+        Returns:
+            {"data": candidate dict, "synced_at": timestamp} or None
+        """
+        return self._get_where("id", candidate_id)
+
+    def get_by_slug(self, slug: str) -> dict | None:
+        """Look up a mirrored candidate by slug."""
+        return self._get_where("slug", slug)
+
+    def get_by_email(self, email: str) -> dict | None:
+        """Look up a mirrored candidate by email (case-insensitive)."""
+        return self._get_where("email", email.strip().lower())
+
+    def iter_all(self):
+        """Yield every mirrored candidate dict (e.g. to collect field values)."""
+        for row in self._connect().execute("SELECT data FROM candidates"):
+            yield json.loads(row["data"])
+
+    def last_synced_at(self) -> float:
+        """Start time of the last completed delta sync (0 if never)."""
+        return float(self._get_state("last_sync_at") or 0)
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+
+    def upsert(self, candidates: list[dict]):
+        """
+        Insert or replace candidates as returned by RecruitCRM.
+
+        A copy with an older ``updated_on`` than the mirrored one (e.g. a
+        sync page fetched before a save) does not replace it.
+        """
+        now = time.time()
+        rows = [
+            (
+                candidate["id"],
+                candidate.get("slug"),
+                (candidate.get("email") or "").strip().lower() or None,
+                candidate.get("updated_on"),
+                now,
+                json.dumps(candidate),
+            )
+            for candidate in candidates
+            if candidate.get("id") is not None
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO candidates "
+                "(id, slug, email, updated_on, synced_at, data) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET slug = excluded.slug, "
+                "email = excluded.email, updated_on = excluded.updated_on, "
+                "synced_at = excluded.synced_at, data = excluded.data "
+                "WHERE excluded.updated_on IS NULL OR candidates.updated_on IS NULL "
+                "OR excluded.updated_on >= candidates.updated_on",
+                rows
+            )
+
+    def mark_stale(self, slug: str):
+        """
+        Flag a candidate as changed upstream since it was mirrored.
+
+        Its next load fetches it from RecruitCRM instead of the mirror.
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE candidates SET synced_at = 0 WHERE slug = ?", (slug,))
+
+    def _get_state(self, key: str) -> str | None:
+        row = self._connect().execute(
+            "SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                (key, str(value))
+            )
+
+    # ------------------------------------------------------------------ #
+    # Sync
+    # ------------------------------------------------------------------ #
+
+    def sync_delta(self, page_size: int = 100, full_scan_parallel: int = 4) -> int:
+        """
+        Pull candidates updated since the last sync into the mirror.
+
+        Args:
+            page_size: Candidates per page
+            full_scan_parallel: Pages fetched in parallel on the first sync
+
+        Returns:
+            Number of candidates written
+        """
+        with self._sync_lock:
+            watermark = self._get_state("updated_on_watermark")
+            started_at = time.time()
+            newest = watermark
+            written = 0
+
+            parallel = 1 if watermark else full_scan_parallel
+            # Errors propagate so a partial scan never advances the watermark
+            for _, candidates in iter_pages(
+                    "candidates", page_size, parallel,
+                    params=DELTA_SORT, raise_errors=True):
+                changed = [
+                    candidate for candidate in candidates
+                    if not watermark or (candidate.get("updated_on") or "") >= watermark
+                ]
+                self.upsert(changed)
+                written += len(changed)
+
+                for candidate in changed:
+                    updated_on = candidate.get("updated_on") or ""
+                    if not newest or updated_on > newest:
+                        newest = updated_on
+
+                if watermark and len(changed) < len(candidates):
+                    break  # reached candidates older than the last sync
+
+            if newest:
+                self._set_state("updated_on_watermark", newest)
+            self._set_state("last_sync_at", started_at)
+
+        logger.info("Candidate mirror synced (%d updated)", written)
+        return written
+
+    def start_background_sync(self, interval: int):
+        """Run ``sync_delta`` every ``interval`` seconds on a daemon thread."""
+        def run():
+            while True:
+                try:
+                    self.sync_delta()
+                except Exception as e:
+                    logger.error("Candidate mirror sync failed: %s", e)
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="candidate-sync", daemon=True).start()
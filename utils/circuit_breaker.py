@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+
+import requests
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(
+            f"{name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one upstream.
+
+    Tracks the outcome of the last ``window`` calls. Once at least
+    ``min_calls`` are recorded and the failure rate reaches
+    ``failure_rate``, the circuit opens and calls fail fast for
+    ``open_seconds``. After that a single trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_rate: float = 0.5, window: int = 20,
+                 min_calls: int = 10, open_seconds: float = 30):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+        self.on_open = None  # optional callback(name), e.g. for metrics
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._retry_in() <= 0:
+                return self.HALF_OPEN
+            return self._state
+
+    def is_open(self) -> bool:
+        """True while calls fail fast; False again once a trial call is due."""
+        return self.state == self.OPEN
+
+    def _retry_in(self) -> float:
+        return self._opened_at + self.open_seconds - time.monotonic()
+
+    def before_call(self):
+        """
+        Admit a call or fail fast.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                trial call already in flight
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            retry_in = self._retry_in()
+            # A trial that never reported back (e.g. a cancelled task)
+            # must not keep the circuit half-open forever
+            trial_stuck = (self._trial_running and time.monotonic()
+                           - self._trial_started > self.open_seconds)
+            if retry_in <= 0 and (not self._trial_running or trial_stuck):
+                self._state = self.HALF_OPEN
+                self._trial_running = True
+                self._trial_started = time.monotonic()
+                return
+        raise CircuitOpenError(self.name, max(retry_in, 0))
+
+    def record_success(self):
+        """Record a call that reached a healthy upstream."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._trial_running = False
+                self._outcomes.clear()
+            if self._state == self.CLOSED:
+                self._outcomes.append(True)
+
+    def record_failure(self):
+        """Record a failed call (transport error, timeout or 5xx)."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            if self._state == self.OPEN:
+                return  # a late failure of a call admitted before opening
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (self._state == self.CLOSED
+                    and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._trial_running = False
+        if self.on_open:
+            self.on_open(self.name)
@@ -1,103 +1,80 @@
-
-import cachetools
 import itertools
-import requests
+import json
+import logging
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from utils.field_registry import CRM_CUSTOM_FIELDS
+from utils.http_client import get_session
+from utils.storage import data_path
 
-RECRUITCRM_BASE_URL = "https://api.recruitcrm.io/v1"
-RECRUITCRM_API_KEY = os.getenv("RECRUITCRM_API_KEY")
-HEADERS = {
-    "Authorization": f"Bearer {RECRUITCRM_API_KEY}",
-    "Content-Type": "application/json"
-}
+logger = logging.getLogger(__name__)
+
+# Custom field schema cache: kept in memory, persisted to the data directory
+# so a fresh process starts warm, and refreshed in the background when stale
+CUSTOM_FIELDS_TTL = 30 * 60
+CUSTOM_FIELDS_CACHE_FILE = "custom_fields.json"
+_custom_fields_cache = {"fields": None, "fetched_at": 0.0}
+_custom_fields_refresh_lock = threading.Lock()
+# Derived views, recomputed whenever the map object above is replaced
+_reverse_custom_fields = {"map": None, "reverse": {}}
+_bound_custom_fields = {"map": None, "fields": ()}
 
 
 def build_custom_field_payload(form) -> list[dict]:
     """Convert form data → [{field_id, value}, …] for RecruitCRM PATCH request."""
+    bound = _bind_custom_fields()
+    return [{"field_id": field_id, "value": value}
+            for field_id, getter in bound
+            if (value := getter(form))]
 
-    def join_multi(n):
-        return ", ".join(form.getlist(n)).strip() or None
-
-    wanted = {
-        "Branche": form.get("branche"),
-        "Kündigungsfrist": form.get("kuendigungsfrist"),
-        "Aktuelle Anstellungsart": form.get("anstellungsart"),
-        "Zusatzqualifikation": form.get("zusatzqualifikation"),
-        "Zusatzbezeichnungen": join_multi("zusatzbezeichnungen[]"),
-        "Wechselmotivation": form.get("wechselmotivation"),
-        "Bonushöhe": form.get("bonus_amount"),
-        "Bonustyp": form.get("bonus_type"),
-        "Soll das Gehalt erhöht werden?": form.get("gehalt_erhoehen"),
-        "Offen für unsere Key-Clients?": form.get("key_clients"),
-        "Blacklist: Bitte nicht an diese Unternehmen": form.get("nicht_an"),
-        "Whitelist: An wen soll der Kandidat auf jeden Fall geschickt werden?": form.get("soll_auf_jeden_fall"),
-        "Wahrscheinlichkeit auf einen Aufhebungsvertrag": form.get("aufhebungsvertrag_wahrscheinlichkeit"),
-        "Ab wann wäre der Kandidat verfügbar?": form.get("verfuegbar_ab"),
-        "Arbeitsort (Standort)": form.get("arbeitgeber_standort"),
-        "Zusatzleistungen (aktuell)": form.get("additional_benefits"),
-        # "Extras (Interview-Notes)": form.get("job_extras"),
-        "Interview-Notes Schwerpunkte": form.get("interview_schwerpunkte"),
-        "Gewünschter Unternehmenstyp": form.get("unternehmen_wahl"),
-        "Ist der Kandidat aktiv auf der Suche?": form.get("aktiv_suche"),
-        "Ist der Kandidat aktiv in Bewerbungsprozessen?": form.get("aktiv_bewerbung"),
-        "Arbeitet der Kandidat mit weiteren Personalvermittlungen zusammen?": form.get("weitere_personalvermittlungen"),
-        "CV wird zugeschickt bis zum": form.get("cv_submission_deadline"),
-        "Art des Arbeitgebers": form.get("arbeitgeber_art"),
-        "Aktueller Arbeitgeber": form.get("arbeitgeber_name"),
-        "Wunsch Job Fachbereich": join_multi("kategorie"),
-        "Aktuelle Kategorie (Fachbereich)": join_multi("aktuelle_fachbereich"),
-        "Welches Verkehrsmittel wird genutzt?": form.get("verkehrsmittel"),
-        "Home-Office (aktuell)": form.get("home_office_aktuell"),
-        "Home-Office (gewünscht)": form.get("home_office_gewuenscht"),
-        "Wunsch Flexible Arbeitszeiten?": form.get("flexible_arbeitszeiten"),
-        "Aktueller Prozess (IV-Notizen)": form.get("current_process"),
-        "Erreichbare Städte": form.get("erreichbare_stadtname"),
-        "Aktuelle Berufliche Lage des Kandidaten": form.get("arbeitgeber_lage"),
-        "Wohnort (PLZ)": form.get("wohnort_plz"),
-        "Wohnort (Stadt)": form.get("wohnort"),
-        "Aktuelle Position": form.get("aktuelle_position"),
-        "Pendelbarer Radius (in km)": form.get("radius"),
-        "Wuensche am neuen Job": form.get("wuensche_an_den_job"),
-        "Aktuelle Berufliche Lage des Kandidaten": form.get("berufliche_erfahrung"),
-
-        # ✅ Newly added custom field mappings
-        "Umzugsbereit": join_multi("umzugsbereit[]"),           # multiselect
-        "Relevante Berufserfahrung": form.get("relevante_berufserfahrung"),
-        "Berufliche Ziele": form.get("berufliche_ziele"),
-        "Private Ziele": form.get("private_ziele"),
-        "Sonstiges": form.get("sonstiges"),
-        "Umgang mit Rückschlägen": form.get("umgang_mit_rueckschlaegen"),
-        "Weiterentwicklung": form.get("weiterentwicklung"),
-        "Finanzielle Motivation": form.get("finanzielle_motivation"),
-        "Erfolgsmethodik & KPIs": form.get("erfolgsmethodik_kpis"),
-        "Wechselkommitment (von 1-10)": form.get("wechselkommitment"),
-        "Wunschklinik": form.get("wunschklinik"),
-        # "Auswertung": form.get("auswertung"),
-        # "Auswertung": "HELLO",
-        "Extras (Interview-Notes)": form.get("auswertung"),
-        "Anonyme Auswertung": form.get("anonym_auswertung"),
-    }
-
-    n2id = name_to_id()  # assumes this returns a dict: {"Branche": 13, ...}
-    return [{"field_id": n2id[k], "value": v}
-            for k, v in wanted.items()
-            if v and k in n2id]
-
-
-@cachetools.cached(cachetools.TTLCache(maxsize=1, ttl=30*60))
-def build_custom_fields_map() -> dict[int, str]:
+
+def _bind_custom_fields() -> tuple:
     """
-    Build a mapping of custom field IDs to field names.
-    Cached for 30 minutes to reduce API calls.
+    Resolve the registry's custom fields to RecruitCRM field ids.
+
+    Rebound only when the custom field map is replaced (i.e. refreshed).
+
+    Returns:
+        Tuple of (field_id, getter) pairs
+    """
+    fields_map = build_custom_fields_map()
+    if _bound_custom_fields["map"] is not fields_map:
+        n2id = name_to_id()
+        _bound_custom_fields.update(
+            map=fields_map,
+            fields=tuple((n2id[name], getter)
+                         for name, getter in CRM_CUSTOM_FIELDS if name in n2id)
+        )
+    return _bound_custom_fields["fields"]
+
+
+def fetch_custom_fields_map() -> dict[int, str]:
+    """
+    Fetch the field-id → field-name map from RecruitCRM's schema endpoint.
+
+    Falls back to collecting the fields from the first 1,000 candidates if
+    the schema endpoint is unavailable.
 
     Returns:
         Dictionary mapping field_id to field_name for all candidate custom fields
     """
-    url = f"{RECRUITCRM_BASE_URL}/candidates"
+    try:
+        response = get_session("recruitcrm").get("custom-fields/candidates")
+        response.raise_for_status()
+        return {field["field_id"]: field["field_name"] for field in response.json()}
+    except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+        logger.warning("Custom field schema unavailable, scanning candidates: %s", e)
+
     custom_fields_map = {}
 
     # Limit to first 1000 candidates to avoid excessive API calls
-    for candidate in itertools.islice(paginated_fetch(url), 1_000):
+    for candidate in itertools.islice(paginated_fetch("candidates"), 1_000):
         for custom_field in candidate.get("custom_fields", []):
             field_id = custom_field["field_id"]
             field_name = custom_field["field_name"]
@@ -106,14 +83,101 @@ def build_custom_fields_map() -> dict[int, str]:
     return custom_fields_map
 
 
+def _load_custom_fields_cache():
+    """Load the last persisted custom field map, if any."""
+    try:
+        with open(data_path(CUSTOM_FIELDS_CACHE_FILE)) as f:
+            cached = json.load(f)
+        fields = {int(field_id): name for field_id, name in cached["fields"].items()}
+        return fields, cached["fetched_at"]
+    except (OSError, ValueError, KeyError):
+        return None, 0
+
+
+def _store_custom_fields(fields: dict[int, str]):
+    """Publish a freshly fetched map in memory and on disk."""
+    fetched_at = time.time()
+    _custom_fields_cache.update(fields=fields, fetched_at=fetched_at)
+
+    path = data_path(CUSTOM_FIELDS_CACHE_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"fetched_at": fetched_at, "fields": fields}, f)
+    os.replace(tmp_path, path)
+
+
+def refresh_custom_fields_map() -> dict[int, str]:
+    """
+    Re-fetch the custom field map and update the caches.
+
+    Returns:
+        The fresh map (the previous one is kept if the fetch came back empty)
+    """
+    fields = fetch_custom_fields_map()
+    if fields:
+        _store_custom_fields(fields)
+    return _custom_fields_cache["fields"] or fields
+
+
+def _refresh_in_background():
+    """Start a background refresh unless one is already running."""
+    if not _custom_fields_refresh_lock.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            refresh_custom_fields_map()
+        except Exception as e:
+            logger.error("Failed to refresh custom fields: %s", e)
+        finally:
+            _custom_fields_refresh_lock.release()
+
+    threading.Thread(target=run, name="custom-fields-refresh", daemon=True).start()
+
+
+def build_custom_fields_map() -> dict[int, str]:
+    """
+    Build a mapping of custom field IDs to field names.
+
+    Served from memory, or from the on-disk cache after a restart. Once the
+    map is older than 30 minutes the stale copy is still returned while a
+    background refresh fetches the schema; only a process with no cache at
+    all blocks on the first fetch.
+
+    Returns:
+        Dictionary mapping field_id to field_name for all candidate custom fields
+    """
+    if _custom_fields_cache["fields"] is None:
+        fields, fetched_at = _load_custom_fields_cache()
+        if fields:
+            _custom_fields_cache.update(fields=fields, fetched_at=fetched_at)
+        else:
+            with _custom_fields_refresh_lock:
+                if _custom_fields_cache["fields"] is None:
+                    return refresh_custom_fields_map()
+
+    if time.time() - _custom_fields_cache["fetched_at"] > CUSTOM_FIELDS_TTL:
+        _refresh_in_background()
+
+    return _custom_fields_cache["fields"]
+
+
 def get_field_name_to_id_mapping():
     """
     Reverse mapping: field_name -> field_id
 
+    Computed once per custom field map rather than on every call.
+
     Returns:
         Dictionary mapping field names to field IDs
     """
-    return {name: field_id for field_id, name in build_custom_fields_map().items()}
+    fields_map = build_custom_fields_map()
+    if _reverse_custom_fields["map"] is not fields_map:
+        _reverse_custom_fields.update(
+            map=fields_map,
+            reverse={name: field_id for field_id, name in fields_map.items()}
+        )
+    return _reverse_custom_fields["reverse"]
 
 
 def name_to_id():
@@ -127,31 +191,111 @@ def name_to_id():
     return get_field_name_to_id_mapping()
 
 
-def paginated_fetch(url: str, page_size: int = 100):
+def fetch_page(url: str, page: int, page_size: int = 100,
+               params: dict | None = None) -> tuple[list, bool]:
     """
-    Generator function to fetch paginated data from APIs.
+    Fetch a single page from a paginated RecruitCRM endpoint.
 
     Args:
-        url: The API endpoint URL
+        url: The API endpoint URL (absolute or relative to the RecruitCRM base)
+        page: 1-based page number
         page_size: Number of items per page (default: 100)
+        params: Extra query parameters (e.g. sorting)
+
+    Returns:
+        Tuple of (items on the page, whether a next page exists)
+
+    Raises:
+        requests.HTTPError: If the request fails
+    """
+    response = get_session("recruitcrm").get(
+        url, params={**(params or {}), "page": page, "limit": page_size})
+    response.raise_for_status()
+
+    body = response.json()
+    items = body.get("data", [])
+    if "next_page_url" in body:
+        has_next = bool(body["next_page_url"])
+    else:
+        has_next = len(items) >= page_size
+    return items, has_next
+
+
+def iter_pages(url: str, page_size: int = 100, parallel: int = 1,
+               start_page: int = 1, params: dict | None = None,
+               raise_errors: bool = False):
+    """
+    Generator over the pages of a RecruitCRM endpoint, fetched ahead.
+
+    While the caller works on one page the next ``parallel`` pages are
+    already being fetched in the background, so a full scan overlaps
+    network round trips with processing. Use ``parallel > 1`` for bounded
+    parallel full scans; pages are still yielded in order.
+
+    Args:
+        url: The API endpoint URL (absolute or relative to the RecruitCRM base)
+        page_size: Number of items per page (default: 100)
+        parallel: Pages fetched ahead of the one being consumed (default: 1)
+        start_page: First page to fetch (default: 1)
+        params: Extra query parameters (e.g. sorting)
+        raise_errors: Raise on a failed page instead of ending quietly
 
     Yields:
-        Individual items from the paginated response
+        Tuples of (page number, items)
     """
-    page = 1
-    while True:
-        response = requests.get(
-            url,
-            headers=HEADERS,
-            timeout=20
-        )
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, parallel), thread_name_prefix="paginate")
+    in_flight = deque()
+    next_page = start_page
+
+    def schedule():
+        nonlocal next_page
+        in_flight.append((next_page, executor.submit(
+            fetch_page, url, next_page, page_size, params)))
+        next_page += 1
+
+    try:
+        schedule()
+        while in_flight:
+            page, future = in_flight.popleft()
+            try:
+                items, has_next = future.result()
+            except requests.exceptions.RequestException as e:
+                if raise_errors:
+                    raise
+                logger.error("Failed to fetch page %d of %s: %s", page, url, e)
+                return
+
+            if has_next:
+                # Keep the look-ahead window full
+                while len(in_flight) < max(1, parallel):
+                    schedule()
+            if items:
+                yield page, items
+            if not has_next or not items:
+                return
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
 
-        if response.status_code != 200:
-            break
 
-        data_chunk = response.json().get("data", [])
-        if not data_chunk:
-            break
+def paginated_fetch(url: str, page_size: int = 100, parallel: int = 1,
+                    params: dict | None = None):
+    """
+    Generator function to fetch paginated data from APIs.
+
+    Follows RecruitCRM's ``next_page_url`` and prefetches the next page(s)
+    in the background (see ``iter_pages``).
 
-        yield from data_chunk
-        page += 1
+    Args:
+        url: The API endpoint URL (absolute or relative to the RecruitCRM base)
+        page_size: Number of items per page (default: 100)
+        parallel: Pages fetched ahead in parallel (default: 1)
+        params: Extra query parameters (e.g. sorting)
+
+    Yields:
+        Individual items from the paginated response
+    """
+    for _, items in iter_pages(url, page_size, parallel, params=params):
+        yield from items
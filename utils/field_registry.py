@@ -0,0 +1,319 @@
+"""
+Declarative field mapping shared by all mappers.
+
+Each ``Field`` row describes one form input and where it lives upstream:
+
+- ``crm``:        RecruitCRM custom field name
+- ``crm_attr``:   RecruitCRM standard candidate attribute
+- ``load_as``:    key ``recruit_to_form`` emits, if it differs from ``form``
+- ``multi``:      multi-value input, joined with ", " for RecruitCRM
+- ``airtable_sales`` / ``airtable_med``: Airtable column per table
+- ``pdf_sales`` / ``pdf_med``:          PDFMonkey payload key per template
+
+View columns take either a target key or ``(key, default)``. ``form`` may
+also be a function of the whole form for derived values.
+
+The table is compiled once at import into per-direction converters; the
+mapper modules are thin views over them.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class Field:
+    form: str | Callable | None
+    crm: str | None = None
+    crm_attr: str | None = None
+    load_as: str | None = None
+    load_from: str | None = None      # "crm" or "attr" when both are set
+    load: bool = True                 # include in recruit_to_form
+    save: bool = True                 # include in the RecruitCRM update
+    multi: bool = False
+    crm_default: Any = None           # default for both RecruitCRM directions
+    to_crm: Callable | None = None
+    from_crm: Callable | None = None
+    airtable_sales: str | tuple | None = None
+    airtable_med: str | tuple | None = None
+    pdf_sales: str | tuple | None = None
+    pdf_med: str | tuple | None = None
+
+
+# ---------------------------------------------------------------------------
+# Value conversions
+# ---------------------------------------------------------------------------
+
+def _contact_number(value):
+    return int(value) if value and value.isdigit() else None
+
+
+def _gender_id(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 3  # Default gender ID
+
+
+def _resume_link(value):
+    return value.get("file_link") if isinstance(value, dict) else None
+
+
+def _arbeitsort(form):
+    return form.get("arbeitgeber_standort") or form.get("wohnort")
+
+
+def _arbeitsort_med_pdf(form):
+    return form.get("arbeitgeber_standort", form.get("wohnort", ""))
+
+
+def _wunscharbeitsort(form):
+    return form.get("wunscharbeitsort", form.get("locality", "Nicht angegeben"))
+
+
+def _geschlecht_text(form):
+    return "Weiblich" if form.get("geschlecht") == "1" else "Männlich"
+
+
+NA = "Nicht angegeben"
+
+# ---------------------------------------------------------------------------
+# Mapping table
+# ---------------------------------------------------------------------------
+
+FIELDS = (
+    # ----- Standardfelder ----- #
+    Field("vorname", crm_attr="first_name",
+          airtable_sales="vorname", airtable_med="vorname",
+          pdf_sales="vorname", pdf_med=("vorname", "")),
+    Field("nachname", crm_attr="last_name",
+          airtable_sales="nachname", airtable_med="nachname",
+          pdf_sales="nachname", pdf_med=("nachname", "")),
+    Field("avatar", crm_attr="avatar", save=False,
+          airtable_sales="foto_url", airtable_med="foto_url",
+          pdf_sales="foto_url", pdf_med=("foto_url", "")),
+    Field("email", crm_attr="email",
+          airtable_sales="email", airtable_med="email",
+          pdf_sales="email", pdf_med=("email", "")),
+    Field("phone", crm_attr="contact_number", load_as="telefon",
+          to_crm=_contact_number,
+          airtable_sales="telefon", airtable_med="telefon",
+          pdf_sales="telefon", pdf_med=("telefon", "")),
+    Field("geschlecht", crm_attr="gender_id", to_crm=_gender_id),
+    Field("wohnort", crm="Wohnort (Stadt)", crm_attr="city", load_from="crm",
+          airtable_med="wohnort",
+          pdf_sales="wohnort", pdf_med=("wohnort", "")),
+    Field("arbeitgeber_name", crm="Aktueller Arbeitgeber",
+          crm_attr="current_organization", load_from="attr",
+          airtable_sales="aktuelle_organisation", airtable_med="aktuelle_organisation",
+          pdf_sales="aktuelle_organisation", pdf_med=("aktuelle_organisation", "")),
+    Field("slug", crm_attr="slug"),
+    Field("consultant", crm_attr="owner", from_crm=str),
+    Field("cv_link", crm_attr="resume", to_crm=lambda value: value or None,
+          from_crm=_resume_link),
+    Field("xing_link", crm_attr="xing", load_as="xing"),
+    Field("linkedin_link", crm_attr="linkedin", load_as="linkedin"),
+    Field("aktuelle_position", crm="Aktuelle Position", crm_attr="position",
+          load_from="attr",
+          airtable_sales="aktuelle_position", airtable_med="aktuelle_position",
+          pdf_sales="aktuelle_position", pdf_med=("aktuelle_position", "")),
+    Field("current_salary", crm_attr="current_salary",
+          airtable_sales="aktuelles_gehalt", airtable_med="aktuelles_gehalt"),
+    Field("expected_salary", crm_attr="salary_expectation",
+          airtable_sales="wunschgehalt", airtable_med="wunschgehalt"),
+    Field("current_salary_display",
+          pdf_sales="aktuelles_gehalt", pdf_med=("aktuelles_gehalt", NA)),
+    Field("expected_salary_display",
+          pdf_sales="wunschgehalt", pdf_med=("wunschgehalt", NA)),
+    Field("berufserfahrung_in_jahren", crm_attr="work_ex_year", crm_default=0,
+          airtable_sales="berufliche_erfahrung", airtable_med="berufliche_erfahrung",
+          pdf_sales=("berufserfahrung", "0"),
+          pdf_med=("berufserfahrung_in_jahren", "0")),
+
+    # ----- Custom Fields ----- #
+    Field("branche", crm="Branche",
+          airtable_sales="fachbereich_aktuell", pdf_sales="branche"),
+    Field("kuendigungsfrist", crm="Kündigungsfrist", crm_attr="notice_period",
+          load_from="crm",
+          airtable_sales="kuendigungsfrist", airtable_med="kuendigungsfrist",
+          pdf_sales="kuendigungsfrist", pdf_med=("kuendigungsfrist", NA)),
+    Field("anstellungsart", crm="Aktuelle Anstellungsart"),
+    Field("zusatzqualifikation", crm="Zusatzqualifikation"),
+    Field("zusatzbezeichnungen[]", crm="Zusatzbezeichnungen", multi=True),
+    Field("wechselmotivation", crm="Wechselmotivation", pdf_sales="wechselmotiv"),
+    Field("bonus_amount", crm="Bonushöhe"),
+    Field("bonus_type", crm="Bonustyp"),
+    Field("gehalt_erhoehen", crm="Soll das Gehalt erhöht werden?"),
+    Field("key_clients", crm="Offen für unsere Key-Clients?"),
+    Field("nicht_an", crm="Blacklist: Bitte nicht an diese Unternehmen"),
+    Field("soll_auf_jeden_fall",
+          crm="Whitelist: An wen soll der Kandidat auf jeden Fall geschickt werden?"),
+    Field("aufhebungsvertrag_wahrscheinlichkeit",
+          crm="Wahrscheinlichkeit auf einen Aufhebungsvertrag"),
+    Field("verfuegbar_ab", crm="Ab wann wäre der Kandidat verfügbar?",
+          crm_attr="available_from", load_from="crm",
+          airtable_sales="verfuegbar_ab", airtable_med="verfuegbar_ab",
+          pdf_sales="verfuegbar_ab", pdf_med=("verfuegbar_ab", "")),
+    Field("arbeitgeber_standort", crm="Arbeitsort (Standort)"),
+    Field("additional_benefits", crm="Zusatzleistungen (aktuell)"),
+    Field("interview_schwerpunkte", crm="Interview-Notes Schwerpunkte"),
+    Field("unternehmen_wahl", crm="Gewünschter Unternehmenstyp", load=False),
+    Field("aktiv_suche", crm="Ist der Kandidat aktiv auf der Suche?"),
+    Field("aktiv_bewerbung", crm="Ist der Kandidat aktiv in Bewerbungsprozessen?"),
+    Field("weitere_personalvermittlungen",
+          crm="Arbeitet der Kandidat mit weiteren Personalvermittlungen zusammen?"),
+    Field("cv_submission_deadline", crm="CV wird zugeschickt bis zum"),
+    Field("arbeitgeber_art", crm="Art des Arbeitgebers"),
+    Field("kategorie", crm="Wunsch Job Fachbereich", multi=True,
+          airtable_med="fachbereich_wunsch", pdf_med=("fachbereich_wunsch", NA)),
+    Field("aktuelle_fachbereich", crm="Aktuelle Kategorie (Fachbereich)", multi=True),
+    Field("aktuelle_fachbereiche",
+          airtable_med="fachbereich_aktuell", pdf_med="fachbereich_aktuell"),
+    Field("verkehrsmittel", crm="Welches Verkehrsmittel wird genutzt?"),
+    Field("home_office_aktuell", crm="Home-Office (aktuell)",
+          pdf_sales="homeoffice_aktuell"),
+    Field("home_office_gewuenscht", crm="Home-Office (gewünscht)",
+          pdf_sales="homeoffice_wunsch"),
+    Field("flexible_arbeitszeiten", crm="Wunsch Flexible Arbeitszeiten?"),
+    Field("current_process", crm="Aktueller Prozess (IV-Notizen)"),
+    Field("erreichbare_stadtname", crm="Erreichbare Städte", crm_attr="locality",
+          load_from="crm"),
+    Field("berufliche_erfahrung", crm="Aktuelle Berufliche Lage des Kandidaten",
+          pdf_med=("berufliche_erfahrung", NA)),
+    Field("wohnort_plz", crm="Wohnort (PLZ)"),
+    Field("radius", crm="Pendelbarer Radius (in km)"),
+    Field("wuensche_an_den_job", crm="Wuensche am neuen Job",
+          airtable_sales="wuensche_an_den_neuen_job",
+          pdf_med=("wuensche_an_den_neuen_job", NA)),
+
+    # ----- Newly Added Custom Fields ----- #
+    Field("umzugsbereit[]", crm="Umzugsbereit", multi=True, load_as="umzugsbereit",
+          airtable_sales="umzugsbereitschaft",
+          pdf_sales="umzugsbereitschaft", pdf_med=("umzugsbereitschaft", "Nein")),
+    Field("relevante_berufserfahrung", crm="Relevante Berufserfahrung",
+          pdf_sales=("vertriebs_erfahrung", "Keine Angaben")),
+    Field("berufliche_ziele", crm="Berufliche Ziele",
+          airtable_med="berufliche_ziele", pdf_sales="berufliche_ziele"),
+    Field("private_ziele", crm="Private Ziele",
+          airtable_med="private_ziele", pdf_sales="private_ziele"),
+    Field("sonstiges", crm="Sonstiges",
+          airtable_sales="sonstiges", airtable_med="sonstiges",
+          pdf_sales="sonstiges", pdf_med=("sonstiges", "Keine Bemerkungen")),
+    Field("umgang_mit_rueckschlaegen", crm="Umgang mit Rückschlägen",
+          pdf_sales="umgang_rueckschlaege"),
+    Field("weiterentwicklung", crm="Weiterentwicklung", pdf_sales="weiterentwicklung"),
+    Field("finanzielle_motivation", crm="Finanzielle Motivation",
+          pdf_sales="finanzielle_motivation"),
+    Field("erfolgsmethodik_kpis", crm="Erfolgsmethodik & KPIs",
+          pdf_sales="erfolgsmethodik"),
+    Field("wechselkommitment", crm="Wechselkommitment (von 1-10)",
+          airtable_sales="wechselkommitment", airtable_med="wechselkommitment",
+          pdf_sales=("wechselkommitment", "Nein"),
+          pdf_med=("wechselkommitment", "0")),
+    Field("wunschklinik", crm="Wunschklinik", pdf_med=("wunschklinik", NA)),
+
+    # ----- PDF links written back after rendering ----- #
+    Field("auswertung", crm="Extras (Interview-Notes)", load_as="job_extras"),
+    Field("anonym_auswertung", crm="Anonyme Auswertung", load=False),
+
+    # ----- Derived values ----- #
+    Field(_arbeitsort, airtable_sales="arbeitsort", airtable_med="arbeitsort",
+          pdf_sales="arbeitsort"),
+    Field(_arbeitsort_med_pdf, pdf_med="arbeitsort"),
+    Field(_wunscharbeitsort, pdf_med="wunscharbeitsort"),
+    Field(_geschlecht_text, airtable_med="geschlecht", pdf_med="geschlecht"),
+)
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+def _form_getter(source, default=None, multi=False):
+    """Build a ``getter(form)`` for a form key or derived-value function."""
+    if callable(source):
+        return source
+    if multi:
+        def join_multi(form):
+            if hasattr(form, "getlist"):
+                values = form.getlist(source)
+            else:
+                values = [form[source]] if form.get(source) is not None else []
+            return ", ".join(values).strip() or None
+        return join_multi
+    if default is None:
+        return lambda form: form.get(source)
+    return lambda form: form.get(source, default)
+
+
+def _compile_view(column: str) -> tuple:
+    """Compile a form → payload view into ``((target_key, getter), …)``."""
+    view = []
+    for field in FIELDS:
+        target = getattr(field, column)
+        if target is None:
+            continue
+        key, default = target if isinstance(target, tuple) else (target, None)
+        view.append((key, _form_getter(field.form, default)))
+    return tuple(view)
+
+
+def _compile_crm_attrs() -> tuple:
+    view = []
+    for field in FIELDS:
+        if not field.crm_attr or not field.save:
+            continue
+        getter = _form_getter(field.form, field.crm_default)
+        if field.to_crm:
+            getter = (lambda get, convert: lambda form: convert(get(form)))(
+                getter, field.to_crm)
+        view.append((field.crm_attr, getter))
+    return tuple(view)
+
+
+def _compile_crm_custom() -> tuple:
+    return tuple(
+        (field.crm, _form_getter(field.form, multi=field.multi))
+        for field in FIELDS
+        if field.crm and field.save
+    )
+
+
+def _compile_load() -> tuple:
+    view = []
+    for field in FIELDS:
+        if not field.load or not isinstance(field.form, str):
+            continue
+        source = field.load_from or ("crm" if field.crm else "attr")
+        if source == "crm" and field.crm:
+            name = field.crm
+            getter = (lambda name: lambda raw, cf: cf.get(name))(name)
+        elif field.crm_attr:
+            attr, default, convert = field.crm_attr, field.crm_default, field.from_crm
+            getter = (lambda attr, default, convert:
+                      lambda raw, cf: convert(raw.get(attr, default)) if convert
+                      else raw.get(attr, default))(attr, default, convert)
+        else:
+            continue
+        view.append((field.load_as or field.form, getter))
+    return tuple(view)
+
+
+AIRTABLE_SALES_VIEW = _compile_view("airtable_sales")
+AIRTABLE_MED_VIEW = _compile_view("airtable_med")
+PDF_SALES_VIEW = _compile_view("pdf_sales")
+PDF_MED_VIEW = _compile_view("pdf_med")
+CRM_ATTR_VIEW = _compile_crm_attrs()
+CRM_CUSTOM_FIELDS = _compile_crm_custom()
+LOAD_VIEW = _compile_load()
+
+
+def apply_view(view: tuple, form) -> dict:
+    """Run a compiled form → payload view."""
+    return {key: getter(form) for key, getter in view}
+
+
+def load_candidate(raw: dict) -> dict:
+    """Run the compiled RecruitCRM → form view."""
+    cf = {f["field_name"]: f["value"] for f in raw.get("custom_fields", [])}
+    return {key: getter(raw, cf) for key, getter in LOAD_VIEW}
@@ -0,0 +1,274 @@
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import metrics
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.rate_limit import TokenBucket, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Upstream configuration. API keys are read when a session is first created,
+# i.e. after app.py has run load_dotenv().
+UPSTREAMS = {
+    "recruitcrm": {
+        "base_url": os.getenv("RECRUITCRM_BASE_URL", "https://api.recruitcrm.io/v1"),
+        "api_key_env": "RECRUITCRM_API_KEY",
+        "timeout": (5, 20),
+        # RecruitCRM allows 60 requests per minute per API token
+        "rate": float(os.getenv("RECRUITCRM_RATE_LIMIT", "1")),
+        "burst": int(os.getenv("RECRUITCRM_RATE_BURST", "10")),
+    },
+    "airtable": {
+        "base_url": os.getenv("AIRTABLE_BASE_URL", "https://api.airtable.com/v0"),
+        "api_key_env": "AIRTABLE_API_KEY",
+        "timeout": (5, 20),
+        # Airtable allows 5 requests per second per base
+        "rate": float(os.getenv("AIRTABLE_RATE_LIMIT", "5")),
+        "burst": int(os.getenv("AIRTABLE_RATE_BURST", "1")),
+    },
+    "pdfmonkey": {
+        "base_url": os.getenv("PDFMONKEY_BASE_URL", "https://api.pdfmonkey.io/api/v1"),
+        "api_key_env": "MONKEYPDF_API_KEY",
+        "timeout": (5, 30),
+        # No fixed quota is published: the limit is learned from the first 429
+        "rate": float(os.getenv("PDFMONKEY_RATE_LIMIT", "0")),
+        "burst": int(os.getenv("PDFMONKEY_RATE_BURST", "10")),
+    },
+}
+
+# Keep-alive connections per upstream host; sized for the upstream worker pool
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+# Retries for idempotent requests (GET/HEAD/PUT/DELETE/…) on connection
+# errors and transient 5xx responses, with exponential backoff
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))
+# Upstream "rate" is requests per second (0: none until the first 429, then
+# the send rate observed up to it) and "burst" the requests that may go out
+# back to back.
+# Any request answered with 429 is queued and re-sent this many times,
+# after Retry-After or, if the upstream sends none, exponential backoff
+RATE_LIMIT_RETRIES = int(os.getenv("HTTP_RATE_LIMIT_RETRIES", "5"))
+RATE_LIMIT_BACKOFF = float(os.getenv("HTTP_RATE_LIMIT_BACKOFF", "1.0"))
+
+# Circuit breaker: once this share of the last CIRCUIT_WINDOW calls (at
+# least CIRCUIT_MIN_CALLS) failed with a transport error or 5xx, calls fail
+# fast for CIRCUIT_OPEN_SECONDS before a single trial call is let through
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+
+_sessions: dict[str, "UpstreamSession"] = {}
+_sessions_lock = threading.Lock()
+_limiters: dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> TokenBucket:
+    """
+    Return the token bucket every call to an upstream passes through.
+
+    Shared by the sync sessions and the async clients.
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                config = UPSTREAMS[name]
+                limiter = _limiters[name] = TokenBucket(config["rate"], config["burst"])
+    return limiter
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the circuit breaker guarding an upstream.
+
+    Shared by the sync sessions and the async clients.
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(
+                    name,
+                    failure_rate=CIRCUIT_FAILURE_RATE,
+                    window=CIRCUIT_WINDOW,
+                    min_calls=CIRCUIT_MIN_CALLS,
+                    open_seconds=CIRCUIT_OPEN_SECONDS,
+                )
+                breaker.on_open = _circuit_opened
+    return breaker
+
+
+def _circuit_opened(name: str):
+    metrics.CIRCUIT_OPENED.inc(name)
+    logger.warning("%s circuit opened, failing fast for %.0fs",
+                   name, CIRCUIT_OPEN_SECONDS)
+
+
+def admit(name: str) -> CircuitBreaker:
+    """
+    Check an upstream's circuit before calling it.
+
+    Returns:
+        The breaker, to record the call's outcome on
+
+    Raises:
+        CircuitOpenError: If the upstream is known to be down
+    """
+    breaker = get_circuit_breaker(name)
+    try:
+        breaker.before_call()
+    except CircuitOpenError:
+        metrics.CIRCUIT_REJECTED.inc(name)
+        raise
+    return breaker
+
+
+def is_unavailable_error(error: Exception) -> bool:
+    """
+    Whether a failed call means the upstream is down rather than that it
+    rejected the request.
+
+    Connection errors, timeouts, an open circuit and 5xx/429 responses are
+    worth retrying later; other HTTP errors (4xx) will fail the same way
+    every time.
+    """
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, (requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout))
+
+
+def rate_limit_delay(response, attempt: int) -> float:
+    """Seconds to back off after a 429 (``Retry-After`` or exponential)."""
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None:
+        return retry_after
+    return RATE_LIMIT_BACKOFF * (2 ** attempt)
+
+
+class UpstreamSession(requests.Session):
+    """
+    Persistent session for one upstream API.
+
+    Adds the bearer token, resolves relative URLs against the upstream's
+    base URL and applies a default timeout to every request. Requests wait
+    for the upstream's rate limiter and are re-sent after a 429; they fail
+    fast with ``CircuitOpenError`` while the upstream's circuit is open.
+    """
+
+    def __init__(self, name: str, base_url: str, api_key: str | None, timeout):
+        super().__init__()
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Accept": "application/json",
+        })
+
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        if not url.startswith(("http://", "https://")):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        kwargs.setdefault("timeout", self.timeout)
+
+        method = method.upper()
+        breaker = admit(self.name)
+        try:
+            response = self._request_limited(method, url, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _request_limited(self, method, url, **kwargs):
+        limiter = get_rate_limiter(self.name)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            wait = limiter.reserve()
+            metrics.UPSTREAM_QUEUE_WAIT.observe(wait, self.name)
+            if wait > 0:
+                time.sleep(wait)
+            # A 429 seen by another caller while we waited pauses us too
+            while (pause := limiter.paused_for()) > 0:
+                time.sleep(pause)
+
+            response = self._send(method, url, **kwargs)
+            if response.status_code != 429:
+                limiter.recover()
+                return response
+
+            metrics.UPSTREAM_RATE_LIMITED.inc(self.name)
+            limiter.throttle(rate_limit_delay(response, attempt))
+            if attempt < RATE_LIMIT_RETRIES:
+                response.close()
+        return response
+
+    def _send(self, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, **kwargs)
+        except requests.RequestException:
+            metrics.UPSTREAM_REQUESTS.inc(self.name, method, "error")
+            raise
+        finally:
+            metrics.UPSTREAM_LATENCY.observe(
+                time.perf_counter() - started, self.name, method)
+
+        metrics.UPSTREAM_REQUESTS.inc(self.name, method, str(response.status_code))
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            metrics.UPSTREAM_RETRIES.inc(self.name, amount=len(retries.history))
+        return response
+
+
+def get_session(name: str) -> UpstreamSession:
+    """
+    Return the shared session for an upstream, creating it on first use.
+
+    Args:
+        name: One of "recruitcrm", "airtable" or "pdfmonkey"
+
+    Returns:
+        Thread-shared UpstreamSession with pooled keep-alive connections
+    """
+    session = _sessions.get(name)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(name)
+            if session is None:
+                config = UPSTREAMS[name]
+                session = UpstreamSession(
+                    name,
+                    config["base_url"],
+                    os.getenv(config["api_key_env"]),
+                    config["timeout"],
+                )
+                _sessions[name] = session
+    return session
@@ -0,0 +1,92 @@
+import json
+import threading
+from collections import defaultdict
+
+# Job states after which a job records no further stages
+FINAL_STATUSES = ("succeeded", "failed")
+
+
+class JobEventBroker:
+    """
+    In-process notifications about job changes.
+
+    Subscribers register a callable per job id and are woken whenever the
+    job reports a stage or changes status. Callbacks carry no data: they
+    only signal that the job record is worth re-reading, so the database
+    stays the single source of truth and missed wake-ups cost nothing.
+    Callbacks run on the publishing thread and must not block; async
+    subscribers pass ``lambda: loop.call_soon_threadsafe(event.set)``.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: str, wake):
+        """
+        Call ``wake()`` on every change of the job.
+
+        Returns:
+            Function removing the subscription again
+        """
+        with self._lock:
+            self._subscribers[job_id].add(wake)
+
+        def unsubscribe():
+            with self._lock:
+                subscribers = self._subscribers.get(job_id)
+                if subscribers is not None:
+                    subscribers.discard(wake)
+                    if not subscribers:
+                        del self._subscribers[job_id]
+        return unsubscribe
+
+    def publish(self, job_id: str):
+        """Wake every subscriber of the job."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for wake in subscribers:
+            wake()
+
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions over all jobs."""
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def format_sse(event: str, data, event_id: int | None = None) -> str:
+    """Encode one Server-Sent Event."""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def job_sse_events(job: dict, sent: int) -> tuple[list[str], bool]:
+    """
+    Turn the not yet sent part of a job record into SSE messages.
+
+    Every reported stage becomes an event named after the stage, with its
+    details as data and its position as id, so a reconnecting
+    ``EventSource`` resumes after its ``Last-Event-ID``. Once the job has
+    finished, a final "succeeded" or "failed" event carries the result or
+    error.
+
+    Args:
+        job: Job record as returned by ``JobQueue.get``
+        sent: Number of events already sent (the last event id)
+
+    Returns:
+        (messages, finished)
+    """
+    messages = [format_sse(stage["stage"], stage, event_id)
+                for event_id, stage in enumerate(job["stages"], start=1)
+                if event_id > sent]
+
+    finished = job["status"] in FINAL_STATUSES
+    if finished:
+        messages.append(format_sse(job["status"], {
+            "status": job["status"],
+            "result": job["result"],
+            "error": job["error"],
+        }, len(job["stages"]) + 1))
+    return messages, finished
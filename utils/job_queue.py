@@ -0,0 +1,367 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    stage       TEXT,
+    stages      TEXT NOT NULL DEFAULT '[]',
+    payload     TEXT NOT NULL,
+    result      TEXT,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+# Columns added after the first release, created on existing databases
+MIGRATIONS = {
+    "run_after": "ALTER TABLE jobs ADD COLUMN run_after REAL NOT NULL DEFAULT 0",
+    "attempts": "ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+    "lease_until": "ALTER TABLE jobs ADD COLUMN lease_until REAL NOT NULL DEFAULT 0",
+    "reclaims": "ALTER TABLE jobs ADD COLUMN reclaims INTEGER NOT NULL DEFAULT 0",
+}
+
+# A running job's lease is renewed every LEASE_SECONDS / 3 by the process
+# running it; once it has expired (process crashed or was restarted) the
+# job is queued again, at most MAX_RECLAIMS times before it is failed
+LEASE_SECONDS = 60
+MAX_RECLAIMS = 3
+
+
+class RetryLater(Exception):
+    """Raised by a handler to run the job again after ``delay`` seconds."""
+
+    def __init__(self, message: str, delay: float):
+        super().__init__(message)
+        self.delay = delay
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue with an in-process worker pool.
+
+    Jobs are persisted before they are handed to a worker, so a restart
+    picks up everything that was still queued. Workers claim a job with a
+    conditional UPDATE, which keeps several processes sharing the same
+    database file from running a job twice. A claimed job holds a lease
+    that its process keeps renewing; jobs whose lease expired because
+    their process died are queued again by whichever process notices.
+
+    Constructing a queue only prepares the database. ``start()`` resumes
+    persisted jobs and begins reclaiming expired leases; it is left to the
+    serving process, so CLI commands and tools importing the app neither
+    run nor take over other processes' jobs. Jobs enqueued without
+    ``start()`` still run and keep their own leases alive.
+
+    Handlers are called as ``handler(payload, report)`` where
+    ``report(stage, **details)`` records progress; their return value is
+    stored as the job result. A handler raising ``RetryLater`` puts the job
+    back in the queue to run again after the given delay.
+
+    ``on_change(job_id)`` is called after every stage or status change,
+    e.g. to wake progress streams watching the job.
+    """
+
+    def __init__(self, db_path: str, handlers: dict, max_workers: int = 4,
+                 on_change=None, lease_seconds: float = LEASE_SECONDS):
+        self.db_path = db_path
+        self.handlers = handlers
+        self.on_change = on_change
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._running: set[str] = set()
+        self._running_lock = threading.Lock()
+        self._started = False
+        self._renewer = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job")
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def start(self):
+        """
+        Resume persisted jobs and watch for expired leases. Safe to call
+        more than once.
+        """
+        with self._running_lock:
+            if self._started:
+                return
+            self._started = True
+
+        # Reclaimed jobs are queued again and resumed with the others
+        self._reclaim_expired()
+        self._resume_queued()
+        self._ensure_renewer()
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        """
+        Persist a new job and schedule it on the worker pool.
+
+        Args:
+            kind: Handler name registered in ``handlers``
+            payload: JSON-serialisable job input
+
+        Returns:
+            The new job id
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now)
+            )
+
+        self._schedule(job_id)
+        return job_id
+
+    def get(self, job_id: str) -> dict | None:
+        """
+        Look up a job for status reporting.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job dictionary (without the input payload) or None if unknown
+        """
+        row = self._connect().execute(
+            "SELECT id, kind, status, stage, stages, result, error, attempts, run_after, "
+            "created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if not row:
+            return None
+
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "stage": row["stage"],
+            "stages": json.loads(row["stages"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "run_after": row["run_after"] or None,
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    # ------------------------------------------------------------------ #
+    # Worker side
+    # ------------------------------------------------------------------ #
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the job database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _resume_queued(self):
+        """Reschedule jobs left in the queue by a previous process."""
+        rows = self._connect().execute(
+            "SELECT id, run_after FROM jobs WHERE status = 'queued' ORDER BY created_at"
+        ).fetchall()
+        for row in rows:
+            self._schedule(row["id"], row["run_after"] - time.time())
+
+    def _reclaim_expired(self) -> list[str]:
+        """
+        Queue running jobs whose lease expired again, or fail them after
+        ``MAX_RECLAIMS`` attempts.
+
+        Returns:
+            Ids of the jobs put back in the queue
+        """
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, reclaims FROM jobs WHERE status = 'running' AND lease_until < ?",
+                (now,)
+            ).fetchall()
+
+        requeued = []
+        for row in rows:
+            job_id = row["id"]
+            if row["reclaims"] >= MAX_RECLAIMS:
+                error = "Worker lost while running the job"
+                with self._connect() as conn:
+                    updated = conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? "
+                        "WHERE id = ? AND status = 'running' AND lease_until < ?",
+                        (error, now, job_id, now)
+                    ).rowcount
+                if updated:
+                    logger.error("Job %s failed: %s", job_id, error)
+                    self._changed(job_id)
+                continue
+
+            # Conditional, so only one process requeues a given job
+            with self._connect() as conn:
+                updated = conn.execute(
+                    "UPDATE jobs SET status = 'queued', run_after = 0, "
+                    "reclaims = reclaims + 1, updated_at = ? "
+                    "WHERE id = ? AND status = 'running' AND lease_until < ?",
+                    (now, job_id, now)
+                ).rowcount
+            if updated:
+                logger.warning("Job %s lost its worker, queued again", job_id)
+                self._report(job_id, "requeued", reason="lease expired")
+                requeued.append(job_id)
+        return requeued
+
+    def _ensure_renewer(self):
+        """Start the lease renewal thread if it is not running yet."""
+        with self._running_lock:
+            if self._renewer is not None:
+                return
+            self._renewer = threading.Thread(
+                target=self._renew_leases, name="job-leases", daemon=True)
+        self._renewer.start()
+
+    def _renew_leases(self):
+        """
+        Keep the leases of this process's jobs alive; once started, also
+        pick up jobs lost by other processes.
+        """
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            try:
+                with self._running_lock:
+                    running = list(self._running)
+                if running:
+                    with self._connect() as conn:
+                        conn.executemany(
+                            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running'",
+                            [(time.time() + self.lease_seconds, job_id) for job_id in running]
+                        )
+                if self._started:
+                    for job_id in self._reclaim_expired():
+                        self._schedule(job_id)
+            except sqlite3.Error as e:
+                logger.error("Renewing job leases failed: %s", e)
+
+    def _schedule(self, job_id: str, delay: float = 0):
+        """Hand a queued job to the worker pool, after ``delay`` seconds."""
+        if delay <= 0:
+            self._executor.submit(self._run, job_id)
+            return
+        timer = threading.Timer(delay, self._executor.submit, args=(self._run, job_id))
+        timer.daemon = True
+        timer.start()
+
+    def _retry(self, job_id: str, delay: float, error: str):
+        """Put a job back in the queue to run again after ``delay`` seconds."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, run_after = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (error, now + delay, now, job_id)
+            )
+        self._changed(job_id)
+        self._schedule(job_id, delay)
+
+    def _changed(self, job_id: str):
+        if self.on_change:
+            self.on_change(job_id)
+
+    def _claim(self, job_id: str) -> sqlite3.Row | None:
+        """Atomically move a job from queued to running."""
+        with self._connect() as conn:
+            now = time.time()
+            claimed = conn.execute(
+                "UPDATE jobs SET status = 'running', lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (now + self.lease_seconds, now, job_id)
+            ).rowcount
+        if not claimed:
+            return None
+        self._changed(job_id)
+
+        return self._connect().execute(
+            "SELECT kind, payload FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+
+    def _report(self, job_id: str, stage: str, **details):
+        """Append a progress stage to the job record."""
+        event = {"stage": stage, "at": time.time(), **details}
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT stages FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            stages = json.loads(row["stages"]) + [event]
+            conn.execute(
+                "UPDATE jobs SET stage = ?, stages = ?, updated_at = ? WHERE id = ?",
+                (stage, json.dumps(stages), event["at"], job_id)
+            )
+        self._changed(job_id)
+
+    def _finish(self, job_id: str, status: str, result=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None,
+                 error, time.time(), job_id)
+            )
+        self._changed(job_id)
+
+    def _run(self, job_id: str):
+        job = self._claim(job_id)
+        if job is None:
+            return
+        with self._running_lock:
+            self._running.add(job_id)
+        self._ensure_renewer()
+
+        report_lock = threading.Lock()
+
+        def report(stage, **details):
+            # Handlers may report from several threads at once
+            with report_lock:
+                self._report(job_id, stage, **details)
+
+        try:
+            handler = self.handlers[job["kind"]]
+            result = handler(json.loads(job["payload"]), report)
+        except RetryLater as e:
+            logger.info("Job %s retrying in %.0fs: %s", job_id, e.delay, e)
+            report("retry_scheduled", delay=e.delay, reason=str(e))
+            self._retry(job_id, e.delay, str(e))
+        except Exception as e:
+            logger.exception("Job %s failed: %s", job_id, e)
+            self._finish(job_id, "failed", error=str(e))
+        else:
+            logger.info("Job %s finished", job_id)
+            self._finish(job_id, "succeeded", result=result)
+        finally:
+            with self._running_lock:
+                self._running.discard(job_id)
@@ -0,0 +1,149 @@
+import bisect
+import threading
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers fast mirror hits up to full PDF renders
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra="") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+        _registry.append(self)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_series(items))
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def _render_series(self, items):
+        return [f"{self.name}{_format_labels(self.labels, key)} {value}"
+                for key, value in items]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution with sum and count, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [
+                    [0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _render_series(self, items):
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# Application metrics
+# ============================================================================
+
+UPSTREAM_LATENCY = Histogram(
+    "emploio_upstream_request_duration_seconds",
+    "Outbound API call duration, including retries.",
+    ("upstream", "method"))
+UPSTREAM_REQUESTS = Counter(
+    "emploio_upstream_requests_total",
+    "Outbound API calls by final status code (\"error\" if none).",
+    ("upstream", "method", "status"))
+UPSTREAM_RETRIES = Counter(
+    "emploio_upstream_retries_total",
+    "Outbound API call retries.",
+    ("upstream",))
+UPSTREAM_RATE_LIMITED = Counter(
+    "emploio_upstream_rate_limited_total",
+    "Outbound API calls answered with 429.",
+    ("upstream",))
+UPSTREAM_QUEUE_WAIT = Histogram(
+    "emploio_upstream_queue_wait_seconds",
+    "Time outbound calls waited for the upstream's rate limiter.",
+    ("upstream",),
+    buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+
+ROUTE_LATENCY = Histogram(
+    "emploio_http_request_duration_seconds",
+    "Route handling duration.",
+    ("route", "method"))
+ROUTE_REQUESTS = Counter(
+    "emploio_http_requests_total",
+    "Handled requests by status code.",
+    ("route", "method", "status"))
+
+PDF_POLL_ITERATIONS = Histogram(
+    "emploio_pdf_poll_iterations",
+    "PDFMonkey status checks per document until it finished.",
+    ("result",),
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16))
+
+CIRCUIT_OPENED = Counter(
+    "emploio_circuit_opened_total",
+    "Times an upstream's circuit breaker opened.",
+    ("upstream",))
+CIRCUIT_REJECTED = Counter(
+    "emploio_circuit_rejected_total",
+    "Outbound API calls failed fast because the circuit was open.",
+    ("upstream",))
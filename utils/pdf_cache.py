@@ -0,0 +1,95 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_cache (
+    key           TEXT PRIMARY KEY,
+    template_id   TEXT NOT NULL,
+    share_link    TEXT NOT NULL,
+    created_at    REAL NOT NULL,
+    last_used_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pdf_cache_last_used ON pdf_cache (last_used_at);
+"""
+
+
+def payload_key(template_id: str, payload: dict) -> str:
+    """Content address of a render: template id + canonical JSON of the payload."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"),
+                           ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{template_id}\n{canonical}".encode()).hexdigest()
+
+
+class PdfCache:
+    """
+    Persistent cache of finished PDFMonkey documents by content address.
+
+    An identical re-submit reuses the earlier share link instead of
+    rendering (and paying for) a new document. Entries expire after
+    ``max_age`` seconds and the least recently used ones are evicted
+    beyond ``max_entries``.
+    """
+
+    def __init__(self, db_path: str, max_age: float, max_entries: int):
+        self.db_path = db_path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the cache database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, template_id: str, payload: dict) -> str | None:
+        """
+        Look up the share link of an identical earlier render.
+
+        Returns:
+            Public share link or None on a miss / expired entry
+        """
+        key = payload_key(template_id, payload)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT share_link, created_at FROM pdf_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if not row:
+                return None
+            if now - row["created_at"] > self.max_age:
+                conn.execute("DELETE FROM pdf_cache WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE pdf_cache SET last_used_at = ? WHERE key = ?", (now, key))
+        return row["share_link"]
+
+    def put(self, template_id: str, payload: dict, share_link: str):
+        """Remember a finished render and evict old entries."""
+        key = payload_key(template_id, payload)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pdf_cache "
+                "(key, template_id, share_link, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, template_id, share_link, now, now)
+            )
+            conn.execute(
+                "DELETE FROM pdf_cache WHERE created_at < ?", (now - self.max_age,))
+            conn.execute(
+                "DELETE FROM pdf_cache WHERE key NOT IN ("
+                "SELECT key FROM pdf_cache ORDER BY last_used_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+
+# How long a callback for a document nobody waits on (yet) is kept around.
+# Covers the race where PDFMonkey calls back before the poller registered.
+EARLY_CALLBACK_TTL = 120
+
+_lock = threading.Lock()
+_waiting: dict[str, dict] = {}
+_early: dict[str, tuple[float, dict]] = {}
+
+
+def register(document_id: str):
+    """
+    Start waiting for a PDFMonkey callback for a document.
+
+    Args:
+        document_id: PDFMonkey document ID
+    """
+    with _lock:
+        slot = {"event": threading.Event(), "document": None, "futures": []}
+        early = _early.pop(document_id, None)
+        if early:
+            slot["document"] = early[1]
+            slot["event"].set()
+        _waiting[document_id] = slot
+
+
+def unregister(document_id: str):
+    """Stop waiting for a document (called once polling has finished)."""
+    with _lock:
+        _waiting.pop(document_id, None)
+
+
+def _take(slot: dict) -> dict | None:
+    """Consume the pending callback of a slot (caller holds ``_lock``)."""
+    document = slot["document"]
+    slot["document"] = None
+    slot["event"].clear()
+    return document
+
+
+def wait(document_id: str, timeout: float) -> dict | None:
+    """
+    Block until a callback for the document arrives or the timeout expires.
+
+    Each callback wakes the waiter once; the next call waits for a new one.
+
+    Args:
+        document_id: PDFMonkey document ID (must be registered)
+        timeout: Seconds to wait
+
+    Returns:
+        The document dictionary from the callback, or None on timeout
+    """
+    with _lock:
+        slot = _waiting.get(document_id)
+    if slot is None:
+        time.sleep(timeout)
+        return None
+
+    if slot["event"].wait(timeout):
+        with _lock:
+            return _take(slot)
+    return None
+
+
+async def wait_async(document_id: str, timeout: float) -> dict | None:
+    """
+    Await a callback for the document without blocking the event loop.
+
+    Args:
+        document_id: PDFMonkey document ID (must be registered)
+        timeout: Seconds to wait
+
+    Returns:
+        The document dictionary from the callback, or None on timeout
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        slot = _waiting.get(document_id)
+        if slot is not None and slot["event"].is_set():
+            return _take(slot)
+        if slot is not None:
+            future = loop.create_future()
+            slot["futures"].append((loop, future))
+
+    if slot is None:
+        await asyncio.sleep(timeout)
+        return None
+
+    try:
+        document = await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        with _lock:
+            if (loop, future) in slot["futures"]:
+                slot["futures"].remove((loop, future))
+
+    with _lock:
+        _take(slot)
+    return document
+
+
+def _resolve(future: asyncio.Future, document: dict):
+    if not future.done():
+        future.set_result(document)
+
+
+def notify(document: dict) -> bool:
+    """
+    Hand a verified webhook document to whoever waits for it.
+
+    Args:
+        document: Document dictionary from the PDFMonkey webhook body
+
+    Returns:
+        True if a waiting submission was woken, False if it was buffered
+    """
+    document_id = document.get("id")
+    if not document_id:
+        return False
+
+    now = time.time()
+    with _lock:
+        slot = _waiting.get(document_id)
+        if slot is None:
+            # Drop expired early callbacks, then buffer this one
+            for stale_id, (received_at, _) in list(_early.items()):
+                if now - received_at > EARLY_CALLBACK_TTL:
+                    del _early[stale_id]
+            _early[document_id] = (now, document)
+            return False
+
+        slot["document"] = document
+        slot["event"].set()
+        # Callbacks arrive on a WSGI thread; hand them to async waiters' loops
+        for loop, future in slot["futures"]:
+            loop.call_soon_threadsafe(_resolve, future, document)
+        return True
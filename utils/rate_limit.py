@@ -0,0 +1,123 @@
+import email.utils
+import threading
+import time
+from collections import deque
+
+# Lowest share of the configured rate the limiter slows down to after 429s
+MIN_RATE_FACTOR = 0.1
+# Share of the configured rate regained per successful request
+RECOVERY_STEP = 0.05
+# Without a configured rate, the send rate over this many seconds before
+# the first 429 becomes the limit
+OBSERVE_SECONDS = 10.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a ``Retry-After`` header (delta seconds or HTTP date).
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - time.time())
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every call to one upstream.
+
+    ``reserve`` hands out send slots in order and returns how long the
+    caller has to wait for its slot, so sync callers can ``time.sleep`` and
+    async callers ``asyncio.sleep`` on the same bucket. Requests queue up
+    instead of failing.
+
+    On a 429, ``throttle`` pauses all callers until the upstream's
+    ``Retry-After`` and halves the rate; successful calls restore it in
+    small steps (additive increase, multiplicative decrease). A bucket
+    created without a rate learns one from its first 429: the rate at which
+    requests were sent until then becomes the limit.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Requests per second (0 for no limit; 429s still pause)
+            burst: Requests that may be sent back to back
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._sent = deque()  # reserve times while no rate is known
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.rate <= 0:
+            return
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, borrowing from the future if none is left.
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.rate <= 0:
+                self._sent.append(now)
+                while now - self._sent[0] > OBSERVE_SECONDS:
+                    self._sent.popleft()
+                return max(0.0, self._paused_until - now)
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def paused_for(self) -> float:
+        """Seconds left of a pause started by ``throttle`` after reserving."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def throttle(self, retry_after: float):
+        """Pause all callers for ``retry_after`` seconds and slow down."""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate <= 0 and self._sent:
+                self._learn_rate(now)
+            self._refill(now)
+            # 429s of requests already in flight belong to the same pause
+            if self.rate > 0 and now >= self._paused_until:
+                self.rate = max(self.max_rate * MIN_RATE_FACTOR, self.rate / 2)
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self._tokens = min(self._tokens, 0.0)
+
+    def _learn_rate(self, now: float):
+        """Adopt the observed send rate as the limit (caller holds the lock)."""
+        span = max(1.0, now - self._sent[0])
+        self.max_rate = self.rate = len(self._sent) / span
+        self._sent.clear()
+        self._tokens = 0.0
+        self._updated = now
+
+    def recover(self):
+        """Speed back up towards the configured rate after a success."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self._refill(time.monotonic())
+                self.rate = min(
+                    self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
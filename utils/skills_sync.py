@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Remember the last synced skills hash for this many candidates
+MAX_TRACKED = 10_000
+
+
+class SkillsSyncer:
+    """
+    Deferred, coalescing writer for candidate skills.
+
+    ``schedule`` returns immediately. Each candidate's write is due
+    ``delay`` seconds after it was first queued, so repeated loads of the
+    same candidate within that window collapse into one write whatever
+    else is scheduled meanwhile. A single worker writes due entries and
+    skips writes whose skills/branch hash matches the last successful
+    sync for that email.
+    """
+
+    def __init__(self, write, delay: float = 2.0):
+        """
+        Args:
+            write: Callable ``write(email, skills, branch) -> bool``
+            delay: Coalescing window in seconds
+        """
+        self._write = write
+        self._delay = delay
+        self._pending: dict[str, tuple] = {}
+        self._synced: OrderedDict[str, str] = OrderedDict()
+        self._cond = threading.Condition()
+        threading.Thread(target=self._run, name="skills-sync", daemon=True).start()
+
+    @staticmethod
+    def _hash(skills, branch) -> str:
+        return hashlib.sha1(f"{branch}\0{skills}".encode()).hexdigest()
+
+    def schedule(self, email: str, skills, branch) -> bool:
+        """
+        Queue a skills write unless it would not change anything.
+
+        Returns:
+            True if a write was queued (or merged into a queued one)
+        """
+        key = email.strip().lower()
+        digest = self._hash(skills, branch)
+
+        with self._cond:
+            queued = self._pending.get(key)
+            if queued is None and self._synced.get(key) == digest:
+                return False
+            # A merged write keeps the due time of the first one
+            due = queued[4] if queued else time.monotonic() + self._delay
+            self._pending[key] = (email, skills, branch, digest, due)
+            self._cond.notify()
+        return True
+
+    def _take_due(self) -> dict:
+        """Wait until at least one queued write is due and remove those."""
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                wait = min(entry[4] for entry in self._pending.values()) - time.monotonic()
+                if wait <= 0:
+                    break
+                self._cond.wait(wait)
+
+            now = time.monotonic()
+            due = {key: entry for key, entry in self._pending.items() if entry[4] <= now}
+            for key in due:
+                del self._pending[key]
+            return due
+
+    def _run(self):
+        while True:
+            batch = self._take_due()
+
+            for key, (email, skills, branch, digest, _) in batch.items():
+                if self._synced.get(key) == digest:
+                    continue
+                try:
+                    written = self._write(email, skills, branch)
+                except Exception as e:
+                    logger.error("Deferred skills sync failed for %s: %s", email, e)
+                    written = False
+
+                if written:
+                    with self._cond:
+                        self._synced[key] = digest
+                        self._synced.move_to_end(key)
+                        while len(self._synced) > MAX_TRACKED:
+                            self._synced.popitem(last=False)
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is served
+    brotli = None
+
+# Text assets worth compressing; smaller bodies are sent as they are
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json",
+                      "image/svg+xml")
+MIN_COMPRESS_SIZE = 512
+
+# Fingerprinted URLs change with the content, so they never need revalidation
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class CompressedAsset:
+    """
+    A response body kept in memory together with its gzip/brotli variants.
+
+    The ETag is derived from the content, so it stays valid across restarts
+    and processes serving the same build.
+    """
+
+    def __init__(self, body: bytes, content_type: str):
+        self.content_type = content_type
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.variants = {"identity": body}
+
+        if len(body) >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            # mtime=0 keeps the gzip bytes identical for identical content
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+    def negotiate(self, accept_encodings) -> str:
+        """Pick the smallest variant the client accepts."""
+        accepted = [encoding for encoding in self.variants
+                    if encoding == "identity" or accept_encodings[encoding]]
+        return min(accepted, key=lambda encoding: len(self.variants[encoding]))
+
+    def response(self, cache_control: str) -> Response:
+        """
+        Build a response for the current request.
+
+        Answers ``304 Not Modified`` if the client's ``If-None-Match``
+        matches.
+
+        Args:
+            cache_control: Cache-Control header value
+
+        Returns:
+            Flask response with the negotiated encoding
+        """
+        encoding = self.negotiate(request.accept_encodings)
+        response = Response(self.variants[encoding], content_type=self.content_type)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = cache_control
+        # One ETag per encoding: the variants are different byte streams
+        response.set_etag(f"{self.digest[:32]}-{encoding}")
+        return response.make_conditional(request)
+
+
+class StaticAssets:
+    """
+    Fingerprinted, pre-compressed copies of the files in the static folder.
+
+    ``url("js/app.js")`` returns ``<url_prefix>/js/app.<hash>.js``; as the
+    name changes with the content, those URLs are served with immutable
+    caching. Files are read once, on first use. Paths that do not exist
+    keep their plain ``/static/`` URL.
+    """
+
+    def __init__(self, static_folder: str, url_prefix: str = "/assets",
+                 hash_length: int = 12):
+        self.static_folder = static_folder
+        self.url_prefix = url_prefix.rstrip("/")
+        self.hash_length = hash_length
+        self._urls: dict[str, str] = {}
+        self._assets: dict[str, CompressedAsset] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, filename: str) -> str | None:
+        """Fingerprint one static file; returns its fingerprinted path."""
+        path = os.path.realpath(os.path.join(self.static_folder, filename))
+        if not path.startswith(os.path.realpath(self.static_folder) + os.sep) \
+                or not os.path.isfile(path):
+            return None
+
+        with open(path, "rb") as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+
+        asset = CompressedAsset(body, content_type)
+        stem, extension = os.path.splitext(filename)
+        fingerprinted = f"{stem}.{asset.digest[:self.hash_length]}{extension}"
+        self._assets[fingerprinted] = asset
+        return fingerprinted
+
+    def url(self, filename: str) -> str:
+        """
+        Return the URL to reference a static file by.
+
+        Args:
+            filename: Path relative to the static folder, e.g. "js/app.js"
+
+        Returns:
+            Fingerprinted asset URL, or the plain /static/ URL if the file
+            does not exist
+        """
+        url = self._urls.get(filename)
+        if url is None:
+            with self._lock:
+                url = self._urls.get(filename)
+                if url is None:
+                    fingerprinted = self._load(filename)
+                    if not fingerprinted:
+                        # Not cached: lookups of unknown names must not pile up
+                        return f"/static/{filename}"
+                    url = self._urls[filename] = f"{self.url_prefix}/{fingerprinted}"
+        return url
+
+    def get(self, fingerprinted: str) -> CompressedAsset | None:
+        """
+        Look up an asset by the fingerprinted path handed out by ``url``.
+
+        Also resolves paths handed out by another process of the same
+        build; outdated fingerprints are not found.
+        """
+        asset = self._assets.get(fingerprinted)
+        if asset is None:
+            stem, extension = os.path.splitext(fingerprinted)
+            original_stem, _, _ = stem.rpartition(".")
+            if original_stem:
+                self.url(original_stem + extension)
+                asset = self._assets.get(fingerprinted)
+        return asset
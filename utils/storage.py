@@ -0,0 +1,21 @@
+import os
+
+# Directory for local state (job queue, caches, mirrors). Kept out of git.
+DATA_DIR = os.getenv(
+    "EMPLOIO_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+)
+
+
+def data_path(filename: str) -> str:
+    """
+    Resolve a file inside the local data directory, creating it if needed.
+
+    Args:
+        filename: File name relative to the data directory
+
+    Returns:
+        Absolute path to the file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
@@ -0,0 +1,187 @@
+import bisect
+import functools
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Length of the n-grams used for substring matches; shorter queries only
+# match at the start of the value or of one of its words
+NGRAM = 3
+# Cached (field, query, limit) lookups per index build
+CACHE_SIZE = 4096
+
+_TOKEN_SPLIT = re.compile(r"[^\w]+")
+_JS_ARRAY = re.compile(r"(\w+)\s*:\s*\[(.*?)\]", re.S)
+_JS_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_JS_LINE_COMMENT = re.compile(r"^\s*//.*$", re.M)
+
+
+def normalize(text: str) -> str:
+    """Case- and accent-fold a value for matching ("Ärztliche" → "arztliche")."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in folded if not unicodedata.combining(char)).strip()
+
+
+def load_suggestion_db(path: str) -> dict[str, list[str]]:
+    """
+    Read the suggestion lists from ``utils/suggestion-db.js``.
+
+    Every ``key: ["…", …]`` array in the file becomes one list, wherever it
+    is nested; commented-out entries are skipped.
+
+    Returns:
+        {field name: values}
+    """
+    with open(path, encoding="utf-8") as f:
+        source = _JS_LINE_COMMENT.sub("", f.read())
+    return {
+        key: [value.replace('\\"', '"') for value in _JS_STRING.findall(body)]
+        for key, body in _JS_ARRAY.findall(source)
+    }
+
+
+class SuggestionIndex:
+    """
+    Immutable in-memory typeahead index over value frequencies per field.
+
+    Values are matched case- and accent-insensitively: by prefix of the
+    whole value, by prefix of any word (sorted keys + bisect), and for
+    queries of at least ``NGRAM`` characters anywhere in the value
+    (n-gram postings). Whole-value prefixes rank first, then word
+    prefixes, then other matches; within each group more frequently used
+    values come first.
+    """
+
+    def __init__(self, corpus: dict[str, Counter]):
+        """
+        Args:
+            corpus: {field name: Counter of raw values → times used}
+        """
+        self._fields = {field: self._build(counts) for field, counts in corpus.items()}
+        self.built_at = time.time()
+        self.suggest = functools.lru_cache(maxsize=CACHE_SIZE)(self._suggest)
+
+    @staticmethod
+    def _build(counts: Counter) -> dict:
+        # Merge spellings that fold to the same key; show the most used one
+        spellings = defaultdict(Counter)
+        for value, count in counts.items():
+            value = " ".join(str(value).split())
+            key = normalize(value)
+            if key:
+                spellings[key][value] += count
+
+        entries = []
+        for key, variants in spellings.items():
+            display = variants.most_common(1)[0][0]
+            entries.append((display, sum(variants.values()), key))
+
+        words, ngrams = [], defaultdict(set)
+        for entry_id, (_, _, key) in enumerate(entries):
+            words.append((key, entry_id))
+            words.extend((word, entry_id) for word in _TOKEN_SPLIT.split(key)
+                         if word and word != key)
+            for start in range(len(key) - NGRAM + 1):
+                ngrams[key[start:start + NGRAM]].add(entry_id)
+        words.sort()
+
+        return {"entries": entries, "words": words, "ngrams": dict(ngrams)}
+
+    def sizes(self) -> dict[str, int]:
+        """Number of distinct values per field."""
+        return {field: len(index["entries"]) for field, index in sorted(self._fields.items())}
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._fields
+
+    def _suggest(self, field: str, query: str, limit: int = 10) -> tuple:
+        """
+        Rank the values of ``field`` matching ``query``.
+
+        Returns:
+            Tuple of {"value", "count"} dicts, best match first
+        """
+        index = self._fields.get(field)
+        query = normalize(query)
+        if index is None or not query:
+            return ()
+        entries = index["entries"]
+
+        ranks = {}
+        words = index["words"]
+        position = bisect.bisect_left(words, (query, -1))
+        while position < len(words) and words[position][0].startswith(query):
+            word, entry_id = words[position]
+            rank = 0 if word == entries[entry_id][2] else 1
+            ranks[entry_id] = min(rank, ranks.get(entry_id, rank))
+            position += 1
+
+        if len(query) >= NGRAM:
+            postings = [index["ngrams"].get(query[start:start + NGRAM], set())
+                        for start in range(len(query) - NGRAM + 1)]
+            for entry_id in set.intersection(*sorted(postings, key=len)):
+                if entry_id not in ranks and query in entries[entry_id][2]:
+                    ranks[entry_id] = 2
+
+        ordered = sorted(ranks, key=lambda entry_id: (
+            ranks[entry_id], -entries[entry_id][1], entries[entry_id][2]))
+        return tuple({"value": entries[entry_id][0], "count": entries[entry_id][1]}
+                     for entry_id in ordered[:limit])
+
+
+class SuggestionService:
+    """
+    Serves suggestions from the current index and rebuilds it in the
+    background from ``collect()``, so lookups never wait for upstreams.
+    """
+
+    def __init__(self, collect, initial: dict[str, Counter] | None = None):
+        """
+        Args:
+            collect: Callable returning the full corpus
+                ``{field: Counter(value → count)}``
+            initial: Corpus served until the first rebuild finishes
+        """
+        self._collect = collect
+        self.index = SuggestionIndex(initial or {})
+
+    def refresh(self) -> SuggestionIndex:
+        """Rebuild the index from ``collect()`` and swap it in."""
+        started = time.perf_counter()
+        index = SuggestionIndex(self._collect())
+        self.index = index
+        logger.info("Suggestion index rebuilt in %.2fs (%s)",
+                    time.perf_counter() - started,
+                    ", ".join(f"{field}: {size}" for field, size in index.sizes().items()))
+        return index
+
+    def start_background_refresh(self, interval: int):
+        """Run ``refresh`` now and every ``interval`` seconds on a daemon thread."""
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error("Suggestion index rebuild failed: %s", e)
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="suggestion-index", daemon=True).start()
+
+    def suggest(self, field: str, query: str, limit: int = 10) -> list[dict]:
+        """
+        Look up suggestions for a typed prefix or fragment.
+
+        Args:
+            field: Form field name, e.g. "arbeitgeber_name"
+            query: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            [{"value": …, "count": …}, …] ranked best first
+        """
+        return list(self.index.suggest(field, query, limit))
@@ -0,0 +1,89 @@
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    target     TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    version    TEXT,
+    synced_at  REAL NOT NULL,
+    PRIMARY KEY (target, key)
+);
+"""
+
+
+def diff_fields(old: dict, new: dict) -> dict:
+    """
+    Field-level diff of two flat payloads.
+
+    Only keys present in ``new`` are considered; a key whose value differs
+    from (or is missing in) ``old`` is returned with its new value.
+    """
+    return {key: value for key, value in new.items()
+            if key not in old or old[key] != value}
+
+
+class SnapshotStore:
+    """
+    Last successfully synced payload per upstream target and key.
+
+    Used to send only changed fields. A snapshot older than ``max_age``
+    is ignored, so every record is written in full now and then.
+    """
+
+    def __init__(self, db_path: str, max_age: float):
+        self.db_path = db_path
+        self.max_age = max_age
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection to the snapshot database."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, target: str, key: str) -> dict | None:
+        """
+        Return a usable snapshot.
+
+        Returns:
+            {"payload": dict, "version": str | None, "synced_at": float}
+            or None if missing or expired
+        """
+        row = self._connect().execute(
+            "SELECT payload, version, synced_at FROM snapshots "
+            "WHERE target = ? AND key = ?",
+            (target, key)
+        ).fetchone()
+        if not row or time.time() - row["synced_at"] > self.max_age:
+            return None
+        return {
+            "payload": json.loads(row["payload"]),
+            "version": row["version"],
+            "synced_at": row["synced_at"],
+        }
+
+    def put(self, target: str, key: str, payload: dict, version: str | None = None):
+        """Record the full payload that is now known to be upstream."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (target, key, payload, version, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (target, key, json.dumps(payload), version, time.time())
+            )
+
+    def invalidate(self, target: str, key: str):
+        """Forget a snapshot so the next write is sent in full."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM snapshots WHERE target = ? AND key = ?", (target, key))